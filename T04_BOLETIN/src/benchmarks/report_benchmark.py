@@ -0,0 +1,350 @@
+"""
+* WEBGRAFÍA *
+
+- time.perf_counter. (s. f.). Python documentation. de https://docs.python.org/3/library/time.html#time.perf_counter
+
+- tracemalloc — Trace memory allocations. (s. f.). Python documentation. de https://docs.python.org/3/library/tracemalloc.html
+
+- generate_series. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/functions-srf.html
+
+- Qt Platform Abstraction (offscreen). (s. f.). Doc.qt.io. de https://doc.qt.io/qt-6/qpa.html
+
+"""
+
+# Archivo: src/benchmarks/report_benchmark.py
+#
+# Banco de pruebas de rendimiento del módulo de informes.
+#
+# Crea (si no existe) una base de datos de pruebas en el servidor configurado en utils_db.py,
+# la llena con distintos volúmenes de usuarios, categorías y tareas, y mide el tiempo y el pico
+# de memoria de las operaciones principales del informe. Los resultados se guardan en JSON para
+# compararlos con ejecuciones anteriores.
+#
+# Uso (desde la carpeta src):
+#     python -m benchmarks.report_benchmark --sizes 1000,10000,100000
+#     python -m benchmarks.report_benchmark --compare benchmarks/results/anterior.json
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# La vista se crea sin ventana; debe configurarse antes de importar PySide6
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import psycopg
+from psycopg import sql
+from PySide6.QtWidgets import QApplication
+from utils import utils_db
+
+# Carpeta donde se guardan los resultados por defecto
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Sufijo obligatorio del nombre de la base de datos de pruebas. El banco de pruebas vacía sus
+# tablas, por lo que se niega a usar cualquier base de datos que no lo tenga.
+BENCHMARK_DB_SUFFIX = "_benchmark"
+
+# Nombre por defecto de la base de datos de pruebas. Nunca se usa la base de datos de la aplicación.
+DEFAULT_BENCHMARK_DB = f"{utils_db.NAME_DB}{BENCHMARK_DB_SUFFIX}"
+
+# Categorías que la vista reconoce, usadas como primeras categorías generadas
+BASE_CATEGORIES = ["Ofimática", "Programación", "Ocio"]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lee los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento del módulo de informes.")
+    parser.add_argument("--database", default=DEFAULT_BENCHMARK_DB,
+                        help=f"Base de datos de pruebas (se crea si no existe y su nombre debe terminar en "
+                             f"'{BENCHMARK_DB_SUFFIX}'). Por defecto: {DEFAULT_BENCHMARK_DB}")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Números de tareas a generar, separados por comas.")
+    parser.add_argument("--users", type=int, default=50, help="Número de usuarios a generar.")
+    parser.add_argument("--categories", type=int, default=len(BASE_CATEGORIES), help="Número de categorías a generar.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones cronometradas de cada operación.")
+    parser.add_argument("--skip-pdf", action="store_true", help="No medir la generación del PDF.")
+    parser.add_argument("--cache", action="store_true",
+                        help="Usar la caché de resultados de ReportModel (por defecto se mide sin caché).")
+    parser.add_argument("--output", default=None, help="Archivo JSON de resultados. Por defecto, en benchmarks/results.")
+    parser.add_argument("--compare", default=None, help="Archivo JSON de una ejecución anterior con el que comparar.")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Aumento relativo del tiempo a partir del cual se considera una regresión (0.20 = 20 %%).")
+    args = parser.parse_args(argv)
+    try:
+        check_benchmark_database(args.database)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+# parse_args (fin)
+
+
+def check_benchmark_database(database: str) -> None:
+    """
+    Comprueba que la base de datos indicada puede vaciarse, es decir, que no es la de la
+    aplicación y que su nombre termina en `BENCHMARK_DB_SUFFIX`.
+
+    Excepciones:
+    - ValueError: Si la base de datos no es una base de datos de pruebas.
+    """
+    if database == utils_db.NAME_DB:
+        raise ValueError(f"'{database}' es la base de datos de la aplicación; el banco de pruebas vacía sus tablas.")
+    if not database.endswith(BENCHMARK_DB_SUFFIX):
+        raise ValueError(f"El nombre de la base de datos de pruebas debe terminar en '{BENCHMARK_DB_SUFFIX}': '{database}'.")
+# check_benchmark_database (fin)
+
+
+def ensure_database(database: str) -> None:
+    """
+    Crea la base de datos de pruebas si no existe, conectándose a la base de datos 'postgres'.
+    """
+    conninfo = psycopg.conninfo.make_conninfo(
+        dbname="postgres",
+        user=utils_db.USER_DB,
+        password=utils_db.PASS_DB,
+        host=utils_db.HOSTNAME_DB,
+        port=utils_db.PORT_DB
+    )
+    with psycopg.connect(conninfo, autocommit=True) as connection:
+        exists = connection.execute("SELECT 1 FROM pg_database WHERE datname = %s;", (database,)).fetchone()
+        if not exists:
+            connection.execute(sql.SQL("CREATE DATABASE {};").format(sql.Identifier(database)))
+# ensure_database (fin)
+
+
+def seed_database(db_manager, num_tareas: int, num_users: int, num_categories: int) -> None:
+    """
+    Vacía las tablas y genera los datos de prueba en el servidor con generate_series.
+
+    Parámetros:
+    - db_manager: ManagerDB conectado a la base de datos de pruebas.
+    - num_tareas (int): Número de tareas.
+    - num_users (int): Número de usuarios.
+    - num_categories (int): Número de categorías (las primeras son las de BASE_CATEGORIES).
+    """
+    num_users = max(1, num_users)
+    num_categories = max(1, num_categories)
+    with db_manager.connection() as connection, connection.cursor() as cursor:
+        cursor.execute("TRUNCATE tareas, usuarios, categorias RESTART IDENTITY CASCADE;")
+        cursor.execute("""
+            INSERT INTO categorias (nombre_categoria)
+            SELECT COALESCE((%(base)s::text[])[i], 'Categoría ' || i)
+            FROM generate_series(1, %(categorias)s) AS i;
+        """, {"base": BASE_CATEGORIES, "categorias": num_categories})
+        cursor.execute("""
+            INSERT INTO usuarios (email, nombre_usuario, password)
+            SELECT 'usuario' || i || '@benchmark.local', 'usuario' || i, 'benchmark'
+            FROM generate_series(1, %(usuarios)s) AS i;
+        """, {"usuarios": num_users})
+        cursor.execute("""
+            INSERT INTO tareas (nombre, description, idUsuario, id_categoria)
+            SELECT 'Tarea ' || lpad(i::text, 9, '0'),
+                   'Descripción ' || md5(i::text) || ' ' || md5((i * 7)::text),
+                   'usuario' || (i %% %(usuarios)s + 1) || '@benchmark.local',
+                   i %% %(categorias)s + 1
+            FROM generate_series(1, %(tareas)s) AS i;
+        """, {"usuarios": num_users, "categorias": num_categories, "tareas": num_tareas})
+        # Estadísticas actualizadas para que el planificador elija los mismos planes que en producción
+        cursor.execute("ANALYZE tareas, usuarios, categorias;")
+# seed_database (fin)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Mide una operación: una ejecución de calentamiento con tracemalloc (pico de memoria)
+    y `repeat` ejecuciones cronometradas sin tracemalloc (que ralentiza la ejecución).
+
+    Retorno:
+    - dict: Tiempos en segundos (mínimo, mediana, media y máximo) y pico de memoria en bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+        "peak_memory_bytes": peak,
+        "runs": len(timings),
+    }
+# measure (fin)
+
+
+def benchmark_size(controller, model, repeat: int, skip_pdf: bool, output_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Mide las operaciones del informe con los datos cargados actualmente.
+
+    Parámetros:
+    - controller (ReportController): Controlador del informe.
+    - model (ReportModel): Modelo del informe.
+    - repeat (int): Repeticiones cronometradas de cada operación.
+    - skip_pdf (bool): Si es True, no se mide la generación del PDF.
+    - output_dir (str): Carpeta para los PDF generados.
+
+    Retorno:
+    - dict: Resultados por operación.
+    """
+    from workers.db_worker import CancellationToken, TaskContext, WorkerSignals
+
+    tareas = utils_db.EnumTablasDB.TAREAS.value
+    operations: Dict[str, Callable[[], Any]] = {
+        "get_model": lambda: model._get_model(tareas),
+        "fetch_columnar": lambda: model._fetch_columnar(tareas),
+        "filtros_sin_filtro": lambda: controller._load_filtered_data("", None),
+        "filtros_texto": lambda: controller._load_filtered_data("tarea 0000", None),
+        "filtros_categoria": lambda: controller._load_filtered_data("", BASE_CATEGORIES[1]),
+        "calculate_totals": lambda: controller._calculate_totals("", None),
+        # Con `first_page=None` el modelo solo encargaría la primera página a `DbWorker`: se pide
+        # dentro de la medición, como hace `_load_filtered_data`, para medir también la carga
+        "prepare_table_data": lambda: controller._prepare_table_data(
+            "", None, model._fetch_tareas_page("", None, None, utils_db.PAGE_SIZE_DB)
+        ),
+    }
+
+    if not skip_pdf:
+        # El controlador guarda los datos del gráfico mostrado para dibujarlo en el PDF
+        controller._on_filters_loaded(controller._load_filtered_data("", None))
+        chart_data = controller._current_chart_data
+        total_rows = controller._view.total_rows
+        pdf_path = os.path.join(output_dir, "benchmark_reporte.pdf")
+
+        def generate_pdf():
+            context = TaskContext(0, WorkerSignals(), CancellationToken())
+            controller._export_pdf(pdf_path, "", None, total_rows, chart_data, context)
+
+        operations["generate_pdf"] = generate_pdf
+
+    results = {}
+    for name, func in operations.items():
+        # El PDF es mucho más lento que el resto: se mide una sola vez
+        results[name] = measure(func, 1 if name == "generate_pdf" else repeat)
+        # Ninguna tarea en segundo plano de una operación debe ejecutarse durante la siguiente medición
+        controller._worker.wait_for_done()
+        print(f"    {name:<22} mediana {results[name]['median_s'] * 1000:10.2f} ms   "
+              f"pico {results[name]['peak_memory_bytes'] / 1024 / 1024:8.2f} MiB")
+    return results
+# benchmark_size (fin)
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compara las medianas de tiempo con las de una ejecución anterior.
+
+    Retorno:
+    - list[str]: Descripción de las operaciones cuyo tiempo ha aumentado más que `threshold`.
+    """
+    regressions = []
+    for size, operations in current["results"].items():
+        baseline_operations = baseline.get("results", {}).get(size, {})
+        for name, result in operations.items():
+            previous = baseline_operations.get(name)
+            if not previous or not previous.get("median_s"):
+                continue
+            ratio = result["median_s"] / previous["median_s"]
+            print(f"  {size:>9} tareas  {name:<22} {ratio:6.2f}x")
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} con {size} tareas: {ratio:.2f}x más lento")
+    return regressions
+# compare_results (fin)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Ejecuta el banco de pruebas completo.
+
+    Retorno:
+    - int: Código de salida (1 si se detectan regresiones al comparar, 0 en otro caso).
+    """
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    # seed_database ejecuta TRUNCATE: se comprueba de nuevo por si `run` se llama sin `parse_args`
+    check_benchmark_database(args.database)
+    ensure_database(args.database)
+
+    # ManagerDB lee la configuración de utils_db al conectar: se redirige a la base de datos de pruebas
+    utils_db.NAME_DB = args.database
+    utils_db.CONNECTION_NAME = args.database
+
+    from utils.utils_init import initialize_app
+    from models.report_model import ReportModel
+    from views.report_view import ReportView
+    from controllers.report_controller import ReportController
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    db_manager = initialize_app(show_popup=False)
+
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            print(f"\n== {size} tareas ==")
+            seed_database(db_manager, size, args.users, args.categories)
+
+            model = ReportModel(db_manager=db_manager, use_cache=args.cache)
+            view = ReportView()
+            controller = ReportController(report_view=view, report_model=model)
+            # La carga inicial se lanza en segundo plano al crear el controlador
+            controller._worker.wait_for_done()
+            app.processEvents()
+
+            results[str(size)] = benchmark_size(controller, model, args.repeat, args.skip_pdf, output_dir)
+
+            if model._change_listener is not None:
+                model._change_listener.stop()
+
+    db_manager.close_connection()
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": args.database,
+        "users": args.users,
+        "categories": args.categories,
+        "repeat": args.repeat,
+        "cache": args.cache,
+        "results": results,
+    }
+
+    output_path = args.output or os.path.join(RESULTS_DIR, f"report_benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en: {output_path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"\nComparación con {args.compare} (tiempo actual / anterior):")
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print("\nRegresiones detectadas:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nSin regresiones.")
+    return 0
+# run (fin)
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
+# if __name__ == "__main__" (fin)
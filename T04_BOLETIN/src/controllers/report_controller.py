@@ -1,13 +1,18 @@
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Tuple, Union
 from PySide6.QtCore import Slot
-from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtGui import QStandardItemModel
 from PySide6.QtWidgets import QWidget
 from utils import utils_db
 from utils.utils_popup import _printv2
+from utils.utils_chart import reduce_chart_data
 from models.report_model import ReportModel
 from views.report_view import ReportView
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from widgets.paginated_table_model import PaginatedTableModel
+from widgets.dataset_table_model import DatasetTableModel
+from models.report_dataset import ReportDataset
+from workers.db_worker import DbWorker, TaskContext
+from utils.utils_startup import startup_profiler
 import os
 
 
@@ -25,9 +30,22 @@ class ReportController:
         self._model: ReportModel = report_model
         self._popup_parent: Optional[QWidget] = popup_parent
 
+        # Trabajador que ejecuta las consultas fuera del hilo de la interfaz
+        self._worker: DbWorker = DbWorker()
+
+        # Filtros aplicados actualmente (texto de búsqueda, categoría)
+        self._current_filters: Tuple[str, Optional[str]] = ("", None)
+
+        # Datos del gráfico mostrado actualmente (None si está vacío), para exportarlo sin capturar la vista
+        self._current_chart_data: Optional[Dict[str, Any]] = None
+
+        # Modelo de la tabla mostrado actualmente, para cancelar sus páginas pendientes al sustituirlo
+        self._table_model: Optional[Any] = None
+
         # Conectar señales
         self._view.apply_filters_signal.connect(self._apply_filters)
         self._view.generate_pdf_signal.connect(self.generate_pdf)
+        self._view.search_suggestions_signal.connect(self._search_suggestions)
 
         # Inicializar vista
         self._initialize_view()
@@ -35,201 +53,325 @@ class ReportController:
     def _initialize_view(self) -> None:
         """
         Inicializa la vista cargando los datos iniciales y las categorías.
+
+        Las consultas se ejecutan en segundo plano; la vista se actualiza al recibir
+        el resultado en `_on_initial_data_loaded` y `_on_categories_loaded`. Los datos iniciales
+        se piden en el mismo canal que los filtros ("filtros"): si el usuario aplica un filtro
+        antes de que lleguen, se cancelan y no sobrescriben los datos filtrados.
+        """
+        self._worker.submit(
+            "filtros",
+            self._load_filtered_data,
+            "",
+            None,
+            on_result=self._on_initial_data_loaded,
+            on_error=lambda message: self._on_load_error("inicializar la vista", message)
+        )
+        self._worker.submit(
+            "categorias",
+            self._model._fetch_categorias,
+            on_result=self._on_categories_loaded,
+            on_error=lambda message: self._on_load_error("cargar las categorías", message)
+        )
+
+    def _on_initial_data_loaded(self, result: Dict[str, Any]) -> None:
+        """
+        Actualiza la vista con los datos iniciales (en el hilo de la interfaz).
         """
         try:
-            # Cargar datos iniciales de la tabla "tareas"
-            model_data = self._model._get_model(utils_db.EnumTablasDB.TAREAS.value)
-            if model_data:
-                prepared_data = self._prepare_table_data(model_data)
-                self._view._set_model(prepared_data)
+            self._current_filters = ("", None)
+
+            # Cargar la tabla "tareas" (en memoria o paginada, con la primera página ya cargada)
+            self._set_table_model(self._prepare_table_data(first_page=result["first_page"], dataset=result["dataset"]))
 
+            # Totales iniciales (del conjunto en memoria o agregados en PostgreSQL)
+            totals = result["totals"]
+            if totals and totals["total"]:
                 # Configurar el gráfico inicial
-                chart_data = self._prepare_chart_data(model_data)
-                self._view._set_chart(chart_data)
+                self._set_chart(self._prepare_chart_data(totals["chart"]))
 
-                # Calcular totales iniciales y actualizar el resumen
-                totals = self._calculate_totals(model_data.get("data", []))
                 self._view._set_number(totals["total"], totals["categories"])
             else:
-                _printv2(parent=self._popup_parent, message="No se encontraron datos en la tabla 'tareas'.")
-                self._view._clear_chart()
-
-            # Cargar categorías y establecerlas en la vista
-            categories_data = self._model._fetch_data(utils_db.EnumTablasDB.CATEGORIAS.value)
-            if categories_data:
-                allowed_categories = ["Ofimática", "Programación", "Ocio"]
-                categories = [row["nombre_categoria"] for row in categories_data if row["nombre_categoria"] in allowed_categories]
-                self._view._set_categories(categories)
+                _printv2(parent=self._popup_parent, message="No se encontraron datos en la tabla 'tareas'.", level=logging.WARNING)
+                self._clear_chart()
         except Exception as e:
-            _printv2(parent=self._popup_parent, message=f"Error al inicializar la vista: {e}")
+            _printv2(parent=self._popup_parent, message=f"Error al inicializar la vista: {e}", level=logging.ERROR)
+
+    def _on_categories_loaded(self, categories_data: Optional[List[Any]]) -> None:
+        """
+        Establece las categorías en la vista (en el hilo de la interfaz).
+        """
+        if categories_data:
+            allowed_categories = ["Ofimática", "Programación", "Ocio"]
+            categories = [
+                categoria._nombre_categoria for categoria in categories_data
+                if categoria._nombre_categoria in allowed_categories
+            ]
+            self._view._set_categories(categories)
 
     @Slot(str, str)
     def _apply_filters(self, search_text: str, category: str) -> None:
         """
         Aplica los filtros recibidos desde la vista y actualiza los datos mostrados.
+
+        Si las tareas están cargadas en memoria (`ReportModel._fetch_report_dataset`), el filtrado
+        y los totales se calculan sobre ese conjunto por columnas, sin consultar la base de datos.
+        Si no, se delegan en PostgreSQL (`ReportModel._fetch_category_totals` y
+        `ReportModel._fetch_tareas_page`), de modo que solo se reciben los totales agregados
+        y la primera página de tareas que cumplen los filtros. La carga se ejecuta
+        en segundo plano y, si llega un filtro nuevo antes de que termine, la anterior se cancela.
+        """
+        category_filter = None if category == utils_db.CATEGORIA_TODAS else category
+        self._worker.submit(
+            "filtros",
+            self._load_filtered_data,
+            search_text,
+            category_filter,
+            on_result=self._on_filters_loaded,
+            on_error=lambda message: self._on_load_error("aplicar filtros", message)
+        )
+
+    @Slot(str, str)
+    def _search_suggestions(self, search_text: str, category: str) -> None:
         """
-        CATEGORY_MAP = {
-            1: "Ofimática",
-            2: "Programación",
-            3: "Ocio"
+        Pide al buscador (`ReportModel._search_tareas`) las tareas más parecidas al texto escrito
+        y muestra sus nombres como sugerencias, de la más a la menos relevante.
+
+        La búsqueda se ejecuta en segundo plano y, si el usuario sigue escribiendo, la anterior
+        se cancela. Con menos de `SEARCH_MIN_LENGTH_DB` caracteres no se piden sugerencias.
+        """
+        search_text = search_text.strip()
+        if len(search_text) < utils_db.SEARCH_MIN_LENGTH_DB:
+            self._worker.cancel("busqueda")
+            self._view._set_search_suggestions([])
+            return
+
+        category_filter = None if category == utils_db.CATEGORIA_TODAS else category
+        self._worker.submit(
+            "busqueda",
+            self._model._search_tareas,
+            search_text,
+            category_filter,
+            on_result=self._on_search_results,
+            on_error=lambda message: self._on_load_error("buscar tareas", message)
+        )
+
+    def _on_search_results(self, rows: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        Muestra los nombres de las tareas encontradas como sugerencias (en el hilo de la interfaz).
+        """
+        names = dict.fromkeys(row["nombre"] for row in rows or [])
+        self._view._set_search_suggestions(list(names))
+
+    def _load_filtered_data(self, search_text: str, category: Optional[str]) -> Dict[str, Any]:
+        """
+        Obtiene los totales por categoría y las tareas de la tabla para los filtros: la vista
+        filtrada del conjunto en memoria o, si no está disponible, la primera página.
+        Se ejecuta en un hilo de trabajo, por lo que no debe acceder a ningún widget.
+        """
+        dataset = self._model._fetch_report_dataset() if utils_db.USE_IN_MEMORY_DATASET_DB else None
+        first_page = None
+        if dataset is not None:
+            dataset = self._model._filter_report_dataset(dataset, search_text, category)
+            totals = self._model._report_dataset_totals(dataset)
+        else:
+            totals = self._calculate_totals(search_text, category)
+            if totals and totals["total"]:
+                first_page = self._model._fetch_tareas_page(search_text, category, None, utils_db.PAGE_SIZE_DB)
+        return {
+            "search_text": search_text,
+            "category": category,
+            "dataset": dataset,
+            "first_page": first_page,
+            "totals": totals,
         }
 
+    def _on_filters_loaded(self, result: Dict[str, Any]) -> None:
+        """
+        Actualiza la vista con el resultado del filtrado (en el hilo de la interfaz).
+        """
         try:
-            # Obtener los datos completos desde el modelo
-            model_data = self._model._fetch_data(utils_db.EnumTablasDB.TAREAS.value)
-
-            if not model_data:
+            self._current_filters = (result["search_text"], result["category"])
+            totals = result["totals"]
+            if totals is None:
                 _printv2(parent=self._popup_parent, message="No se encontraron datos para aplicar filtros.")
-                self._view._clear_chart()
-                self._view._set_model(QStandardItemModel())
-                self._view.filtered_data = []
-                self._view._set_number(0, {"Ofimática": 0, "Programación": 0, "Ocio": 0})
+                self._clear_chart()
+                self._set_table_model(QStandardItemModel())
+                self._view._set_number(0, {})
                 return
 
-            # Filtrar datos según el texto de búsqueda y la categoría
-            filtered_data = [
-                row for row in model_data
-                if (
-                    not search_text.strip() or
-                    search_text.lower() in str(row["id_categoria"]).lower() or
-                    search_text.lower() in row["nombre"].lower() or
-                    search_text.lower() in row["description"].lower() or
-                    search_text.lower() in row["idusuario"].lower()
-                ) and
-                (category == "Todas" or CATEGORY_MAP.get(row["id_categoria"], "").lower() == category.lower())
-            ]
-
-            self._view.filtered_data = filtered_data
-            if not filtered_data:
+            if not totals["total"]:
                 _printv2(parent=self._popup_parent, message="No se encontraron datos con los filtros aplicados.")
-                self._view._clear_chart()
-                self._view._set_model(QStandardItemModel())
-                self._view._set_number(0, {"Ofimática": 0, "Programación": 0, "Ocio": 0})
+                self._clear_chart()
+                self._set_table_model(QStandardItemModel())
+                self._view._set_number(0, totals["categories"])
                 return
 
-            # Actualizar la tabla con los datos filtrados
-            prepared_data = self._prepare_table_data({
-                "columns": ["id_categoria", "nombre", "description", "idusuario"],
-                "data": filtered_data,
-            })
-            self._view._set_model(prepared_data)
+            # Actualizar la tabla con los datos filtrados (en memoria o cargados por páginas)
+            prepared_data = self._prepare_table_data(
+                result["search_text"], result["category"], result["first_page"], result["dataset"]
+            )
+            self._set_table_model(prepared_data)
 
-            # Calcular totales por categoría y actualizar resumen
-            totals = self._calculate_totals(filtered_data)
+            # Totales por categoría (del conjunto en memoria o agregados en PostgreSQL)
             self._view._set_number(totals["total"], totals["categories"])
 
-            # Filtrar y agrupar los datos para la gráfica
-            chart_totals = totals["categories"]
-            chart_data = {
-                utils_db.EnumEjes.EJE_X.value: list(chart_totals.keys()),  # Categorías
-                utils_db.EnumEjes.EJE_Y.value: {"Totales": list(chart_totals.values())}  # Totales
-            }
-            self._view._set_chart(chart_data)
+            # Serie de la gráfica obtenida en la misma agregación
+            self._set_chart(self._prepare_chart_data(totals["chart"]))
 
         except Exception as e:
-            _printv2(parent=self._popup_parent, message=f"Error al aplicar filtros: {e}")
+            _printv2(parent=self._popup_parent, message=f"Error al aplicar filtros: {e}", level=logging.ERROR)
 
-    @Slot(list)
-    def generate_pdf(self, data: List[Dict[str, Any]]) -> None:
-        output_path = os.path.join(os.getcwd(), "reporte_tareas.pdf")
-        chart_image_path = "temp_chart.png"  # Ruta temporal para guardar el gráfico
+    def _set_table_model(self, model: Any) -> None:
+        """
+        Muestra un modelo en la tabla, cancelando las páginas que aún pidiera el modelo anterior.
+        """
+        if isinstance(self._table_model, PaginatedTableModel):
+            self._table_model.cancel_fetches()
+        self._table_model = model
+        self._view._set_model(model)
 
-        try:
-            # Guardar el gráfico como una imagen (asumiendo que `chart_widget` tiene este método)
-            self._view.chart_widget.save_chart_as_image(chart_image_path)
-
-            # Crear el PDF
-            pdf = canvas.Canvas(output_path, pagesize=letter)
-            pdf.setTitle("Reporte de Tareas Filtradas")
-            pdf.setFont("Helvetica-Bold", 14)
-            pdf.drawString(50, 750, "Reporte de Tareas Filtradas")
-            pdf.setFont("Helvetica", 10)
-
-            # Filtros aplicados
-            y_position = 700
-
-            # Datos filtrados
-            if not data:
-                pdf.drawString(50, y_position, "No se encontraron datos con los filtros aplicados.")
-            else:
-                for row in data:
-                    if y_position < 50:  # Nueva página si queda poco espacio
-                        pdf.showPage()
-                        y_position = 750
-
-                    pdf.setFont("Helvetica-Bold", 10)
-                    pdf.drawString(50, y_position, "Nombre tarea: ")
-                    pdf.setFont("Helvetica", 10)
-                    pdf.drawString(150, y_position, row["nombre"])
-                    y_position -= 20
-
-                    pdf.setFont("Helvetica-Bold", 10)
-                    pdf.drawString(50, y_position, "Descripción: ")
-                    pdf.setFont("Helvetica", 10)
-                    pdf.drawString(150, y_position, row["description"])
-                    y_position -= 20
-
-                    pdf.setFont("Helvetica-Bold", 10)
-                    pdf.drawString(50, y_position, "Autor: ")
-                    pdf.setFont("Helvetica", 10)
-                    pdf.drawString(150, y_position, row["idusuario"])
-                    y_position -= 40
-
-            # Agregar el gráfico al PDF
-            pdf.showPage()  # Crear una nueva página para el gráfico
-            pdf.drawString(50, 750, "Gráfico de Datos")
-            pdf.drawImage(chart_image_path, 50, 400, width=500, height=300)  # Ajustar dimensiones del gráfico
-
-            # Guardar el PDF
-            pdf.save()
-            _printv2(show_popup=True, parent=self._popup_parent, message=f"PDF generado con éxito en: {output_path}")
+    def _set_chart(self, chart_data: Dict[str, Any]) -> None:
+        """
+        Muestra el gráfico y guarda sus datos para la exportación.
+        """
+        self._current_chart_data = chart_data
+        self._view._set_chart(chart_data)
 
-        except Exception as e:
-            error_msg = f"Error al generar el PDF: {e}"
-            _printv2(show_popup=True, parent=self._popup_parent, message=error_msg)
+    def _clear_chart(self) -> None:
+        """
+        Vacía el gráfico y descarta sus datos.
+        """
+        self._current_chart_data = None
+        self._view._clear_chart()
+
+    def _on_load_error(self, action: str, message: str) -> None:
+        """
+        Notifica un error producido durante una carga en segundo plano.
+        """
+        _printv2(parent=self._popup_parent, message=f"Error al {action}: {message}", level=logging.ERROR)
+
+    @Slot()
+    def generate_pdf(self) -> None:
+        """
+        Genera el PDF del informe con los filtros aplicados actualmente.
+
+        El documento se genera en segundo plano leyendo las tareas por lotes con un cursor del
+        lado del servidor, de modo que la interfaz no se bloquea y la memoria no crece con el
+        número de tareas. El gráfico se dibuja en el PDF a partir de los datos agregados que se
+        muestran (`ChartRenderer`), sin capturar la imagen del widget.
+        """
+        output_path = os.path.join(os.getcwd(), "reporte_tareas.pdf")
+        search_text, category = self._current_filters
+        total_rows = self._view.total_rows
+        self._view._set_pdf_progress(0, total_rows)
+        self._worker.submit(
+            "pdf",
+            self._export_pdf,
+            output_path,
+            search_text,
+            category,
+            total_rows,
+            self._current_chart_data,
+            pass_context=True,
+            on_progress=self._view._set_pdf_progress,
+            on_result=self._on_pdf_generated,
+            on_error=self._on_pdf_error
+        )
+
+    def _export_pdf(
+        self,
+        output_path: str,
+        search_text: str,
+        category: Optional[str],
+        total_rows: int,
+        chart_data: Optional[Dict[str, Any]],
+        context: TaskContext
+    ) -> str:
+        """
+        Escribe el PDF del informe. Se ejecuta en un hilo de trabajo, por lo que no debe
+        acceder a ningún widget; el progreso se notifica mediante `context`.
 
-        finally:
-            # Eliminar el archivo temporal del gráfico
-            if os.path.exists(chart_image_path):
-                os.remove(chart_image_path)
+        reportlab se importa aquí, la primera vez que se genera un PDF, para no retrasar el arranque.
+        """
+        with startup_profiler.phase("importar_reportlab"):
+            from exports.pdf_exporter import TareasPdfExporter
+
+        exporter = TareasPdfExporter(output_path)
+        exporter.export(
+            self._model._stream_filtered_tareas(search_text, category),
+            total_rows=total_rows,
+            chart_data=chart_data,
+            filters={
+                "Buscar": search_text or "-",
+                "Categoría": category or utils_db.CATEGORIA_TODAS,
+            },
+            on_progress=context.report_progress,
+            is_cancelled=context.is_cancelled
+        )
+        return output_path
+
+    def _on_pdf_generated(self, output_path: str) -> None:
+        """
+        Notifica que el PDF se ha generado (en el hilo de la interfaz).
+        """
+        self._view._finish_pdf_progress()
+        _printv2(show_popup=True, parent=self._popup_parent, message=f"PDF generado con éxito en: {output_path}")
 
+    def _on_pdf_error(self, message: str) -> None:
+        """
+        Notifica un error al generar el PDF (en el hilo de la interfaz).
+        """
+        self._view._finish_pdf_progress()
+        _printv2(show_popup=True, parent=self._popup_parent, message=f"Error al generar el PDF: {message}", level=logging.ERROR)
+
+    def _prepare_table_data(
+        self,
+        search_text: str = "",
+        category: Optional[str] = None,
+        first_page: Optional[List[Dict[str, Any]]] = None,
+        dataset: Optional[ReportDataset] = None
+    ) -> Union[PaginatedTableModel, DatasetTableModel]:
+        """
+        Crea el modelo de la tabla para los filtros indicados.
 
-    def _prepare_table_data(self, model_data: Dict[str, Any]) -> QStandardItemModel:
-        qt_model = QStandardItemModel()
-        columns = model_data.get("columns", [])
-        qt_model.setHorizontalHeaderLabels(columns)
+        Si se indica la vista filtrada del conjunto en memoria, la tabla lee directamente de
+        ella. Si no, el modelo parte de la primera página (ya obtenida en segundo plano, si se
+        indica) y el resto se carga por páginas (paginación por clave) a medida que el usuario
+        se desplaza por la tabla, siempre a través del trabajador (`self._worker`).
+        """
+        if dataset is not None:
+            return DatasetTableModel(self._model.TAREAS_REPORT_COLUMNS, dataset)
 
-        for row in model_data.get("data", []):
-            items = [QStandardItem(str(row.get(col, ""))) for col in columns]
-            qt_model.appendRow(items)
+        def fetch_page(after_key: Optional[Any], limit: int) -> Optional[List[Dict[str, Any]]]:
+            return self._model._fetch_tareas_page(search_text, category, after_key, limit)
 
-        return qt_model
+        return PaginatedTableModel(
+            columns=self._model.TAREAS_REPORT_COLUMNS,
+            fetch_page=fetch_page,
+            key_column=self._model.TAREAS_KEY_COLUMN,
+            worker=self._worker,
+            initial_rows=first_page
+        )
 
     def _prepare_chart_data(self, model_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prepara los datos del gráfico, reducidos a un máximo de `CHART_MAX_POINTS` categorías
+        (ver `utils_chart.reduce_chart_data`) para que el coste de dibujarlo esté acotado.
+        """
         eje_x = model_data.get(utils_db.EnumEjes.EJE_X.value, [])
         barritas_datos = model_data.get(utils_db.EnumEjes.EJE_Y.value, {})
 
-        return {
+        return reduce_chart_data({
             utils_db.EnumEjes.EJE_X.value: eje_x,
             utils_db.EnumEjes.EJE_Y.value: barritas_datos
-        }
+        })
 
-    def _calculate_totals(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_totals(self, search_text: str = "", category: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Calcula los totales generales y por categoría.
-        """
-        CATEGORY_MAP = {
-            1: "Ofimática",
-            2: "Programación",
-            3: "Ocio"
-        }
-        totals = {"Ofimática": 0, "Programación": 0, "Ocio": 0}
-        for row in data:
-            category_name = CATEGORY_MAP.get(row["id_categoria"], "")
-            if category_name in totals:
-                totals[category_name] += 1
 
-        return {
-            "total": sum(totals.values()),
-            "categories": totals
-        }
+        La agregación se delega en PostgreSQL (`ReportModel._fetch_category_totals`), por lo
+        que el coste no depende del número de tareas sino del número de categorías.
+        """
+        return self._model._fetch_category_totals(search_text, category)
@@ -0,0 +1,421 @@
+"""
+* WEBGRAFÍA *
+
+- argparse — Parser for command-line options. (s. f.). Python documentation. de https://docs.python.org/3/library/argparse.html
+
+- concurrent.futures.ProcessPoolExecutor. (s. f.). Python documentation. de https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+
+- csv — CSV File Reading and Writing. (s. f.). Python documentation. de https://docs.python.org/3/library/csv.html
+
+"""
+
+# Archivo: src/exports/batch_report.py
+#
+# Generación de informes de tareas sin interfaz gráfica (por ejemplo, en tareas programadas).
+#
+# Reutiliza los filtros y agregaciones de ReportModel y los exportadores del informe, sin crear
+# ventanas ni widgets. Los informes por usuario se reparten entre varios procesos, cada uno con
+# su propia conexión a la base de datos.
+#
+# Uso desde la línea de comandos (desde la carpeta src):
+#     python -m exports.batch_report --destino reporte.pdf --buscar revisión --categoria Ofimática
+#     python -m exports.batch_report --formato csv --usuario antonio@gmail.com --destino informes/
+#     python -m exports.batch_report --por-usuario --procesos 4 --destino informes/
+
+import argparse
+import atexit
+import csv
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from exports.chart_renderer import ChartRenderer
+from exports.pdf_exporter import TareasPdfExporter
+from models.manager_db import ManagerDB
+from models.report_model import ReportModel
+from repositories.usuario_repository import UsuarioRepository
+from utils import utils_db
+from utils.utils_logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Formatos de salida admitidos
+FORMATO_PDF = "pdf"
+FORMATO_CSV = "csv"
+FORMATO_SVG = "svg"  # Solo el gráfico
+FORMATOS = (FORMATO_PDF, FORMATO_CSV, FORMATO_SVG)
+
+# Nombre del informe cuando el destino es una carpeta
+DEFAULT_REPORT_NAME = "reporte_tareas"
+
+
+class ReportJob:
+    """
+    Informe a generar: filtros, formato y ruta de destino.
+
+    Solo contiene datos simples, de modo que puede enviarse a otro proceso.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        file_format: str = FORMATO_PDF,
+        search_text: str = "",
+        category: Optional[str] = None,
+        usuario: Optional[str] = None,
+        title: str = "Reporte de Tareas Filtradas"
+    ):
+        """
+        Inicializa el informe.
+
+        Parámetros:
+        - output_path (str): Ruta del archivo a generar.
+        - file_format (str): Uno de `FORMATOS`.
+        - search_text (str): Texto a buscar (como el buscador de la ventana del informe).
+        - category (str | None): Nombre de la categoría o None para no filtrar por categoría.
+        - usuario (str | None): Email del usuario o None para no filtrar por usuario.
+        - title (str): Título del documento.
+
+        Excepciones:
+        - ValueError: Si el formato no es válido.
+        """
+        if file_format not in FORMATOS:
+            raise ValueError(f"Formato no admitido: '{file_format}'. Use uno de: {', '.join(FORMATOS)}.")
+
+        self.output_path = output_path
+        self.file_format = file_format
+        self.search_text = search_text or ""
+        self.category = category
+        self.usuario = usuario
+        self.title = title
+    # __init__ (fin)
+
+    def filters(self) -> Dict[str, str]:
+        """
+        Devuelve los filtros aplicados {descripción: valor}, para la cabecera del informe.
+        """
+        filters = {
+            "Buscar": self.search_text or "-",
+            "Categoría": self.category or utils_db.CATEGORIA_TODAS,
+        }
+        if self.usuario:
+            filters["Usuario"] = self.usuario
+        return filters
+    # filters (fin)
+
+    def __repr__(self) -> str:
+        """
+        Representación técnica del informe.
+        """
+        return (f"ReportJob(output_path={self.output_path!r}, file_format={self.file_format!r}, "
+                f"search_text={self.search_text!r}, category={self.category!r}, usuario={self.usuario!r})")
+    # __repr__ (fin)
+# ReportJob (fin)
+
+
+class ReportGenerator:
+    """
+    Genera informes con los mismos datos que la ventana del informe, sin interfaz gráfica.
+
+    Los totales por categoría se agregan en PostgreSQL (`ReportModel._fetch_category_totals`),
+    el gráfico se dibuja a partir de ellos (`ChartRenderer`) y las tareas se leen por lotes con
+    un cursor del lado del servidor (`ReportModel._stream_filtered_tareas`), de modo que la
+    memoria no crece con el número de tareas.
+    """
+
+    def __init__(self, db_manager: ManagerDB):
+        """
+        Inicializa el generador.
+
+        Parámetros:
+        - db_manager (ManagerDB): Gestor con la conexión (o pool) abierta.
+        """
+        # Sin caché: cada informe se genera una sola vez
+        self._model = ReportModel(db_manager=db_manager, use_cache=False)
+    # __init__ (fin)
+
+    def generate(self, job: ReportJob) -> Dict[str, Any]:
+        """
+        Genera un informe.
+
+        Parámetros:
+        - job (ReportJob): Informe a generar.
+
+        Retorno:
+        - dict: {"output_path", "rows", "seconds"}.
+
+        Excepciones:
+        - RuntimeError: Si no se pueden calcular los totales.
+        - psycopg.Error / OSError: Si falla la lectura de las tareas o la escritura del archivo.
+        """
+        start = time.perf_counter()
+        totals = self._model._fetch_category_totals(job.search_text, job.category, job.usuario)
+        if totals is None:
+            raise RuntimeError("No se pudieron calcular los totales del informe.")
+        chart_data = totals["chart"] if totals["total"] else None
+
+        output_dir = os.path.dirname(os.path.abspath(job.output_path))
+        os.makedirs(output_dir, exist_ok=True)
+
+        if job.file_format == FORMATO_PDF:
+            rows = TareasPdfExporter(job.output_path, title=job.title).export(
+                self._stream_rows(job),
+                total_rows=totals["total"],
+                chart_data=chart_data,
+                filters=job.filters()
+            )
+        elif job.file_format == FORMATO_CSV:
+            rows = self._write_csv(job)
+        else:
+            self._write_atomic(job.output_path, ChartRenderer(title=job.title).to_svg(chart_data))
+            rows = totals["total"]
+
+        return {"output_path": job.output_path, "rows": rows, "seconds": time.perf_counter() - start}
+    # generate (fin)
+
+    def _stream_rows(self, job: ReportJob):
+        """
+        Devuelve los lotes de tareas que cumplen los filtros del informe.
+        """
+        return self._model._stream_filtered_tareas(job.search_text, job.category, usuario=job.usuario)
+    # _stream_rows (fin)
+
+    def _write_csv(self, job: ReportJob) -> int:
+        """
+        Escribe las tareas del informe en CSV (con cabecera) y devuelve el número de filas.
+        """
+        columns = self._model.TAREAS_REPORT_COLUMNS
+        written = 0
+        fd, temp_path = tempfile.mkstemp(suffix=".csv", dir=os.path.dirname(os.path.abspath(job.output_path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+                writer.writeheader()
+                for rows in self._stream_rows(job):
+                    writer.writerows(rows)
+                    written += len(rows)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, job.output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return written
+    # _write_csv (fin)
+
+    @staticmethod
+    def _write_atomic(output_path: str, content: bytes) -> None:
+        """
+        Escribe un archivo completo a través de un archivo temporal de la misma carpeta.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    # _write_atomic (fin)
+
+    def close(self) -> None:
+        """
+        Cierra la conexión del generador (al terminar un proceso del pool).
+        """
+        self._model._close_connection()
+    # close (fin)
+# ReportGenerator (fin)
+
+
+# Generador de cada proceso del pool (se crea una vez por proceso en `_init_worker`)
+_worker_generator: Optional[ReportGenerator] = None
+
+
+def _init_worker() -> None:
+    """
+    Prepara un proceso del pool: configura el registro y abre su propia conexión.
+
+    Las migraciones ya las ha aplicado el proceso principal; cada proceso solo se conecta.
+    """
+    global _worker_generator
+    setup_logging()
+    db_manager = ManagerDB(show_popup=False, use_pool=False)
+    if not db_manager.open_connection():
+        raise RuntimeError("No se pudo conectar a la base de datos.")
+    _worker_generator = ReportGenerator(db_manager)
+    atexit.register(_worker_generator.close)
+# _init_worker (fin)
+
+
+def _run_job(job: ReportJob) -> Dict[str, Any]:
+    """
+    Genera un informe en un proceso del pool.
+    """
+    return _worker_generator.generate(job)
+# _run_job (fin)
+
+
+def run_jobs(jobs: List[ReportJob], db_manager: ManagerDB, processes: int = 1) -> List[Dict[str, Any]]:
+    """
+    Genera varios informes, en paralelo si se indica más de un proceso.
+
+    reportlab dibuja en Python y retiene el GIL, por lo que los informes se reparten entre
+    procesos (no hilos). Cada proceso abre una única conexión, de modo que el número de
+    conexiones a la base de datos no supera el número de procesos.
+
+    Los procesos se inician con "spawn": con "fork" heredarían el registro ya configurado del
+    proceso principal sin su hilo de escritura, y sus mensajes se perderían.
+
+    Parámetros:
+    - jobs (list[ReportJob]): Informes a generar.
+    - db_manager (ManagerDB): Gestor del proceso principal (solo se usa con un proceso).
+    - processes (int): Número de procesos.
+
+    Retorno:
+    - list[dict]: Un resultado por informe, en el orden en que terminan. Los informes que fallan
+      tienen la clave "error" con el mensaje.
+    """
+    results: List[Dict[str, Any]] = []
+    if processes <= 1 or len(jobs) <= 1:
+        generator = ReportGenerator(db_manager)
+        for job in jobs:
+            results.append(_report_result(job, generator.generate, job))
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=min(processes, len(jobs)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    ) as executor:
+        futures = {executor.submit(_run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            results.append(_report_result(futures[future], future.result))
+    return results
+# run_jobs (fin)
+
+
+def _report_result(job: ReportJob, func, *args) -> Dict[str, Any]:
+    """
+    Ejecuta la generación de un informe y registra el resultado o el error.
+    """
+    try:
+        result = func(*args)
+        logger.info("Informe generado: %s (%d tareas, %.2f s)", result["output_path"], result["rows"], result["seconds"])
+        return result
+    except Exception as e:
+        logger.error("Error al generar %s: %s", job.output_path, e)
+        return {"output_path": job.output_path, "error": str(e)}
+# _report_result (fin)
+
+
+def report_file_name(file_format: str, usuario: Optional[str] = None) -> str:
+    """
+    Devuelve el nombre de archivo de un informe (con el usuario, si se indica, apto para el sistema de archivos).
+    """
+    if not usuario:
+        return f"{DEFAULT_REPORT_NAME}.{file_format}"
+    return f"{DEFAULT_REPORT_NAME}_{re.sub(r'[^0-9A-Za-z_.-]+', '_', usuario)}.{file_format}"
+# report_file_name (fin)
+
+
+def build_jobs(args: argparse.Namespace, db_manager: ManagerDB) -> List[ReportJob]:
+    """
+    Construye los informes a generar a partir de los argumentos de la línea de comandos.
+
+    Excepciones:
+    - ValueError: Si dos informes se escribirían en el mismo archivo.
+    """
+    usuarios: List[Optional[str]] = list(args.usuario or [])
+    if args.por_usuario:
+        usuarios = [usuario._email for usuario in UsuarioRepository(db_manager).iter_all()]
+
+    # Varios informes (o destino terminado en separador o carpeta existente): el destino es una carpeta
+    many = args.por_usuario or len(usuarios) > 1
+    if many or args.destino.endswith(("/", os.sep)) or os.path.isdir(args.destino):
+        output_dir = args.destino
+        paths = {}
+        for usuario in usuarios or [None]:
+            path = os.path.join(output_dir, report_file_name(args.formato, usuario))
+            # Al adaptar el email al sistema de archivos, dos usuarios distintos pueden dar el mismo nombre
+            repeated = next((other for other, other_path in paths.items() if other_path == path), None)
+            if repeated is not None:
+                raise ValueError(f"Los usuarios '{repeated}' y '{usuario}' generarían el mismo archivo: {path}")
+            paths[usuario] = path
+    else:
+        paths = {(usuarios or [None])[0]: args.destino}
+
+    return [
+        ReportJob(
+            output_path=path,
+            file_format=args.formato,
+            search_text=args.buscar,
+            category=args.categoria,
+            usuario=usuario
+        )
+        for usuario, path in paths.items()
+    ]
+# build_jobs (fin)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lee los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Genera informes de tareas sin interfaz gráfica.")
+    parser.add_argument("--destino", default=f"{DEFAULT_REPORT_NAME}.pdf",
+                        help="Archivo a generar, o carpeta si se generan varios informes.")
+    parser.add_argument("--formato", choices=FORMATOS, default=FORMATO_PDF,
+                        help="Formato del informe: pdf (tareas y gráfico), csv (tareas) o svg (gráfico).")
+    parser.add_argument("--buscar", default="", help="Texto a buscar en las tareas.")
+    parser.add_argument("--categoria", default=None, help="Categoría de las tareas (por defecto, todas).")
+    parser.add_argument("--usuario", action="append",
+                        help="Email del usuario; puede repetirse para generar un informe por usuario.")
+    parser.add_argument("--por-usuario", action="store_true",
+                        help="Genera un informe por cada usuario de la tabla usuarios.")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1,
+                        help="Número de procesos (y de conexiones a la base de datos) para generar los informes.")
+    args = parser.parse_args(argv)
+    if args.categoria == utils_db.CATEGORIA_TODAS:
+        args.categoria = None
+    return args
+# parse_args (fin)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Genera los informes indicados en los argumentos.
+
+    Retorno:
+    - int: Código de salida (0 si se generan todos los informes, 1 si falla alguno).
+    """
+    from utils.utils_init import initialize_app
+
+    db_manager = initialize_app(show_popup=False, use_pool=False)
+    try:
+        jobs = build_jobs(args, db_manager)
+        start = time.perf_counter()
+        results = run_jobs(jobs, db_manager, args.procesos)
+        elapsed = time.perf_counter() - start
+    finally:
+        db_manager.close_connection()
+
+    failed = [result for result in results if "error" in result]
+    logger.info("%d informes generados en %.2f s (%d con errores).", len(results) - len(failed), elapsed, len(failed))
+    return 1 if failed else 0
+# run (fin)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    try:
+        sys.exit(run(parse_args()))
+    except Exception as e:
+        logger.error("Error al generar los informes: %s", e)
+        sys.exit(1)
+# if __name__ == "__main__" (fin)
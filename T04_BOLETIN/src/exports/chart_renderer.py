@@ -0,0 +1,136 @@
+"""
+* WEBGRAFÍA *
+
+- ReportLab PDF Library User Guide - Chapter 11: Graphics. (s. f.). Reportlab.com. de https://docs.reportlab.com/reportlab/userguide/ch11_graphics/
+
+- ReportLab PDF Library User Guide - Chapter 13: Charts. (s. f.). Reportlab.com. de https://docs.reportlab.com/reportlab/userguide/ch13_charts/
+
+"""
+
+# Archivo: src/exports/chart_renderer.py
+
+from typing import Any, Dict, List, Optional
+from reportlab.graphics import renderSVG
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from utils.utils_chart import reduce_chart_data
+from utils.utils_db import EnumEjes
+
+
+class ChartRenderer:
+    """
+    Dibuja el gráfico de barras del informe a partir de los datos agregados, sin la interfaz.
+
+    `CustomChartWidget` solo puede capturarse desde el hilo de la interfaz y con la ventana
+    abierta. Este renderizador construye el mismo gráfico (mismas categorías, conjuntos y
+    título) como un dibujo vectorial de reportlab, que puede insertarse directamente en el PDF
+    o convertirse a SVG en memoria, desde cualquier hilo o desde un proceso sin interfaz gráfica.
+
+    Los datos tienen el formato de `EnumEjes` y se reducen con `utils_chart.reduce_chart_data`,
+    igual que antes de dibujarlos en pantalla.
+    """
+
+    # Colores de los conjuntos de barras, en orden
+    BAR_COLORS = (
+        colors.HexColor("#209fdf"), colors.HexColor("#99ca53"), colors.HexColor("#f6a625"),
+        colors.HexColor("#6d5fd5"), colors.HexColor("#bf593e"),
+    )
+
+    # Número de categorías a partir del cual las etiquetas del eje X se dibujan en vertical
+    VERTICAL_LABELS_FROM = 8
+
+    def __init__(self, width: float = 17 * cm, height: float = 10 * cm, title: str = "Gráfico de ventas por producto"):
+        """
+        Inicializa el renderizador.
+
+        Parámetros:
+        - width (float): Ancho del dibujo, en puntos.
+        - height (float): Alto del dibujo, en puntos.
+        - title (str): Título del gráfico.
+        """
+        self._width = width
+        self._height = height
+        self._title = title
+    # __init__ (fin)
+
+    def drawing(self, chart_data: Optional[Dict[str, Any]]) -> Drawing:
+        """
+        Construye el gráfico como un dibujo de reportlab (que también es un flowable de platypus).
+
+        Parámetros:
+        - chart_data (dict | None): Datos del gráfico con el formato de `EnumEjes`.
+
+        Retorno:
+        - Drawing: Dibujo del gráfico, o del aviso "Sin datos disponibles" si no hay datos.
+        """
+        chart_data = reduce_chart_data(chart_data or {})
+        eje_x: List[Any] = chart_data.get(EnumEjes.EJE_X.value, [])
+        barritas_datos: Dict[str, List[float]] = chart_data.get(EnumEjes.EJE_Y.value, {})
+
+        drawing = Drawing(self._width, self._height)
+        if not eje_x or not barritas_datos:
+            drawing.add(String(self._width / 2, self._height / 2, "Sin datos disponibles",
+                               fontName="Helvetica", fontSize=12, textAnchor="middle"))
+            return drawing
+
+        vertical_labels = len(eje_x) >= self.VERTICAL_LABELS_FROM
+        label_space = 2.5 * cm if vertical_labels else 1 * cm
+        legend_space = 1.5 * cm if len(barritas_datos) > 1 else 0
+
+        chart = VerticalBarChart()
+        chart.x = 1.5 * cm
+        chart.y = label_space
+        chart.width = self._width - chart.x - 0.5 * cm - legend_space
+        chart.height = self._height - label_space - 1.2 * cm
+        chart.data = [list(values) for values in barritas_datos.values()]
+        chart.barSpacing = 1
+        chart.groupSpacing = 6
+        for index in range(len(chart.data)):
+            chart.bars[index].fillColor = self.BAR_COLORS[index % len(self.BAR_COLORS)]
+            chart.bars[index].strokeColor = None
+
+        chart.categoryAxis.categoryNames = [str(value) for value in eje_x]
+        chart.categoryAxis.labels.fontSize = 7
+        if vertical_labels:
+            chart.categoryAxis.labels.angle = 90
+            chart.categoryAxis.labels.boxAnchor = "e"
+            chart.categoryAxis.labels.dy = -2
+        chart.valueAxis.valueMin = 0
+        chart.valueAxis.labels.fontSize = 7
+        chart.valueAxis.visibleGrid = True
+        chart.valueAxis.gridStrokeColor = colors.lightgrey
+        drawing.add(chart)
+
+        drawing.add(String(self._width / 2, self._height - 0.6 * cm, self._title,
+                           fontName="Helvetica-Bold", fontSize=11, textAnchor="middle"))
+
+        if legend_space:
+            legend = Legend()
+            legend.x = self._width - legend_space
+            legend.y = chart.y + chart.height
+            legend.fontSize = 7
+            legend.alignment = "right"
+            legend.colorNamePairs = [
+                (self.BAR_COLORS[index % len(self.BAR_COLORS)], name)
+                for index, name in enumerate(barritas_datos)
+            ]
+            drawing.add(legend)
+        return drawing
+    # drawing (fin)
+
+    def to_svg(self, chart_data: Optional[Dict[str, Any]]) -> bytes:
+        """
+        Devuelve el gráfico como SVG en memoria, sin escribir archivos temporales.
+
+        Parámetros:
+        - chart_data (dict | None): Datos del gráfico con el formato de `EnumEjes`.
+
+        Retorno:
+        - bytes: Documento SVG codificado en UTF-8.
+        """
+        return renderSVG.drawToString(self.drawing(chart_data)).encode("utf-8")
+    # to_svg (fin)
+# ChartRenderer (fin)
@@ -0,0 +1,270 @@
+"""
+* WEBGRAFÍA *
+
+- ReportLab PDF Library User Guide - Chapter 5: PLATYPUS. (s. f.). Reportlab.com. de https://docs.reportlab.com/reportlab/userguide/ch5_platypus/
+
+- ReportLab PDF Library User Guide - Chapter 7: Tables and TableStyles. (s. f.). Reportlab.com. de https://docs.reportlab.com/reportlab/userguide/ch7_tables/
+
+- tempfile — Generate temporary files and directories. (s. f.). Python documentation. de https://docs.python.org/3/library/tempfile.html
+
+"""
+
+# Archivo: src/exports/pdf_exporter.py
+
+import os
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    Flowable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+)
+from reportlab.platypus.doctemplate import PageTemplate
+from reportlab.platypus.frames import Frame
+from exports.chart_renderer import ChartRenderer
+
+
+class ExportCancelledError(Exception):
+    """
+    Se lanza cuando se cancela una exportación en curso.
+    """
+# ExportCancelledError (fin)
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """
+    Documento de platypus que se construye a partir de lotes de flowables.
+
+    `SimpleDocTemplate.build` necesita la lista completa de flowables antes de empezar.
+    Esta clase reparte las páginas a medida que llegan los lotes, usando los mismos pasos
+    internos que `build` (`_startBuild`, `handle_flowable` y `_endBuild`), de modo que
+    cada lote puede liberarse en cuanto se ha colocado en sus páginas.
+    """
+
+    def build_stream(self, batches: Iterable[List[Flowable]], on_page: Optional[Callable] = None) -> None:
+        """
+        Construye el documento consumiendo los lotes de flowables de uno en uno.
+
+        Parámetros:
+        - batches (iterable[list[Flowable]]): Lotes de flowables en orden de aparición.
+        - on_page (callable | None): Función `(canvas, documento)` que dibuja elementos fijos
+          de cada página (por ejemplo, el número de página).
+        """
+        self._calc()
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="normal")
+        on_page = on_page or (lambda canvas, document: None)
+        self.addPageTemplates([
+            PageTemplate(id="First", frames=frame, onPage=on_page, pagesize=self.pagesize),
+            PageTemplate(id="Later", frames=frame, onPage=on_page, pagesize=self.pagesize),
+        ])
+
+        self._startBuild()
+        canvas = self.canv
+        canvas._doctemplate = self
+        try:
+            for batch in batches:
+                flowables = list(batch)
+                while flowables:
+                    self.clean_hanging()
+                    self.handle_flowable(flowables)
+        finally:
+            del canvas._doctemplate
+        self._endBuild()
+    # build_stream (fin)
+# StreamingDocTemplate (fin)
+
+
+class TareasPdfExporter:
+    """
+    Genera el informe de tareas en PDF leyendo las filas por lotes.
+
+    Cada lote de filas se convierte en una tabla independiente (con la cabecera repetida en
+    cada página) y se coloca en el documento antes de leer el siguiente, por lo que la memoria
+    usada depende del tamaño del lote y no del número de tareas del informe. El gráfico se
+    dibuja como gráfico vectorial a partir de sus datos agregados (`ChartRenderer`), de modo que
+    la exportación no depende de la interfaz.
+
+    El PDF se escribe primero en un archivo temporal de la misma carpeta y solo sustituye al
+    destino cuando se ha completado, para no dejar informes a medias si falla o se cancela.
+    """
+
+    # Columnas del informe: (clave de la fila, cabecera, ancho)
+    COLUMNS: Sequence[Tuple[str, str, float]] = (
+        ("nombre", "Nombre tarea", 4.5 * cm),
+        ("description", "Descripción", 8 * cm),
+        ("idusuario", "Autor", 5 * cm),
+    )
+
+    # Filas por tabla. Las tablas pequeñas se reparten entre páginas sin tener que dividir
+    # repetidamente una tabla enorme, cuyo coste crece con el número de filas restantes.
+    TABLE_CHUNK_ROWS = 50
+
+    # Fuente de las celdas y margen interior horizontal de cada celda (izquierdo + derecho)
+    CELL_FONT = "Helvetica"
+    CELL_FONT_SIZE = 8
+    CELL_PADDING = 12
+
+    def __init__(self, output_path: Union[str, BinaryIO], title: str = "Reporte de Tareas Filtradas"):
+        """
+        Inicializa el exportador.
+
+        Parámetros:
+        - output_path (str | BinaryIO): Ruta del PDF a generar, o archivo binario abierto (por
+          ejemplo, `io.BytesIO`) donde escribirlo directamente, sin archivo temporal.
+        - title (str): Título del documento.
+        """
+        self._output_path = output_path
+        self._title = title
+
+        styles = getSampleStyleSheet()
+        self._title_style = styles["Title"]
+        self._heading_style = styles["Heading2"]
+        self._text_style = styles["Normal"]
+        self._cell_style = styles["BodyText"].clone(
+            "Celda", fontName=self.CELL_FONT, fontSize=self.CELL_FONT_SIZE, leading=10
+        )
+        self._table_style = TableStyle([
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTNAME", (0, 1), (-1, -1), self.CELL_FONT),
+            ("FONTSIZE", (0, 0), (-1, -1), self.CELL_FONT_SIZE),
+            ("LEADING", (0, 0), (-1, -1), 10),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ])
+    # __init__ (fin)
+
+    def export(
+        self,
+        batches: Iterable[List[Dict[str, Any]]],
+        total_rows: int = 0,
+        chart_data: Optional[Dict[str, Any]] = None,
+        filters: Optional[Dict[str, str]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """
+        Genera el PDF a partir de los lotes de filas.
+
+        Parámetros:
+        - batches (iterable[list[dict]]): Lotes de filas (por ejemplo, de un cursor del lado del servidor).
+        - total_rows (int): Número total de filas esperado, para informar del progreso (0 si se desconoce).
+        - chart_data (dict | None): Datos del gráfico con el formato de `EnumEjes`, que se dibuja
+          como gráfico vectorial. Si no se indica, no se incluye el gráfico.
+        - filters (dict | None): Filtros aplicados {descripción: valor}, que se muestran en la cabecera.
+        - on_progress (callable | None): Función `(filas escritas, total)` llamada tras cada lote.
+        - is_cancelled (callable | None): Función que indica si debe interrumpirse la exportación.
+
+        Retorno:
+        - int: Número de filas escritas.
+
+        Excepciones:
+        - ExportCancelledError: Si se cancela la exportación (no se genera ningún archivo).
+        """
+        written = 0
+
+        def flowable_batches():
+            nonlocal written
+            yield self._header_flowables(total_rows, filters)
+            for rows in batches:
+                if is_cancelled and is_cancelled():
+                    raise ExportCancelledError("Exportación cancelada.")
+                yield [
+                    self._rows_table(rows[start:start + self.TABLE_CHUNK_ROWS])
+                    for start in range(0, len(rows), self.TABLE_CHUNK_ROWS)
+                ]
+                written += len(rows)
+                if on_progress:
+                    on_progress(written, total_rows)
+            if not written:
+                yield [Paragraph("No se encontraron datos con los filtros aplicados.", self._text_style)]
+            if chart_data:
+                yield self._chart_drawing_flowables(chart_data)
+
+        if not isinstance(self._output_path, str):
+            document = StreamingDocTemplate(self._output_path, pagesize=letter, title=self._title)
+            document.build_stream(flowable_batches(), on_page=self._draw_page_number)
+            return written
+
+        output_dir = os.path.dirname(os.path.abspath(self._output_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=output_dir)
+        os.close(fd)
+        # mkstemp crea el archivo solo legible por el propietario; el informe es un documento normal
+        os.chmod(temp_path, 0o644)
+        try:
+            document = StreamingDocTemplate(temp_path, pagesize=letter, title=self._title)
+            document.build_stream(flowable_batches(), on_page=self._draw_page_number)
+            os.replace(temp_path, self._output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return written
+    # export (fin)
+
+    def _header_flowables(self, total_rows: int, filters: Optional[Dict[str, str]]) -> List[Flowable]:
+        """
+        Crea el título, los filtros aplicados y el número de tareas del informe.
+        """
+        flowables: List[Flowable] = [Paragraph(escape(self._title), self._title_style)]
+        for label, value in (filters or {}).items():
+            flowables.append(Paragraph(f"<b>{escape(label)}:</b> {escape(value)}", self._text_style))
+        flowables.append(Paragraph(f"<b>Total de tareas:</b> {total_rows}", self._text_style))
+        flowables.append(Spacer(1, 0.5 * cm))
+        return flowables
+    # _header_flowables (fin)
+
+    def _rows_table(self, rows: List[Dict[str, Any]]) -> Table:
+        """
+        Convierte un lote de filas en una tabla que se divide entre páginas si es necesario.
+        """
+        header = [header for _, header, _ in self.COLUMNS]
+        data = [header] + [
+            [self._cell(row.get(key), width) for key, _, width in self.COLUMNS]
+            for row in rows
+        ]
+        table = Table(data, colWidths=[width for _, _, width in self.COLUMNS], repeatRows=1)
+        table.setStyle(self._table_style)
+        return table
+    # _rows_table (fin)
+
+    def _cell(self, value: Any, column_width: float) -> Union[str, Paragraph]:
+        """
+        Devuelve el contenido de una celda: el texto tal cual si cabe en una línea de la columna,
+        o un `Paragraph` (que reparte el texto en varias líneas) si no cabe. Medir el texto es
+        mucho más barato que maquetar un `Paragraph`, y la mayoría de las celdas caben.
+        """
+        text = str(value or "")
+        if "\n" not in text and \
+                stringWidth(text, self.CELL_FONT, self.CELL_FONT_SIZE) <= column_width - self.CELL_PADDING:
+            return text
+        return Paragraph(escape(text), self._cell_style)
+    # _cell (fin)
+
+    def _chart_drawing_flowables(self, chart_data: Dict[str, Any]) -> List[Flowable]:
+        """
+        Crea una página con el gráfico dibujado (vectorial) a partir de sus datos.
+        """
+        return [
+            PageBreak(),
+            Paragraph("Gráfico de Datos", self._heading_style),
+            ChartRenderer(width=17 * cm, height=12 * cm).drawing(chart_data),
+        ]
+    # _chart_drawing_flowables (fin)
+
+    @staticmethod
+    def _draw_page_number(canvas, document) -> None:
+        """
+        Dibuja el número de página en el pie.
+        """
+        canvas.saveState()
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(document.pagesize[0] - document.rightMargin, document.bottomMargin / 2,
+                               f"Página {document.page}")
+        canvas.restoreState()
+    # _draw_page_number (fin)
+# TareasPdfExporter (fin)
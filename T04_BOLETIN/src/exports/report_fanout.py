@@ -0,0 +1,384 @@
+"""
+* WEBGRAFÍA *
+
+- concurrent.futures.ProcessPoolExecutor / wait. (s. f.). Python documentation. de https://docs.python.org/3/library/concurrent.futures.html
+
+- itertools.groupby. (s. f.). Python documentation. de https://docs.python.org/3/library/itertools.html#itertools.groupby
+
+- zipfile — Work with ZIP archives. (s. f.). Python documentation. de https://docs.python.org/3/library/zipfile.html
+
+"""
+
+# Archivo: src/exports/report_fanout.py
+#
+# Generación de un informe por usuario o por categoría.
+#
+# El proceso principal lee las tareas de todas las particiones con una sola consulta (ordenada
+# por partición) y, a medida que completa cada partición, la envía a un pool de procesos que
+# dibuja su PDF (reportlab es CPU y retiene el GIL). Los PDF se guardan en una carpeta o en un
+# archivo ZIP a medida que terminan. Solo el proceso principal se conecta a la base de datos,
+# por lo que el número de conexiones no depende del número de procesos.
+#
+# Uso desde la línea de comandos (desde la carpeta src):
+#     python -m exports.report_fanout --particion usuario --destino informes.zip --procesos 4
+#     python -m exports.report_fanout --particion categoria --buscar revisión --destino informes/
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import chain, groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from exports.batch_report import report_file_name
+from exports.pdf_exporter import TareasPdfExporter
+from models.manager_db import ManagerDB
+from models.report_model import ReportModel
+from utils import utils_db
+from utils.utils_logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Firma del callback de progreso: (informes generados, estadísticas hasta el momento)
+ProgressCallable = Callable[[int, Dict[str, Any]], None]
+
+
+class DirectorySink:
+    """
+    Destino de los informes: una carpeta con un archivo por informe.
+    """
+
+    def __init__(self, path: str):
+        """
+        Crea la carpeta si no existe.
+        """
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+    # __init__ (fin)
+
+    def write(self, name: str, content: bytes) -> None:
+        """
+        Guarda un informe (a través de un archivo temporal, para no dejar informes a medias).
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self._path)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, os.path.join(self._path, name))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    # write (fin)
+
+    def close(self, completed: bool) -> None:
+        """
+        No hace nada: cada informe ya está guardado.
+        """
+    # close (fin)
+# DirectorySink (fin)
+
+
+class ZipSink:
+    """
+    Destino de los informes: un archivo ZIP con un PDF por informe.
+
+    El ZIP se escribe en un archivo temporal y solo sustituye al destino si se completan
+    todos los informes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre el archivo ZIP temporal en la carpeta del destino.
+        """
+        self._path = path
+        output_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(output_dir, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(suffix=".zip", dir=output_dir)
+        os.close(fd)
+        # Los PDF de reportlab ya van comprimidos: se guardan sin volver a comprimirlos
+        self._zip = zipfile.ZipFile(self._temp_path, "w", compression=zipfile.ZIP_STORED)
+    # __init__ (fin)
+
+    def write(self, name: str, content: bytes) -> None:
+        """
+        Añade un informe al ZIP.
+        """
+        self._zip.writestr(name, content)
+    # write (fin)
+
+    def close(self, completed: bool) -> None:
+        """
+        Cierra el ZIP y lo mueve al destino, o lo descarta si no se han completado los informes.
+        """
+        self._zip.close()
+        if completed:
+            os.chmod(self._temp_path, 0o644)
+            os.replace(self._temp_path, self._path)
+        elif os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+    # close (fin)
+# ZipSink (fin)
+
+
+def _render_partition(
+    file_name: str,
+    partition_name: str,
+    rows: List[Dict[str, Any]],
+    categories: List[str],
+    filters: Dict[str, str],
+    title: str
+) -> Tuple[str, bytes, int]:
+    """
+    Dibuja el PDF de una partición en memoria. Se ejecuta en un proceso del pool, sin conexión
+    a la base de datos: el gráfico se calcula a partir de las propias filas.
+
+    Parámetros:
+    - file_name (str): Nombre del archivo del informe.
+    - partition_name (str): Usuario o categoría de la partición, que se añade al título.
+    - rows (list[dict]): Tareas de la partición.
+    - categories (list[str]): Todas las categorías, en orden de presentación (las que no tienen tareas aparecen con 0).
+    - filters (dict): Filtros aplicados {descripción: valor}.
+    - title (str): Título del documento.
+
+    Retorno:
+    - tuple: (nombre del archivo, contenido del PDF, número de tareas).
+    """
+    counts = dict.fromkeys(categories, 0)
+    for row in rows:
+        counts[row["nombre_categoria"]] = counts.get(row["nombre_categoria"], 0) + 1
+    totals = ReportModel._build_totals(counts)
+
+    buffer = io.BytesIO()
+    TareasPdfExporter(buffer, title=f"{title} - {partition_name}").export(
+        [rows],
+        total_rows=len(rows),
+        chart_data=totals["chart"] if totals["total"] else None,
+        filters=filters
+    )
+    return file_name, buffer.getvalue(), len(rows)
+# _render_partition (fin)
+
+
+class ReportFanout:
+    """
+    Genera un informe por usuario o por categoría repartiendo el dibujo entre varios procesos.
+
+    - Lectura: una sola consulta con cursor del lado del servidor (`ReportModel._stream_partitioned_tareas`),
+      agrupada por partición a medida que llega.
+    - Dibujo: cada partición completa se envía a un `ProcessPoolExecutor`. Como mucho hay
+      `processes * max_pending` particiones pendientes; si los procesos no dan abasto, se deja de leer.
+    - Escritura: los PDF se guardan en una carpeta o en un ZIP en cuanto terminan.
+    - Conexiones: solo el proceso principal usa la base de datos, a través de un pool de como
+      mucho `max_connections` conexiones.
+    """
+
+    def __init__(
+        self,
+        db_manager: ManagerDB,
+        partition: utils_db.EnumParticion,
+        processes: int = os.cpu_count() or 1,
+        max_pending: int = utils_db.FANOUT_MAX_PENDING_DB,
+        title: str = "Reporte de Tareas"
+    ):
+        """
+        Inicializa el generador.
+
+        Parámetros:
+        - db_manager (ManagerDB): Gestor con la conexión (o pool) abierta.
+        - partition (EnumParticion): Clave por la que se reparten los informes.
+        - processes (int): Número de procesos que dibujan los PDF.
+        - max_pending (int): Particiones pendientes por proceso.
+        - title (str): Título de los documentos (se añade la partición).
+        """
+        self._model = ReportModel(db_manager=db_manager, use_cache=False)
+        self._partition = partition
+        self._processes = max(1, processes)
+        self._max_pending = self._processes * max(1, max_pending)
+        self._title = title
+    # __init__ (fin)
+
+    def run(
+        self,
+        destination: str,
+        search_text: str = "",
+        category: Optional[str] = None,
+        on_progress: Optional[ProgressCallable] = None
+    ) -> Dict[str, Any]:
+        """
+        Genera los informes de todas las particiones.
+
+        Parámetros:
+        - destination (str): Carpeta de destino, o archivo `.zip`.
+        - search_text (str): Texto a buscar en las tareas.
+        - category (str | None): Categoría de las tareas, o None para todas.
+        - on_progress (callable | None): Función `(informes generados, estadísticas)` llamada tras cada informe.
+
+        Retorno:
+        - dict: Estadísticas (ver `_stats`).
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta.
+        - ValueError: Si dos particiones tendrían el mismo nombre de archivo (el ZIP no se genera).
+        - Exception: Si falla el dibujo de algún informe (el ZIP no se genera).
+        """
+        categories = [categoria._nombre_categoria for categoria in self._model._fetch_categorias() or []]
+        filters = {
+            "Buscar": search_text or "-",
+            "Categoría": category or utils_db.CATEGORIA_TODAS,
+        }
+        sink = ZipSink(destination) if destination.lower().endswith(".zip") else DirectorySink(destination)
+
+        self._start = time.perf_counter()
+        self._reports = self._rows = self._bytes = 0
+        completed = False
+        pending: Set[Future] = set()
+        try:
+            with ProcessPoolExecutor(max_workers=self._processes) as executor:
+                for file_name, partition_name, rows in self._partitions(search_text, category):
+                    if len(pending) >= self._max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._save(done, sink, on_progress)
+                    pending.add(executor.submit(
+                        _render_partition, file_name, partition_name, rows, categories, filters, self._title
+                    ))
+                done, pending = wait(pending)
+                self._save(done, sink, on_progress)
+            completed = True
+        finally:
+            for future in pending:
+                future.cancel()
+            sink.close(completed)
+
+        stats = self._stats()
+        logger.info(
+            "%d informes (%d tareas, %.1f MiB) en %.2f s: %.1f informes/s, %.0f tareas/s.",
+            stats["reports"], stats["rows"], stats["bytes"] / 1024 / 1024, stats["seconds"],
+            stats["reports_per_second"], stats["rows_per_second"]
+        )
+        return stats
+    # run (fin)
+
+    def _partitions(self, search_text: str, category: Optional[str]) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        """
+        Agrupa las filas de la consulta por partición y devuelve (nombre del archivo, nombre de
+        la partición, tareas). Las filas de una partición sin tareas (con las columnas de la tarea
+        a None) se descartan, pero la partición se conserva.
+
+        Las categorías se agrupan por su id, ya que su nombre puede repetirse, y el id forma parte
+        del nombre del archivo. Aun así, al adaptar los nombres al sistema de archivos dos claves
+        distintas pueden coincidir (por ejemplo, `a+b@x` y `a_b@x`): en ese caso se lanza un error
+        en lugar de sobrescribir el informe anterior.
+
+        Excepciones:
+        - ValueError: Si dos particiones tendrían el mismo nombre de archivo.
+        """
+        file_names: Dict[str, Any] = {}
+        batches = self._model._stream_partitioned_tareas(self._partition, search_text, category)
+        for partition_key, rows in groupby(chain.from_iterable(batches), key=itemgetter("particion")):
+            rows = list(rows)
+            partition_name = rows[0]["nombre_particion"]
+            if self._partition == utils_db.EnumParticion.CATEGORIA:
+                file_name = report_file_name("pdf", f"{partition_key}_{partition_name}")
+            else:
+                file_name = report_file_name("pdf", partition_name)
+            if file_name in file_names:
+                raise ValueError(
+                    f"Las particiones '{file_names[file_name]}' y '{partition_key}' generarían el mismo archivo: {file_name}"
+                )
+            file_names[file_name] = partition_key
+            yield file_name, partition_name, [row for row in rows if row["nombre"] is not None]
+    # _partitions (fin)
+
+    def _save(self, done: Set[Future], sink, on_progress: Optional[ProgressCallable]) -> None:
+        """
+        Guarda los informes terminados y actualiza las estadísticas.
+        """
+        for future in done:
+            file_name, content, rows = future.result()
+            sink.write(file_name, content)
+            self._reports += 1
+            self._rows += rows
+            self._bytes += len(content)
+            if on_progress:
+                on_progress(self._reports, self._stats())
+    # _save (fin)
+
+    def _stats(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas de la ejecución: informes, tareas, bytes escritos, segundos y rendimiento.
+        """
+        seconds = time.perf_counter() - self._start
+        return {
+            "reports": self._reports,
+            "rows": self._rows,
+            "bytes": self._bytes,
+            "seconds": seconds,
+            "reports_per_second": self._reports / seconds if seconds else 0.0,
+            "rows_per_second": self._rows / seconds if seconds else 0.0,
+        }
+    # _stats (fin)
+# ReportFanout (fin)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Lee los argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Genera un informe de tareas por usuario o por categoría.")
+    parser.add_argument("--particion", choices=[partition.value for partition in utils_db.EnumParticion],
+                        default=utils_db.EnumParticion.USUARIO.value, help="Clave por la que se reparten los informes.")
+    parser.add_argument("--destino", default="informes", help="Carpeta de destino, o archivo .zip.")
+    parser.add_argument("--buscar", default="", help="Texto a buscar en las tareas.")
+    parser.add_argument("--categoria", default=None, help="Categoría de las tareas (por defecto, todas).")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Número de procesos que dibujan los PDF.")
+    parser.add_argument("--conexiones", type=int, default=utils_db.FANOUT_MAX_DB_CONNECTIONS_DB,
+                        help="Número máximo de conexiones a la base de datos.")
+    args = parser.parse_args(argv)
+    if args.categoria == utils_db.CATEGORIA_TODAS:
+        args.categoria = None
+    return args
+# parse_args (fin)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Genera los informes indicados en los argumentos.
+
+    Retorno:
+    - int: Código de salida (0 si se generan todos los informes).
+    """
+    db_manager = ManagerDB(show_popup=False, use_pool=True)
+    if not db_manager.open_pool(min_size=1, max_size=max(1, args.conexiones)):
+        return 1
+    try:
+        db_manager.init_db()
+        fanout = ReportFanout(db_manager, utils_db.EnumParticion(args.particion), processes=args.procesos)
+        fanout.run(
+            args.destino,
+            search_text=args.buscar,
+            category=args.categoria,
+            on_progress=lambda reports, stats: print(
+                f"\r{reports} informes, {stats['reports_per_second']:.1f} informes/s", end="", flush=True
+            )
+        )
+        print()
+    finally:
+        db_manager.close_connection()
+    return 0
+# run (fin)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    try:
+        sys.exit(run(parse_args()))
+    except Exception as e:
+        logger.error("Error al generar los informes: %s", e)
+        sys.exit(1)
+# if __name__ == "__main__" (fin)
@@ -1,11 +1,50 @@
 # Archivo: src/main.py
+#
+# El arranque está pensado para que la ventana aparezca cuanto antes: aquí solo se importa lo
+# imprescindible para mostrarla, mientras que la base de datos (psycopg y las migraciones) y el
+# módulo de reportes (QtCharts) se preparan en segundo plano. reportlab no se importa hasta que
+# se genera el primer PDF. Con la variable de entorno T04_STARTUP_PROFILE=1 se muestra, además,
+# cuánto tarda cada importación.
 
+# Debe importarse antes que el resto para poder medir sus importaciones
+from utils.utils_startup import startup_profiler
+startup_profiler.enable_import_timing()
+
+import logging
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow
-from utils.utils_popup import _printv2
-from utils.utils_init import initialize_app
-from windows.report_window import ReportWindow
-from utils import utils_sizes
+from utils.utils_logging import setup_logging
+
+# Los mensajes se escriben desde un hilo propio, sin bloquear la interfaz
+setup_logging()
+
+with startup_profiler.phase("importar_pyside6"):
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication, QLabel, QMainWindow
+    from utils.utils_popup import _printv2
+    from utils import utils_sizes
+    from workers.db_worker import DbWorker
+
+
+def _prepare_report_module():
+    """
+    Inicializa la base de datos e importa el módulo de reportes. Se ejecuta en un hilo de
+    trabajo, por lo que no debe crear ningún widget.
+
+    Retorno:
+    - ManagerDB: Instancia del gestor de la base de datos inicializado.
+    """
+    with startup_profiler.phase("importar_db"):
+        from utils.utils_init import initialize_app
+
+    with startup_profiler.phase("inicializar_db"):
+        db_manager = initialize_app(show_popup=False)
+
+    # Solo se importa el módulo (QtCharts incluido); la ventana se crea en el hilo de la interfaz
+    with startup_profiler.phase("importar_reportes"):
+        import windows.report_window  # noqa: F401
+
+    return db_manager
+# _prepare_report_module (fin)
 
 
 class MainWindow(QMainWindow):
@@ -14,56 +53,98 @@ class MainWindow(QMainWindow):
     conecta el módulo de reportes.
     """
 
-    def __init__(self, db_manager):
-        """ 
+    def __init__(self):
+        """
         Inicializa la ventana principal de la aplicación.
 
-        Parámetros:
-        - db_manager: Instancia del gestor de la base de datos.
+        La ventana se muestra de inmediato con un mensaje de carga; el módulo de reportes
+        se incorpora cuando termina la inicialización en segundo plano.
         """
         super().__init__()
 
+        # Configuración de la ventana principal
+        self.setWindowTitle("Gestión de Informes")
+        self.setMinimumSize(
+            utils_sizes.SIZE_MINIMUM_WIDTH_WINDOW,
+            utils_sizes.SIZE_MINIMUM_HEIGHT_WINDOW,
+        )
+
+        # Mensaje provisional mientras se prepara el módulo de reportes
+        self._loading_label = QLabel("Cargando...")
+        self._loading_label.setAlignment(Qt.AlignCenter)
+        self.setCentralWidget(self._loading_label)
+
+        self.report_window = None
+        self._worker = DbWorker(self)
+    # __init__ (fin)
+
+    def start(self) -> None:
+        """
+        Lanza la inicialización de la base de datos y del módulo de reportes en segundo plano.
+        """
+        self._worker.submit(
+            "inicio",
+            _prepare_report_module,
+            on_result=self._on_report_module_ready,
+            on_error=self._on_report_module_error
+        )
+    # start (fin)
+
+    def _on_report_module_ready(self, db_manager) -> None:
+        """
+        Crea el módulo de reportes y lo establece como widget central (en el hilo de la interfaz).
+        """
         try:
-            # Configuración de la ventana principal
-            self.setWindowTitle("Gestión de Informes")
-            self.setMinimumSize(
-                utils_sizes.SIZE_MINIMUM_WIDTH_WINDOW,
-                utils_sizes.SIZE_MINIMUM_HEIGHT_WINDOW,
-            )
+            with startup_profiler.phase("crear_ventana_reportes"):
+                from windows.report_window import ReportWindow
+
+                # Inicialización del módulo de reportes
+                self.report_window = ReportWindow(db_manager=db_manager, popup_parent=self)
 
-            # Inicialización del módulo de reportes
-            self.report_window = ReportWindow(db_manager=db_manager, popup_parent=self)
+                # Establecer la vista de reportes como el widget central
+                self.setCentralWidget(self.report_window.get_view())
 
-            # Establecer la vista de reportes como el widget central
-            self.setCentralWidget(self.report_window.get_view())
+            startup_profiler.mark("reportes_visibles")
+            _printv2(show_popup=False, message=startup_profiler.report())
 
         except Exception as e:
-            error_msg = f"Error al inicializar la ventana principal: {e}"
-            _printv2(show_popup=False, message=error_msg)
-            sys.exit(1)
-    # __init__ (fin)
+            self._on_report_module_error(str(e))
+    # _on_report_module_ready (fin)
+
+    def _on_report_module_error(self, message: str) -> None:
+        """
+        Informa de un error durante la inicialización (en el hilo de la interfaz).
+        """
+        error_msg = f"Error al inicializar la ventana principal: {message}"
+        self._loading_label.setText(error_msg)
+        _printv2(show_popup=True, parent=self, message=error_msg, level=logging.ERROR)
+    # _on_report_module_error (fin)
 # MainWindow (fin)
 
 
 if __name__ == "__main__":
     """
-    Punto de entrada de la aplicación. Inicializa la aplicación y muestra la vista principal.
+    Punto de entrada de la aplicación. Muestra la ventana principal y prepara el módulo
+    de reportes en segundo plano.
     """
-    app = QApplication(sys.argv)
+    with startup_profiler.phase("crear_qapplication"):
+        app = QApplication(sys.argv)
 
     try:
-        # Inicialización de la base de datos
-        db_manager = initialize_app(show_popup=False)
-
         # Creamos y mostramos la ventana principal
-        main_window = MainWindow(db_manager=db_manager)
-        main_window.show()
+        with startup_profiler.phase("mostrar_ventana"):
+            main_window = MainWindow()
+            main_window.show()
+        startup_profiler.mark("ventana_visible")
+
+        # Inicialización de la base de datos y del módulo de reportes
+        main_window.start()
 
         # Ejecutamos el ciclo principal de eventos de la aplicación
         sys.exit(app.exec())
 
     except Exception as e:
         # Manejo de errores críticos durante la inicialización
-        _printv2(show_popup=False, message=f"Error crítico en la aplicación: {e}")
+        _printv2(show_popup=False, message=f"Error crítico en la aplicación: {e}", level=logging.CRITICAL)
         sys.exit(1)
 # if __name__ == "__main__" (fin)
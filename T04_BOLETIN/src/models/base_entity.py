@@ -0,0 +1,81 @@
+"""
+* WEBGRAFÍA *
+
+- __slots__. (s. f.). Python documentation. de https://docs.python.org/3/reference/datamodel.html#slots
+
+- itertools.starmap. (s. f.). Python documentation. de https://docs.python.org/3/library/itertools.html#itertools.starmap
+
+- operator.attrgetter. (s. f.). Python documentation. de https://docs.python.org/3/library/operator.html#operator.attrgetter
+
+"""
+
+# Archivo: src/models/base_entity.py
+
+from itertools import starmap
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Type, TypeVar
+
+EntityType = TypeVar("EntityType", bound="BaseEntity")
+
+
+class BaseEntity:
+    """
+    Base de las entidades: operaciones por lotes a partir de la lista de campos de cada entidad.
+
+    Cada entidad declara en `FIELDS` sus campos en el orden de las columnas de su tabla (que es
+    también el orden de los parámetros de su `__init__`) y guarda cada campo en el atributo
+    `_<campo>`, declarado en `__slots__`. Sin `__dict__` por instancia, cada entidad ocupa
+    una fracción de la memoria de un objeto normal, lo que importa al cargar millones de filas.
+    """
+
+    __slots__ = ()
+
+    # Campos de la entidad, en el orden de las columnas de la tabla
+    FIELDS: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_rows(cls: Type[EntityType], rows: Iterable[Sequence[Any]]) -> List[EntityType]:
+        """
+        Crea las entidades a partir de filas (tuplas) con las columnas en el orden de `FIELDS`,
+        tal como las devuelve un cursor con `SELECT <FIELDS> FROM ...`.
+
+        Parámetros:
+        - rows (iterable[sequence]): Filas de la consulta.
+
+        Retorno:
+        - list: Entidades creadas, en el mismo orden que las filas.
+        """
+        return list(starmap(cls, rows))
+    # from_rows (fin)
+
+    @classmethod
+    def iter_from_rows(cls: Type[EntityType], rows: Iterable[Sequence[Any]]) -> Iterator[EntityType]:
+        """
+        Igual que `from_rows`, pero crea las entidades a medida que se recorren (para cursores
+        del lado del servidor o lotes grandes).
+        """
+        return starmap(cls, rows)
+    # iter_from_rows (fin)
+
+    @classmethod
+    def _to_rows(cls, entities: Iterable["BaseEntity"]) -> Iterator[Tuple[Any, ...]]:
+        """
+        Convierte las entidades en tuplas con los campos en el orden de `FIELDS`
+        (por ejemplo, para insertarlas con `executemany` o `COPY`).
+        """
+        getter = attrgetter(*(f"_{field}" for field in cls.FIELDS))
+        if len(cls.FIELDS) == 1:
+            return ((value,) for value in map(getter, entities))
+        return map(getter, entities)
+    # _to_rows (fin)
+
+    @classmethod
+    def _to_dicts(cls, entities: Iterable["BaseEntity"]) -> List[Dict[str, Any]]:
+        """
+        Convierte las entidades en diccionarios (el equivalente por lotes de `_to_dict`),
+        por ejemplo para serializarlas a JSON.
+        """
+        fields = cls.FIELDS
+        return [dict(zip(fields, row)) for row in cls._to_rows(entities)]
+    # _to_dicts (fin)
+# BaseEntity (fin)
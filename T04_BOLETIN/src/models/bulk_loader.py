@@ -0,0 +1,358 @@
+"""
+* WEBGRAFÍA *
+
+- COPY. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/sql-copy.html
+
+- Using COPY TO and COPY FROM. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/basic/copy.html
+
+- INSERT ... ON CONFLICT. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/sql-insert.html#SQL-ON-CONFLICT
+
+- csv — CSV File Reading and Writing. (s. f.). Python documentation. de https://docs.python.org/3/library/csv.html
+
+"""
+
+# Archivo: src/models/bulk_loader.py
+#
+# Carga masiva de datos (usuarios, categorías y tareas) desde archivos CSV o NDJSON.
+#
+# Uso desde la línea de comandos (desde la carpeta src), en el orden que exigen las claves ajenas:
+#     python -m models.bulk_loader categorias=categorias.csv usuarios=usuarios.csv tareas=tareas.ndjson
+
+import csv
+import json
+import logging
+import os
+import sys
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from psycopg import sql
+from utils import utils_db
+from utils.utils_popup import _printv2
+
+# Firma del callback de progreso: (tabla, filas enviadas hasta el momento)
+ProgressCallable = Callable[[str, int], None]
+
+# Formatos de archivo admitidos según su extensión
+FORMATO_CSV = "csv"
+FORMATO_NDJSON = "ndjson"
+_EXTENSIONES = {".csv": FORMATO_CSV, ".ndjson": FORMATO_NDJSON, ".jsonl": FORMATO_NDJSON}
+
+# Estrategias ante filas cuya clave primaria ya existe en la tabla
+CONFLICTO_ACTUALIZAR = "update"
+CONFLICTO_IGNORAR = "ignore"
+CONFLICTO_ERROR = "error"
+
+
+class BulkLoadSource:
+    """
+    Origen de datos de una carga: tabla de destino y filas (o archivo del que leerlas).
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        rows: Optional[Iterable[Dict[str, Any]]] = None,
+        file_path: Optional[str] = None,
+        file_format: Optional[str] = None
+    ):
+        """
+        Inicializa el origen. Debe indicarse `rows` o `file_path`.
+
+        Parámetros:
+        - table_name (str): Tabla de destino (una de `EnumTablasDB`).
+        - rows (iterable[dict] | None): Filas como diccionarios {columna: valor}.
+        - file_path (str | None): Archivo CSV (con cabecera) o NDJSON (un objeto JSON por línea).
+        - file_format (str | None): "csv" o "ndjson". Si es None, se deduce de la extensión del archivo.
+
+        Excepciones:
+        - ValueError: Si no se indica ningún origen o el formato no es válido.
+        """
+        if (rows is None) == (file_path is None):
+            raise ValueError("Debe indicarse 'rows' o 'file_path' (solo uno de ellos).")
+
+        if file_path is not None and file_format is None:
+            file_format = _EXTENSIONES.get(os.path.splitext(file_path)[1].lower())
+        if file_path is not None and file_format not in (FORMATO_CSV, FORMATO_NDJSON):
+            raise ValueError(f"Formato no admitido para '{file_path}'. Use CSV o NDJSON.")
+
+        self.table_name = table_name
+        self.rows = rows
+        self.file_path = file_path
+        self.file_format = file_format
+    # __init__ (fin)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre las filas del origen sin cargarlas todas en memoria.
+
+        Los nombres de columna se pasan a minúsculas (PostgreSQL guarda así los identificadores
+        sin comillas, como `idUsuario`) y, en CSV, los campos vacíos se interpretan como NULL.
+        """
+        if self.rows is not None:
+            for row in self.rows:
+                yield {str(key).lower(): value for key, value in row.items()}
+            return
+
+        with open(self.file_path, "r", encoding="utf-8", newline="") as file:
+            if self.file_format == FORMATO_CSV:
+                for row in csv.DictReader(file):
+                    yield {key.strip().lower(): (value if value != "" else None) for key, value in row.items()}
+            else:
+                for line_number, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Línea {line_number} de '{self.file_path}' no es JSON válido: {e}") from e
+                    yield {str(key).lower(): value for key, value in row.items()}
+    # iter_rows (fin)
+# BulkLoadSource (fin)
+
+
+class BulkLoader:
+    """
+    Importa grandes volúmenes de filas con el protocolo COPY de PostgreSQL.
+
+    Cada tabla se carga en dos pasos, dentro de una única transacción para todos los orígenes:
+    1. Las filas se envían por lotes con `cursor.copy()` a una tabla temporal de preparación
+       (`staging`) con las mismas columnas que la tabla de destino.
+    2. Un único `INSERT ... SELECT ... ON CONFLICT` pasa las filas a la tabla de destino,
+       actualizando, ignorando o rechazando las que ya existen según `on_conflict`.
+
+    Si algo falla, la transacción se revierte y no se carga ninguna fila.
+    """
+
+    def __init__(self, db_manager, batch_size: int = utils_db.BULK_BATCH_SIZE_DB):
+        """
+        Inicializa el cargador.
+
+        Parámetros:
+        - db_manager: Instancia de ManagerDB.
+        - batch_size (int): Filas que se envían por COPY entre dos avisos de progreso.
+        """
+        self._db_manager = db_manager
+        self._batch_size = max(1, batch_size)
+    # __init__ (fin)
+
+    def load(
+        self,
+        sources: Sequence[BulkLoadSource],
+        on_conflict: str = CONFLICTO_ACTUALIZAR,
+        on_progress: Optional[ProgressCallable] = None
+    ) -> Dict[str, int]:
+        """
+        Carga todos los orígenes, en el orden indicado, en una sola transacción.
+
+        Parámetros:
+        - sources (sequence[BulkLoadSource]): Orígenes a cargar. Deben ordenarse según las claves
+          ajenas (por ejemplo, categorías y usuarios antes que tareas).
+        - on_conflict (str): "update" (actualiza las filas existentes), "ignore" (las conserva)
+          o "error" (cancela la carga).
+        - on_progress (callable | None): Función `(tabla, filas enviadas)` llamada tras cada lote.
+
+        Retorno:
+        - dict: Filas insertadas o actualizadas en cada tabla.
+
+        Excepciones:
+        - ValueError: Si una tabla o columna no es válida, si una fila no tiene las mismas columnas
+          que la primera de su origen o si la estrategia de conflicto no existe.
+        - psycopg.Error: Si PostgreSQL rechaza los datos (la transacción se revierte).
+        """
+        if on_conflict not in (CONFLICTO_ACTUALIZAR, CONFLICTO_IGNORAR, CONFLICTO_ERROR):
+            raise ValueError(f"Estrategia de conflicto no válida: '{on_conflict}'.")
+
+        # Los esquemas se resuelven antes de abrir la transacción de la carga, ya que el
+        # catálogo puede necesitar su propia consulta
+        catalog = self._db_manager.get_schema_catalog()
+        schemas = []
+        for source in sources:
+            table_schema = catalog.get_table(source.table_name)
+            if table_schema is None:
+                raise ValueError(f"Tabla '{source.table_name}' no es válida.")
+            schemas.append(table_schema)
+
+        loaded: Dict[str, int] = {}
+        with self._db_manager.connection() as connection, connection.cursor() as cursor:
+            for source, table_schema in zip(sources, schemas):
+                count = self._load_source(cursor, table_schema, source, on_conflict, on_progress)
+                loaded[source.table_name] = loaded.get(source.table_name, 0) + count
+        return loaded
+    # load (fin)
+
+    def _load_source(self, cursor, table_schema, source: BulkLoadSource, on_conflict: str,
+                     on_progress: Optional[ProgressCallable]) -> int:
+        """
+        Copia las filas de un origen a la tabla de preparación y de ahí a la tabla de destino.
+
+        Retorno:
+        - int: Filas insertadas o actualizadas en la tabla de destino.
+        """
+        rows = source.iter_rows()
+        first_row = next(rows, None)
+        if first_row is None:
+            return 0
+
+        # Las columnas de la carga son las del primer registro, en el orden de la tabla. Todos los
+        # demás registros deben tener las mismas (se comprueba en `_batches`)
+        unknown = [name for name in first_row if name not in table_schema.column_names]
+        if unknown:
+            raise ValueError(f"Columnas desconocidas en '{table_schema.table_name}': {', '.join(unknown)}")
+        columns = [name for name in table_schema.column_names if name in first_row]
+
+        staging = sql.Identifier(f"staging_{table_schema.table_name}")
+        column_list = sql.SQL(", ").join(sql.Identifier(name) for name in columns)
+
+        # Tabla temporal sin restricciones (LIKE no copia claves ni índices). `orden_carga`
+        # conserva el orden de llegada de las filas para quedarse con la última de cada clave.
+        cursor.execute(sql.SQL("""
+            CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS, orden_carga BIGSERIAL)
+            ON COMMIT DROP;
+        """).format(staging=staging, table=sql.Identifier(table_schema.table_name)))
+
+        sent = 0
+        with cursor.copy(sql.SQL("COPY {staging} ({columns}) FROM STDIN").format(
+                staging=staging, columns=column_list)) as copy:
+            for batch in self._batches(self._chain(first_row, rows), columns, table_schema.table_name):
+                for values in batch:
+                    copy.write_row(values)
+                sent += len(batch)
+                if on_progress:
+                    on_progress(table_schema.table_name, sent)
+
+        count = self._merge_staging(cursor, table_schema, staging, columns, on_conflict)
+        cursor.execute(sql.SQL("DROP TABLE {staging};").format(staging=staging))
+        self._sync_sequences(cursor, table_schema)
+        return count
+    # _load_source (fin)
+
+    def _merge_staging(self, cursor, table_schema, staging: sql.Identifier, columns: List[str], on_conflict: str) -> int:
+        """
+        Pasa las filas de la tabla de preparación a la tabla de destino con un único INSERT.
+
+        Si una misma clave aparece varias veces en los datos, se conserva la última. Si los datos
+        no incluyen la clave primaria (por ejemplo, un identificador SERIAL), no puede haber
+        conflictos y las filas se insertan sin más.
+        """
+        column_list = sql.SQL(", ").join(sql.Identifier(name) for name in columns)
+        key = table_schema.primary_key
+
+        if on_conflict == CONFLICTO_ERROR or not key or any(name not in columns for name in key):
+            source_rows = sql.SQL("SELECT {columns} FROM {staging} ORDER BY orden_carga").format(
+                columns=column_list, staging=staging)
+            conflict = sql.SQL("")
+        else:
+            key_list = sql.SQL(", ").join(sql.Identifier(name) for name in key)
+            source_rows = sql.SQL(
+                "SELECT DISTINCT ON ({key}) {columns} FROM {staging} ORDER BY {key}, orden_carga DESC"
+            ).format(key=key_list, columns=column_list, staging=staging)
+            updates = [name for name in columns if name not in key]
+            if on_conflict == CONFLICTO_IGNORAR or not updates:
+                conflict = sql.SQL("ON CONFLICT ({key}) DO NOTHING").format(key=key_list)
+            else:
+                conflict = sql.SQL("ON CONFLICT ({key}) DO UPDATE SET {updates}").format(
+                    key=key_list,
+                    updates=sql.SQL(", ").join(
+                        sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(name))
+                        for name in updates
+                    )
+                )
+
+        cursor.execute(sql.SQL("INSERT INTO {table} ({columns}) {source_rows} {conflict};").format(
+            table=sql.Identifier(table_schema.table_name),
+            columns=column_list,
+            source_rows=source_rows,
+            conflict=conflict
+        ))
+        return cursor.rowcount
+    # _merge_staging (fin)
+
+    @staticmethod
+    def _sync_sequences(cursor, table_schema) -> None:
+        """
+        Ajusta las secuencias de las columnas SERIAL al valor máximo cargado, para que los
+        siguientes INSERT sin identificador no choquen con los identificadores importados.
+        """
+        for name in table_schema.primary_key:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, %s);", (table_schema.table_name, name))
+            sequence = cursor.fetchone()[0]
+            if sequence:
+                cursor.execute(sql.SQL(
+                    "SELECT setval(%s, COALESCE((SELECT MAX({column}) FROM {table}), 0) + 1, FALSE);"
+                ).format(column=sql.Identifier(name), table=sql.Identifier(table_schema.table_name)), (sequence,))
+    # _sync_sequences (fin)
+
+    def _batches(self, rows: Iterable[Dict[str, Any]], columns: List[str],
+                 table_name: str) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Agrupa las filas en lotes de tuplas con los valores en el orden de `columns`.
+
+        Cada fila debe tener exactamente las columnas de la carga: una columna ausente se
+        insertaría como NULL (y, al actualizar, sobrescribiría el valor existente) y una columna
+        de más se descartaría sin aviso.
+
+        Excepciones:
+        - ValueError: Si una fila no tiene exactamente las columnas de la carga.
+        """
+        expected = set(columns)
+
+        def row_values(number: int, row: Dict[str, Any]) -> Tuple[Any, ...]:
+            if row.keys() != expected:
+                missing = sorted(expected - row.keys())
+                extra = sorted(str(name) for name in row.keys() - expected)
+                raise ValueError(
+                    f"La fila {number} de '{table_name}' no tiene las columnas de la carga "
+                    f"(faltan: {', '.join(missing) or '-'}; sobran: {', '.join(extra) or '-'})."
+                )
+            return tuple(row[name] for name in columns)
+
+        values = (row_values(number, row) for number, row in enumerate(rows, start=1))
+        while True:
+            batch = list(islice(values, self._batch_size))
+            if not batch:
+                return
+            yield batch
+    # _batches (fin)
+
+    @staticmethod
+    def _chain(first_row: Dict[str, Any], rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Vuelve a anteponer la primera fila (ya leída para conocer las columnas) al resto.
+        """
+        yield first_row
+        yield from rows
+    # _chain (fin)
+# BulkLoader (fin)
+
+
+if __name__ == "__main__":
+    """
+    Carga los archivos indicados como `tabla=ruta` en una sola transacción.
+    """
+    from utils.utils_init import initialize_app
+    from utils.utils_logging import setup_logging
+
+    setup_logging()
+
+    if len(sys.argv) < 2:
+        print("Uso: python -m models.bulk_loader tabla=archivo.csv [tabla=archivo.ndjson ...]")
+        sys.exit(2)
+
+    try:
+        sources = []
+        for argument in sys.argv[1:]:
+            table_name, _, file_path = argument.partition("=")
+            sources.append(BulkLoadSource(table_name.strip().lower(), file_path=file_path.strip()))
+
+        db_manager = initialize_app(show_popup=False)
+        loader = BulkLoader(db_manager)
+        result = loader.load(sources, on_progress=lambda table, sent: print(f"\r{table}: {sent} filas", end=""))
+        print()
+        for table_name, count in result.items():
+            _printv2(show_popup=False, message=f"{table_name}: {count} filas cargadas.")
+        db_manager.close_connection()
+    except Exception as e:
+        _printv2(show_popup=False, message=f"Error en la carga masiva: {e}", level=logging.ERROR)
+        sys.exit(1)
+# if __name__ == "__main__" (fin)
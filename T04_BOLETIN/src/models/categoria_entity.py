@@ -1,6 +1,9 @@
 # Archivo: src/models/categoria_entity.py
 
-class CategoriaEntity:
+from models.base_entity import BaseEntity
+
+
+class CategoriaEntity(BaseEntity):
     """
     Clase que representa una categoría en la aplicación.
     Cada instancia corresponde a un registro en la tabla `categorias` de la base de datos.
@@ -8,12 +11,19 @@ class CategoriaEntity:
     Métodos disponibles:
     - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
     - _from_dict(data): Crea una instancia de CategoriaEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
     - __str__(): Representación legible para humanos.
     - __repr__(): Representación técnica detallada del objeto.
     - __eq__(): Compara dos categorías basándose en su atributo 'id_categoria'.
     - __hash__(): Genera un hash único basado en 'id_categoria'.
     """
 
+    __slots__ = ("_id_categoria", "_nombre_categoria")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("id_categoria", "nombre_categoria")
+
     def __init__(self, id_categoria, nombre_categoria):
         """
         Inicializa un objeto CategoriaEntity con los datos de una categoría.
@@ -0,0 +1,110 @@
+"""
+* WEBGRAFÍA *
+
+- Binary protocol. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/basic/adapt.html#binary-parameters-and-results
+
+- psycopg.rows.tuple_row. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/rows.html#psycopg.rows.tuple_row
+
+- zip. (s. f.). Python documentation. de https://docs.python.org/3/library/functions.html#zip
+
+"""
+
+# Archivo: src/models/columnar_result.py
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+class ColumnarResult:
+    """
+    Resultado de una consulta organizado por columnas: los nombres se guardan una sola vez y
+    los valores de cada columna en una tupla.
+
+    Frente a una lista de diccionarios (uno por fila, cada uno con sus propias claves), solo
+    hay una tupla por columna, por lo que ocupa mucha menos memoria y se construye con una
+    única trasposición (`zip(*filas)`) que se ejecuta en C.
+
+    Es inmutable: puede compartirse entre hilos y guardarse en la caché de resultados.
+    """
+
+    __slots__ = ("columns", "_values", "_positions")
+
+    def __init__(self, columns: Sequence[str], values: Sequence[Sequence[Any]]):
+        """
+        Inicializa el resultado.
+
+        Parámetros:
+        - columns (sequence[str]): Nombres de las columnas, en orden.
+        - values (sequence[sequence]): Valores de cada columna, en el mismo orden que `columns`.
+
+        Excepciones:
+        - ValueError: Si el número de columnas no coincide o no todas tienen el mismo número de valores.
+        """
+        if len(columns) != len(values):
+            raise ValueError("El número de columnas y de listas de valores no coincide.")
+        if len({len(column_values) for column_values in values}) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de valores.")
+
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._values: Tuple[Tuple[Any, ...], ...] = tuple(tuple(column_values) for column_values in values)
+        self._positions: Dict[str, int] = {name: position for position, name in enumerate(self.columns)}
+    # __init__ (fin)
+
+    @classmethod
+    def from_rows(cls, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> "ColumnarResult":
+        """
+        Construye el resultado a partir de las filas (tuplas) devueltas por el cursor.
+
+        Parámetros:
+        - columns (sequence[str]): Nombres de las columnas de la consulta, en orden.
+        - rows (sequence[sequence]): Filas como tuplas.
+
+        Retorno:
+        - ColumnarResult: Resultado por columnas.
+        """
+        if not rows:
+            return cls(columns, [() for _ in columns])
+        return cls(columns, list(zip(*rows)))
+    # from_rows (fin)
+
+    def __len__(self) -> int:
+        """
+        Número de filas.
+        """
+        return len(self._values[0]) if self._values else 0
+    # __len__ (fin)
+
+    def column(self, name: str) -> Tuple[Any, ...]:
+        """
+        Devuelve los valores de una columna.
+
+        Parámetros:
+        - name (str): Nombre de la columna.
+
+        Excepciones:
+        - KeyError: Si la columna no existe.
+        """
+        return self._values[self._positions[name]]
+    # column (fin)
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Recorre las filas como tuplas, en el orden de `columns`.
+        """
+        return zip(*self._values)
+    # iter_rows (fin)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Devuelve las filas como diccionarios, para el código que aún trabaja con ese formato.
+        """
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.iter_rows()]
+    # to_dicts (fin)
+
+    def __repr__(self) -> str:
+        """
+        Representación técnica del resultado.
+        """
+        return f"ColumnarResult(columns={self.columns!r}, rows={len(self)})"
+    # __repr__ (fin)
+# ColumnarResult (fin)
@@ -0,0 +1,106 @@
+"""
+* WEBGRAFÍA *
+
+- LISTEN / NOTIFY. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/sql-notify.html
+
+- Asynchronous notifications. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/advanced/async.html#asynchronous-notifications
+
+"""
+
+# Archivo: src/models/db_change_listener.py
+
+import threading
+from typing import Callable, Optional
+import psycopg
+from psycopg import sql
+from utils import utils_db
+from utils.utils_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DbChangeListener:
+    """
+    Escucha en un hilo propio las notificaciones de cambios que envían los triggers de
+    PostgreSQL (`LISTEN`/`NOTIFY`, ver `models/migrations/0003_notificaciones_cambios.sql`).
+
+    Cada notificación lleva como contenido el nombre de la tabla modificada, que se entrega a
+    `on_change`. Mientras la escucha está activa se llama a `on_status(True)`; si la conexión
+    se pierde se llama a `on_status(False)` y se reintenta cada `retry_interval` segundos,
+    de modo que quien dependa de las notificaciones (la caché de `ReportModel`) sepa cuándo
+    puede fiarse de ellas.
+
+    Usa una conexión dedicada en modo autocommit, fuera del pool, porque debe permanecer
+    abierta (y escuchando) durante toda la vida de la aplicación.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        on_change: Callable[[str], None],
+        on_status: Optional[Callable[[bool], None]] = None,
+        channel: str = utils_db.NOTIFY_CHANNEL_DB,
+        retry_interval: float = utils_db.NOTIFY_RETRY_INTERVAL_DB
+    ):
+        """
+        Inicializa el escuchador (sin arrancarlo).
+
+        Parámetros:
+        - conninfo (str): Cadena de conexión a la base de datos (`ManagerDB.get_conninfo()`).
+        - on_change (callable): Función que recibe el nombre de la tabla modificada. Se llama desde el hilo del escuchador.
+        - on_status (callable | None): Función que recibe True al empezar a escuchar y False al perder la conexión.
+        - channel (str): Canal de notificaciones.
+        - retry_interval (float): Segundos entre reintentos de conexión (también el intervalo de comprobación de parada).
+        """
+        self._conninfo = conninfo
+        self._on_change = on_change
+        self._on_status = on_status or (lambda listening: None)
+        self._channel = channel
+        self._retry_interval = retry_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    # __init__ (fin)
+
+    def start(self) -> None:
+        """
+        Arranca el hilo del escuchador si no está en marcha.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="db_change_listener", daemon=True)
+        self._thread.start()
+    # start (fin)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el escuchador y espera a que termine su hilo.
+
+        Parámetros:
+        - timeout (float | None): Segundos máximos de espera (None: esperar a que termine).
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    # stop (fin)
+
+    def _run(self) -> None:
+        """
+        Bucle del hilo: conecta, escucha y reintenta si se pierde la conexión.
+        """
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(self._conninfo, autocommit=True) as connection:
+                    connection.execute(sql.SQL("LISTEN {};").format(sql.Identifier(self._channel)))
+                    self._on_status(True)
+                    while not self._stop_event.is_set():
+                        # Se despierta al menos cada `retry_interval` segundos para comprobar si debe parar
+                        for notify in connection.notifies(timeout=self._retry_interval):
+                            self._on_change(notify.payload)
+            except Exception as e:
+                logger.warning("Escucha de cambios de la base de datos interrumpida: %s", e)
+            self._on_status(False)
+            self._stop_event.wait(self._retry_interval)
+    # _run (fin)
+# DbChangeListener (fin)
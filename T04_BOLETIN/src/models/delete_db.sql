@@ -7,6 +7,12 @@
 -- # de la base de datos.                                                 #
 -- ########################################################################
 
+-- Eliminamos la tabla 'tareas' antes que las tablas a las que referencia
+DROP TABLE IF EXISTS tareas CASCADE;
+
+-- Eliminamos la tabla 'schema_version' para que las migraciones vuelvan a crear el esquema
+DROP TABLE IF EXISTS schema_version;
+
 -- Eliminamos la tabla 'ventas' que contiene los registros de ventas
 DROP TABLE IF EXISTS ventas;
 
@@ -14,10 +20,10 @@ DROP TABLE IF EXISTS ventas;
 DROP TABLE IF EXISTS productos;
 
 -- Eliminamos la tabla 'categorias' que clasifica los productos
-DROP TABLE IF EXISTS categorias;
+DROP TABLE IF EXISTS categorias CASCADE;
 
 -- Eliminamos la tabla 'usuarios' que almacena los datos de los usuarios de la aplicación
-DROP TABLE IF EXISTS usuarios;
+DROP TABLE IF EXISTS usuarios CASCADE;
 
 -- Eliminamos la tabla 'roles' que define los diferentes roles o permisos
 DROP TABLE IF EXISTS roles;
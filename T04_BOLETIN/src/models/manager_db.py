@@ -1,10 +1,16 @@
 # Archivo: src/models/manager_db.py
 
 import psycopg  # Biblioteca para gestionar la conexión con PostgreSQL
+from psycopg_pool import ConnectionPool, PoolTimeout  # Pool de conexiones reutilizables
 from utils import utils_db, utils_path  # Constantes para la configuración de la base de datos
+from models.schema_catalog import SchemaCatalog  # Caché de metadatos de las tablas
+from models.migration_runner import MigrationRunner  # Migraciones versionadas del esquema
 import os  # Manejo de rutas y validación de existencia de archivos
+import logging
+import threading
+from contextlib import contextmanager
 from utils.utils_popup import _printv2
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 
 class ManagerDB:
@@ -14,19 +20,36 @@ class ManagerDB:
     Proporciona métodos para inicializar, recuperar y cerrar conexiones de forma centralizada,
     utilizando parámetros configurados externamente. También incluye la funcionalidad opcional
     de mostrar mensajes emergentes (popups) para notificaciones de estado.
+
+    Puede trabajar en dos modos:
+    - Conexión única: todos los modelos comparten una sola conexión (modo por defecto).
+    - Pool de conexiones: cada operación toma prestada una conexión de un `ConnectionPool`,
+      de modo que varias consultas pueden ejecutarse en paralelo y una conexión caída
+      se reemplaza automáticamente.
+
+    En ambos modos, el acceso recomendado es el gestor de contexto `connection()`.
     """
 
-    def __init__(self, show_popup: bool = False, popup_parent: Optional[object] = None):
+    def __init__(self, show_popup: bool = False, popup_parent: Optional[object] = None, use_pool: bool = False):
         """
         Inicializa una instancia de ManagerDB con opciones configurables.
 
         Parámetros:
         - show_popup (bool): Indica si se utilizarán popups para mostrar mensajes.
         - popup_parent (QWidget | None): Widget padre opcional para asociar los popups con una ventana principal.
+        - use_pool (bool): Si es True, las conexiones se obtienen de un pool en lugar de una conexión única.
         """
         self._connection = None  # Referencia a la conexión de la base de datos
+        self._pool: Optional[ConnectionPool] = None  # Pool de conexiones (solo en modo pool)
+        self._use_pool = use_pool  # Indicador del modo de trabajo
         self._show_popup = show_popup  # Indicador para habilitar mensajes emergentes
         self._popup_parent = popup_parent  # Widget padre opcional para popups
+        self._schema_catalog = SchemaCatalog(self)  # Metadatos de las tablas, cargados bajo demanda
+
+        # En modo conexión única, un solo bloque `connection()` (de un solo hilo) usa la conexión a la
+        # vez: el confirmar o revertir de un hilo no debe cerrar la transacción o el cursor de otro
+        self._connection_lock = threading.RLock()
+        self._connection_depth = 0  # Bloques `connection()` anidados del hilo que tiene la conexión
 
         # Validar las configuraciones de la base de datos al inicializar la clase
         self._validate_db_config()
@@ -43,38 +66,276 @@ class ManagerDB:
             raise ValueError("Las configuraciones de la base de datos en utils_db.py no están completas.")
     # _validate_db_config (fin)
 
+    def get_conninfo(self) -> str:
+        """
+        Construye la cadena de conexión (conninfo) a partir de la configuración de utils_db.py.
+
+        Retorno:
+        - str: Cadena de conexión en formato libpq.
+        """
+        return psycopg.conninfo.make_conninfo(
+            dbname=utils_db.NAME_DB,
+            user=utils_db.USER_DB,
+            password=utils_db.PASS_DB,
+            host=utils_db.HOSTNAME_DB,
+            port=utils_db.PORT_DB
+        )
+    # get_conninfo (fin)
+
+    def is_pooled(self) -> bool:
+        """
+        Indica si el gestor trabaja en modo pool.
+
+        Retorno:
+        - bool: True si las conexiones se obtienen de un pool.
+        """
+        return self._use_pool
+    # is_pooled (fin)
+
+    def is_open(self) -> bool:
+        """
+        Indica si hay una conexión (o un pool) abierta y lista para usarse.
+
+        Retorno:
+        - bool: True si se pueden obtener conexiones, False en caso contrario.
+        """
+        if self._use_pool:
+            return self._pool is not None and not self._pool.closed
+        return self._connection is not None and not self._connection.closed
+    # is_open (fin)
+
     def open_connection(self) -> bool:
         """
         Abre una conexión a la base de datos utilizando los parámetros configurados.
 
+        En modo pool, delega en `open_pool()` con los parámetros por defecto de utils_db.py.
         Si la conexión falla, se registra el error en la consola y se muestra un popup (si está habilitado).
 
         Retorno:
         - bool: True si la conexión se estableció exitosamente, False en caso contrario.
         """
+        if self._use_pool:
+            return self.open_pool()
+
         messages = []  # Lista para acumular mensajes de estado
+        level = logging.INFO
         try:
             self._connection = psycopg.connect(
                 dbname=utils_db.NAME_DB,
                 user=utils_db.USER_DB,
                 password=utils_db.PASS_DB,
                 host=utils_db.HOSTNAME_DB,
-                port=utils_db.PORT_DB
+                port=utils_db.PORT_DB,
+                prepare_threshold=utils_db.PREPARE_THRESHOLD_DB
             )
+            self._schema_catalog.invalidate()  # Nueva conexión: el esquema puede haber cambiado
             messages.append("Conexión a la base de datos establecida exitosamente.")
             return True
         except Exception as e:
             messages.append(f"Error al abrir la conexión a la base de datos:\n{e}")
+            level = logging.ERROR
             self._connection = None  # Reinicia la conexión en caso de error
             return False
         finally:
             # Emite los mensajes acumulados
-            self._emit_messages(messages)
+            self._emit_messages(messages, level)
     # open_connection (fin)
 
+    def open_pool(
+        self,
+        min_size: int = utils_db.POOL_MIN_SIZE_DB,
+        max_size: int = utils_db.POOL_MAX_SIZE_DB,
+        timeout: float = utils_db.POOL_TIMEOUT_DB,
+        max_idle: float = utils_db.POOL_MAX_IDLE_DB
+    ) -> bool:
+        """
+        Abre un pool de conexiones a la base de datos.
+
+        Las conexiones se comprueban antes de entregarse (`check_connection`), por lo que una
+        conexión caída se descarta y se sustituye sin que el error llegue a la interfaz.
+
+        Parámetros:
+        - min_size (int): Número mínimo de conexiones que el pool mantiene abiertas.
+        - max_size (int): Número máximo de conexiones simultáneas.
+        - timeout (float): Segundos máximos de espera para obtener una conexión libre.
+        - max_idle (float): Segundos que una conexión sobrante puede estar inactiva antes de cerrarse.
+
+        Retorno:
+        - bool: True si el pool se abrió y tiene al menos `min_size` conexiones, False en caso contrario.
+        """
+        messages = []  # Lista para acumular mensajes de estado
+        level = logging.INFO
+        try:
+            self._use_pool = True
+            self._pool = ConnectionPool(
+                conninfo=self.get_conninfo(),
+                min_size=min_size,
+                max_size=max_size,
+                timeout=timeout,
+                max_idle=max_idle,
+                kwargs={"prepare_threshold": utils_db.PREPARE_THRESHOLD_DB},
+                check=ConnectionPool.check_connection,
+                name=utils_db.CONNECTION_NAME,
+                open=False
+            )
+            self._pool.open(wait=True, timeout=timeout)
+            self._schema_catalog.invalidate()  # Nuevo pool: el esquema puede haber cambiado
+            messages.append("Pool de conexiones a la base de datos abierto exitosamente.")
+            return True
+        except Exception as e:
+            messages.append(f"Error al abrir el pool de conexiones a la base de datos:\n{e}")
+            level = logging.ERROR
+            if self._pool is not None:
+                self._pool.close()
+            self._pool = None  # Reinicia el pool en caso de error
+            return False
+        finally:
+            # Emite los mensajes acumulados
+            self._emit_messages(messages, level)
+    # open_pool (fin)
+
+    @contextmanager
+    def connection(self) -> Iterator[psycopg.Connection]:
+        """
+        Gestor de contexto que proporciona una conexión lista para usarse.
+
+        - En modo pool, toma prestada una conexión y la devuelve al salir del bloque.
+        - En modo conexión única, entrega la conexión compartida y la reserva para el hilo actual
+          hasta salir del bloque: los demás hilos esperan, de modo que ninguno confirma o revierte
+          la transacción (ni cierra el cursor del lado del servidor) de otro. Un generador que
+          consuma la conexión la retiene hasta agotarse o cerrarse, y debe cerrarse en el mismo hilo.
+
+        Al salir del bloque se confirma la transacción; si se produce una excepción, se revierte
+        para que la conexión no quede en estado de error para el siguiente uso. En modo conexión
+        única, los bloques anidados del mismo hilo forman parte de la transacción del bloque
+        exterior, que es el único que la confirma o revierte.
+
+        Uso:
+            with db_manager.connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1;")
+
+        Excepciones:
+        - ValueError: Si no hay una conexión ni un pool activos.
+        - psycopg_pool.PoolTimeout: Si no se obtiene una conexión libre dentro del tiempo configurado.
+        """
+        if self._use_pool:
+            if self._pool is None or self._pool.closed:
+                raise ValueError("El pool de conexiones no está abierto.")
+            # El pool confirma o revierte la transacción al devolver la conexión
+            with self._pool.connection() as connection:
+                yield connection
+            return
+
+        with self._connection_lock:
+            connection = self.get_connection()
+            if connection is None:
+                raise ValueError("No hay una conexión activa a la base de datos.")
+            self._connection_depth += 1
+            outermost = self._connection_depth == 1
+            try:
+                yield connection
+                if outermost:
+                    connection.commit()
+            except BaseException:
+                # También si se cierra un generador que usaba la conexión (GeneratorExit)
+                if outermost and not connection.closed:
+                    connection.rollback()
+                raise
+            finally:
+                self._connection_depth -= 1
+    # connection (fin)
+
+    def get_schema_catalog(self) -> SchemaCatalog:
+        """
+        Devuelve la caché de metadatos (columnas, tipos y posiciones) de las tablas.
+
+        Los metadatos se cargan una sola vez por conexión (o pool) y tras aplicar migraciones, en lugar de consultar el catálogo cada vez que se necesitan.
+
+        Retorno:
+        - SchemaCatalog: Caché compartida por todos los modelos que usan este gestor.
+        """
+        return self._schema_catalog
+    # get_schema_catalog (fin)
+
+    def get_prepared_statement_stats(self) -> List[Dict[str, Any]]:
+        """
+        Devuelve las sentencias preparadas en el servidor por cada conexión (vista `pg_prepared_statements`).
+
+        Las sentencias preparadas pertenecen a la sesión, así que se consultan conexión por
+        conexión. En modo pool solo se consultan las conexiones libres en ese momento, de una en
+        una y sin esperar: las que están en uso por otro hilo no se interrumpen, nunca se retienen
+        varias conexiones a la vez y el pool no abre conexiones nuevas para obtener las estadísticas.
+        Si no hay ninguna conexión libre, la lista está vacía.
+
+        Retorno:
+        - list[dict]: Una entrada por conexión, con "pid" (proceso del servidor) y "statements":
+          lista de sentencias con "name", "statement", "prepare_time", "generic_plans" y "custom_plans".
+
+        Excepciones:
+        - ValueError: Si no hay una conexión ni un pool activos.
+        """
+        if not self._use_pool:
+            with self.connection() as connection:
+                return [self._prepared_statements_of(connection)]
+
+        if self._pool is None or self._pool.closed:
+            raise ValueError("El pool de conexiones no está abierto.")
+        # El pool entrega las conexiones libres en orden de llegada, así que al devolver cada una
+        # la siguiente es otra; el PID evita repetir una conexión si otro hilo altera el orden
+        stats: Dict[int, Dict[str, Any]] = {}
+        for _ in range(self._pool.get_stats().get("pool_available", 0)):
+            # Sin conexiones libres, `getconn` pediría al pool que abriera otra
+            if not self._pool.get_stats().get("pool_available", 0):
+                break
+            try:
+                connection = self._pool.getconn(timeout=0)
+            except PoolTimeout:
+                break  # Otro hilo se llevó la última conexión libre
+            try:
+                connection_stats = self._prepared_statements_of(connection)
+            finally:
+                self._pool.putconn(connection)
+            stats.setdefault(connection_stats["pid"], connection_stats)
+        return list(stats.values())
+    # get_prepared_statement_stats (fin)
+
+    @staticmethod
+    def _prepared_statements_of(connection: psycopg.Connection) -> Dict[str, Any]:
+        """
+        Consulta las sentencias preparadas de una conexión y deja la conexión sin transacción abierta.
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT name, statement, prepare_time, generic_plans, custom_plans
+                    FROM pg_prepared_statements
+                    ORDER BY prepare_time;
+                """)
+                rows = cursor.fetchall()
+        finally:
+            connection.rollback()
+
+        return {
+            "pid": connection.info.backend_pid,
+            "statements": [
+                {
+                    "name": name,
+                    "statement": statement,
+                    "prepare_time": prepare_time,
+                    "generic_plans": generic_plans,
+                    "custom_plans": custom_plans,
+                }
+                for name, statement, prepare_time, generic_plans, custom_plans in rows
+            ],
+        }
+    # _prepared_statements_of (fin)
+
     def get_connection(self) -> Optional[psycopg.Connection]:
         """
-        Retorna la conexión activa a la base de datos.
+        Retorna la conexión activa a la base de datos (solo en modo conexión única).
+
+        En modo pool las conexiones deben obtenerse mediante `connection()`.
 
         Retorno:
         - psycopg.Connection: Instancia activa si la conexión está abierta.
@@ -83,66 +344,63 @@ class ManagerDB:
         if self._connection and not self._connection.closed:
             return self._connection
         messages = ["La conexión a la base de datos no está activa o ha sido cerrada."]
-        self._emit_messages(messages)
+        self._emit_messages(messages, logging.WARNING)
         return None
     # get_connection (fin)
     
     
-    def init_db(self, sql_file_path: str = utils_path.PATH_INICIALIZACION_DB) -> None:
+    def init_db(self, migrations_dir: str = utils_path.MIGRATIONS_DIR) -> None:
         """
-        Inicializa la base de datos ejecutando instrucciones SQL desde un archivo.
+        Prepara el esquema de la base de datos aplicando las migraciones pendientes.
+
+        El motor de migraciones (`MigrationRunner`) consulta la versión registrada en la tabla
+        `schema_version` y, si el esquema está al día, no ejecuta nada más. Cada migración
+        pendiente se aplica completa en su propia transacción.
 
         Parámetros:
-        - sql_file_path (str): Ruta del archivo SQL que contiene las instrucciones para inicializar la base de datos.
+        - migrations_dir (str): Carpeta con los archivos de migración (`NNNN_descripcion.sql`).
 
-        Si el archivo no existe o ocurre un error durante la ejecución, se captura y notifica.
+        Excepciones:
+        - Exception: Si falla una migración. La migración se revierte, el error se notifica
+          y se propaga para no arrancar la aplicación con un esquema a medias.
         """
         messages = []  # Lista para acumular mensajes de estado
+        level = logging.INFO
 
         # Verifica si la conexión está activa
-        if not self.get_connection():
-            print("La conexión no estaba abierta. Intentando abrir conexión...")
+        if not self.is_open():
+            _printv2(show_popup=False, message="La conexión no estaba abierta. Intentando abrir conexión...", level=logging.DEBUG)
             if not self.open_connection():
                 return  # Detiene la ejecución si no se pudo abrir la conexión
 
-        # Verifica la existencia del archivo SQL
-        if not os.path.exists(sql_file_path):
-            messages.append("Error: No se encontró el archivo SQL especificado.")
-            self._emit_messages(messages)
+        # Verifica la existencia de la carpeta de migraciones
+        if not os.path.isdir(migrations_dir):
+            messages.append("Error: No se encontró la carpeta de migraciones especificada.")
+            self._emit_messages(messages, logging.ERROR)
             return
 
-        # Intenta leer y ejecutar el archivo SQL
         try:
-            with open(sql_file_path, 'r', encoding='utf-8') as file:
-                sql_script = file.read()
-
-            connection = self.get_connection()
-            if not connection:
-                messages.append("No se pudo obtener una conexión activa.")
-                self._emit_messages(messages)
-                return
-
-            with connection.cursor() as cursor:
-                sql_statements = sql_script.split(';')
-                for statement in sql_statements:
-                    statement = statement.strip()
-                    if statement:  # Ejecuta solo si hay una instrucción válida
-                        try:
-                            cursor.execute(statement)
-                        except Exception as e:
-                            messages.append(f"Error ejecutando la instrucción:\n{statement}\n{e}")
-                connection.commit()
-                messages.append("Base de datos inicializada exitosamente.")
+            applied = MigrationRunner(self, migrations_dir).migrate()
+            if applied:
+                # Las migraciones pueden haber creado o modificado tablas
+                self._schema_catalog.invalidate()
+                for version, name in applied:
+                    messages.append(f"Migración {version} ({name}) aplicada exitosamente.\n")
+            else:
+                messages.append("El esquema de la base de datos está actualizado.")
         except Exception as e:
+            self._schema_catalog.invalidate()
             messages.append(f"Error al inicializar la base de datos:\n{e}")
+            level = logging.ERROR
+            raise
         finally:
             # Emite los mensajes acumulados
-            self._emit_messages(messages)
+            self._emit_messages(messages, level)
     # init_db (fin)
 
     def close_connection(self) -> bool:
         """
-        Cierra la conexión a la base de datos si está activa.
+        Cierra la conexión (o el pool de conexiones) a la base de datos si está activa.
 
         Asegura que los recursos se liberen adecuadamente. Si no hay conexión activa,
         se notifica mediante consola y popup (si está habilitado).
@@ -151,23 +409,30 @@ class ManagerDB:
         - bool: True si la conexión se cerró exitosamente, False si no había conexión activa.
         """
         messages = []  # Lista para acumular mensajes de estado
-        if self._connection and not self._connection.closed:
+        if self._pool is not None and not self._pool.closed:
+            self._pool.close()
+            self._pool = None
+            messages.append("Pool de conexiones a la base de datos cerrado exitosamente.")
+            self._emit_messages(messages)
+            return True
+        elif self._connection and not self._connection.closed:
             self._connection.close()
             messages.append("Conexión a la base de datos cerrada exitosamente.")
             self._emit_messages(messages)
             return True
         else:
             messages.append("No hay una conexión activa que cerrar.")
-            self._emit_messages(messages)
+            self._emit_messages(messages, logging.WARNING)
             return False
     # close_connection (fin)
 
-    def _emit_messages(self, messages: list[str]) -> None:
+    def _emit_messages(self, messages: list[str], level: int = logging.INFO) -> None:
         """
-        Emite mensajes acumulados en forma de popup y los registra en la consola.
+        Emite mensajes acumulados en forma de popup y los registra con el nivel indicado.
 
         Parámetros:
         - messages (list[str]): Lista de mensajes a emitir.
+        - level (int): Nivel de los mensajes en el registro (por defecto: logging.INFO).
         """
         if messages:
             message_text = "".join(messages)
@@ -175,7 +440,8 @@ class ManagerDB:
                 show_popup=self._show_popup,
                 parent=self._popup_parent,
                 message=message_text,
-                duration=5000  # Duración predeterminada del popup
+                duration=5000,  # Duración predeterminada del popup
+                level=level
             )
     # _emit_messages (fin)
 
@@ -0,0 +1,224 @@
+"""
+* WEBGRAFÍA *
+
+- Advisory Locks. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/explicit-locking.html#ADVISORY-LOCKS
+
+- Multiple statements in the same query. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/basic/from_pg2.html#multiple-statements-in-the-same-query
+
+- to_regclass. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/functions-info.html
+
+"""
+
+# Archivo: src/models/migration_runner.py
+
+import os
+import re
+from typing import List, Optional, Tuple
+import psycopg
+from psycopg import sql
+from utils import utils_db, utils_path
+
+
+class Migration:
+    """
+    Archivo de migración: `NNNN_descripcion.sql`, donde NNNN es la versión del esquema que alcanza.
+    """
+
+    # Patrón del nombre de los archivos de migración
+    FILE_PATTERN = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+    def __init__(self, version: int, name: str, file_path: str):
+        """
+        Inicializa la migración.
+
+        Parámetros:
+        - version (int): Versión del esquema tras aplicarla.
+        - name (str): Descripción (parte del nombre del archivo tras la versión).
+        - file_path (str): Ruta del archivo SQL.
+        """
+        self.version = version
+        self.name = name
+        self.file_path = file_path
+    # __init__ (fin)
+
+    def read_script(self) -> str:
+        """
+        Devuelve el contenido del archivo SQL.
+        """
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            return file.read()
+    # read_script (fin)
+# Migration (fin)
+
+
+class MigrationRunner:
+    """
+    Motor de migraciones versionadas del esquema de la base de datos.
+
+    La tabla `schema_version` registra las migraciones aplicadas. Al arrancar, basta una consulta
+    (`SELECT MAX(version)`) para saber si el esquema está al día; solo si hay migraciones
+    pendientes se leen sus archivos y se aplican en orden, cada una en su propia transacción.
+
+    Cada archivo se envía completo al servidor, que es quien separa las instrucciones, por lo
+    que los ';' dentro de textos o de cuerpos de funciones no causan problemas. Si una
+    instrucción falla, la migración entera se revierte y el error se propaga.
+    """
+
+    # Clave del bloqueo consultivo que impide aplicar migraciones desde dos procesos a la vez
+    _LOCK_KEY = 40400400
+
+    def __init__(self, db_manager, migrations_dir: str = utils_path.MIGRATIONS_DIR):
+        """
+        Inicializa el motor.
+
+        Parámetros:
+        - db_manager: Instancia de ManagerDB.
+        - migrations_dir (str): Carpeta con los archivos de migración.
+        """
+        self._db_manager = db_manager
+        self._migrations_dir = migrations_dir
+    # __init__ (fin)
+
+    def current_version(self) -> Optional[int]:
+        """
+        Devuelve la versión actual del esquema.
+
+        Retorno:
+        - int | None: Última versión aplicada (0 si la tabla existe pero está vacía),
+          o None si la base de datos aún no tiene la tabla `schema_version`.
+        """
+        try:
+            with self._db_manager.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(sql.SQL("SELECT COALESCE(MAX(version), 0) FROM {table};").format(
+                    table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)
+                ))
+                return cursor.fetchone()[0]
+        except psycopg.errors.UndefinedTable:
+            return None
+    # current_version (fin)
+
+    def list_migrations(self) -> List[Migration]:
+        """
+        Devuelve las migraciones de la carpeta, ordenadas por versión.
+
+        Excepciones:
+        - ValueError: Si dos archivos tienen la misma versión.
+        """
+        migrations = []
+        for file_name in os.listdir(self._migrations_dir):
+            match = Migration.FILE_PATTERN.match(file_name)
+            if match:
+                migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(self._migrations_dir, file_name)))
+        migrations.sort(key=lambda migration: migration.version)
+
+        versions = [migration.version for migration in migrations]
+        duplicated = sorted({version for version in versions if versions.count(version) > 1})
+        if duplicated:
+            raise ValueError(f"Versiones de migración repetidas: {', '.join(map(str, duplicated))}")
+        return migrations
+    # list_migrations (fin)
+
+    def migrate(self) -> List[Tuple[int, str]]:
+        """
+        Aplica las migraciones pendientes.
+
+        Si la base de datos se creó antes de existir las migraciones (tiene las tablas pero no
+        `schema_version`), la primera migración se registra como aplicada sin ejecutarse, para
+        no volver a insertar los datos de ejemplo.
+
+        Retorno:
+        - list[tuple[int, str]]: Versión y nombre de las migraciones aplicadas (vacía si el esquema ya estaba al día).
+
+        Excepciones:
+        - psycopg.Error: Si falla una migración (se revierte completa y no se aplican las siguientes).
+        """
+        version = self.current_version()
+        if version and self._is_stale_history():
+            # `schema_version` sobrevivió al borrado de las tablas: se olvida para volver a crearlas
+            self._reset_history()
+            version = 0
+        migrations = self.list_migrations()
+        if version is not None and all(migration.version <= version for migration in migrations):
+            return []
+
+        applied = []
+        for migration in migrations:
+            if version is not None and migration.version <= version:
+                continue
+            if self._apply(migration):
+                applied.append((migration.version, migration.name))
+        return applied
+    # migrate (fin)
+
+    def _is_stale_history(self) -> bool:
+        """
+        Indica si `schema_version` registra migraciones pero la tabla `tareas` ya no existe.
+        """
+        with self._db_manager.connection() as connection, connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s) IS NULL;", (utils_db.EnumTablasDB.TAREAS.value,))
+            return cursor.fetchone()[0]
+    # _is_stale_history (fin)
+
+    def _reset_history(self):
+        """
+        Vacía `schema_version` para que las migraciones se apliquen de nuevo desde la primera.
+        """
+        with self._db_manager.connection() as connection, connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s);", (self._LOCK_KEY,))
+            # Con el bloqueo obtenido, se comprueba de nuevo por si otro proceso ya recreó el esquema
+            cursor.execute("SELECT to_regclass(%s) IS NULL;", (utils_db.EnumTablasDB.TAREAS.value,))
+            if cursor.fetchone()[0]:
+                cursor.execute(sql.SQL("DELETE FROM {table};").format(table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)))
+    # _reset_history (fin)
+
+    def _apply(self, migration: Migration) -> bool:
+        """
+        Aplica una migración en su propia transacción y la registra en `schema_version`.
+
+        Retorno:
+        - bool: True si se aplicó, False si otro proceso la había aplicado ya.
+        """
+        script = migration.read_script()
+        with self._db_manager.connection() as connection, connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s);", (self._LOCK_KEY,))
+            cursor.execute(sql.SQL("""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    version INT PRIMARY KEY,
+                    nombre VARCHAR(255) NOT NULL,
+                    aplicada_en TIMESTAMPTZ NOT NULL DEFAULT now()
+                );
+            """).format(table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)))
+
+            # Con el bloqueo obtenido, se comprueba de nuevo por si otro proceso se adelantó
+            cursor.execute(
+                sql.SQL("SELECT 1 FROM {table} WHERE version = %s;").format(table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)),
+                (migration.version,)
+            )
+            if cursor.fetchone():
+                return False
+
+            if not self._is_baseline(cursor, migration):
+                # Sin parámetros, psycopg envía el script completo y el servidor ejecuta todas sus instrucciones
+                cursor.execute(script)
+
+            cursor.execute(
+                sql.SQL("INSERT INTO {table} (version, nombre) VALUES (%s, %s);").format(table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)),
+                (migration.version, migration.name)
+            )
+        return True
+    # _apply (fin)
+
+    @staticmethod
+    def _is_baseline(cursor, migration: Migration) -> bool:
+        """
+        Indica si la migración es la inicial y la base de datos ya tiene las tablas que crea.
+        """
+        if migration.version != 1:
+            return False
+        cursor.execute(sql.SQL("SELECT COUNT(*) FROM {table};").format(table=sql.Identifier(utils_db.SCHEMA_VERSION_TABLE_DB)))
+        if cursor.fetchone()[0]:
+            return False
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL;", (utils_db.EnumTablasDB.TAREAS.value,))
+        return cursor.fetchone()[0]
+    # _is_baseline (fin)
+# MigrationRunner (fin)
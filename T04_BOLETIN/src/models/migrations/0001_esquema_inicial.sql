@@ -1,3 +1,14 @@
+-- ###########################################################
+-- # Archivo: src\models\migrations\0001_esquema_inicial.sql #
+-- ###########################################################
+
+-- #######################################################################
+-- # NOTA: Migración 1. Crea las tablas de usuarios, categorías y tareas #
+-- # e inserta los datos de ejemplo. El motor de migraciones la aplica   #
+-- # una sola vez; en bases de datos creadas antes de las migraciones    #
+-- # se registra como aplicada sin ejecutarla.                           #
+-- #######################################################################
+
 -- Crear la tabla de Usuarios si no existe
 CREATE TABLE IF NOT EXISTS Usuarios (
     email VARCHAR(255) PRIMARY KEY, -- El email será la clave primaria
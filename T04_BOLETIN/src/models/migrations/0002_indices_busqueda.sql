@@ -0,0 +1,30 @@
+-- ############################################################
+-- # Archivo: src\models\migrations\0002_indices_busqueda.sql #
+-- ############################################################
+
+-- ##################################################################
+-- # NOTA: Migración 2. Prepara los índices que utiliza el buscador #
+-- # de tareas (extensión pg_trgm e índices GIN de trigramas).      #
+-- ##################################################################
+
+-- Habilitamos la extensión pg_trgm, que permite indexar búsquedas por subcadena (ILIKE '%texto%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Índices GIN de trigramas sobre las columnas de texto en las que busca el informe
+CREATE INDEX IF NOT EXISTS idx_tareas_nombre_trgm
+    ON tareas USING GIN (nombre gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_tareas_description_trgm
+    ON tareas USING GIN (description gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_tareas_idusuario_trgm
+    ON tareas USING GIN (idUsuario gin_trgm_ops);
+
+-- Índice de trigramas sobre el identificador de categoría convertido a texto,
+-- ya que el buscador también compara el texto con la categoría
+CREATE INDEX IF NOT EXISTS idx_tareas_id_categoria_trgm
+    ON tareas USING GIN ((CAST(id_categoria AS TEXT)) gin_trgm_ops);
+
+-- Índice B-tree para los filtros y agrupaciones por categoría
+CREATE INDEX IF NOT EXISTS idx_tareas_id_categoria
+    ON tareas (id_categoria);
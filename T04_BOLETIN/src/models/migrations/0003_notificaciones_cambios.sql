@@ -0,0 +1,33 @@
+-- ##################################################################
+-- # Archivo: src\models\migrations\0003_notificaciones_cambios.sql #
+-- ##################################################################
+
+-- ###################################################################
+-- # NOTA: Migración 3. Crea los triggers que avisan a la aplicación #
+-- # (NOTIFY) cuando cambian las tablas del informe, para invalidar  #
+-- # la caché de resultados de ReportModel.                          #
+-- ###################################################################
+
+-- Función que envía el nombre de la tabla modificada por el canal 'report_cambios'.
+-- NOTIFY se entrega al confirmar la transacción, y las notificaciones repetidas con el
+-- mismo contenido dentro de una transacción se agrupan en una sola.
+CREATE OR REPLACE FUNCTION notificar_cambio_report() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('report_cambios', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Triggers por instrucción (no por fila), para enviar un solo aviso por cada INSERT, UPDATE,
+-- DELETE o TRUNCATE aunque afecte a miles de filas
+CREATE OR REPLACE TRIGGER trg_tareas_notificar_cambio
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tareas
+    FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_report();
+
+CREATE OR REPLACE TRIGGER trg_categorias_notificar_cambio
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categorias
+    FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_report();
+
+CREATE OR REPLACE TRIGGER trg_usuarios_notificar_cambio
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON usuarios
+    FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_report();
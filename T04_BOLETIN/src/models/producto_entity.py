@@ -1,6 +1,9 @@
 # Archivo: src/models/producto_entity.py
 
-class ProductoEntity:
+from models.base_entity import BaseEntity
+
+
+class ProductoEntity(BaseEntity):
     """
     Clase que representa un producto en la aplicación.
     Cada instancia corresponde a un registro en la tabla `productos` de la base de datos.
@@ -8,12 +11,19 @@ class ProductoEntity:
     Métodos disponibles:
     - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
     - _from_dict(data): Crea una instancia de ProductoEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
     - __str__(): Representación legible para humanos.
     - __repr__(): Representación técnica detallada del objeto.
     - __eq__(): Compara dos productos basándose en su atributo 'codigo'.
     - __hash__(): Genera un hash único basado en 'codigo', útil para conjuntos y diccionarios.
     """
 
+    __slots__ = ("_codigo", "_producto", "_descripcion", "_precio", "_stock", "_ventas", "_id_categoria", "_fecha_agregado")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("codigo", "producto", "descripcion", "precio", "stock", "ventas", "id_categoria", "fecha_agregado")
+
     def __init__(self, codigo, producto, descripcion, precio, stock, ventas, id_categoria, fecha_agregado):
         """
         Inicializa un objeto ProductoEntity con los datos de un producto.
@@ -0,0 +1,242 @@
+"""
+* WEBGRAFÍA *
+
+- EXPLAIN. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/sql-explain.html
+
+- psycopg.pq.PGresult. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/pq.html#psycopg.pq.PGresult
+
+- collections.deque. (s. f.). Python documentation. de https://docs.python.org/3/library/collections.html#collections.deque
+
+"""
+
+# Archivo: src/models/query_monitor.py
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from utils import utils_db
+from utils.utils_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueryRecord:
+    """
+    Medición de una ejecución de una consulta.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        call_site: str,
+        duration: float,
+        rows: int,
+        nbytes: int,
+        plan: Optional[str] = None
+    ):
+        """
+        Inicializa la medición.
+
+        Parámetros:
+        - name (str): Nombre de la consulta (método del modelo que la ejecuta).
+        - call_site (str): Archivo y línea desde donde se ejecutó.
+        - duration (float): Segundos desde que se envió la consulta hasta recibir todas las filas.
+        - rows (int): Número de filas devueltas.
+        - nbytes (int): Tamaño estimado de los valores recibidos, en bytes (ver `QueryMonitor.result_size`).
+        - plan (str | None): Plan de ejecución (`EXPLAIN ANALYZE`), si se capturó.
+        """
+        self.name = name
+        self.call_site = call_site
+        self.duration = duration
+        self.rows = rows
+        self.nbytes = nbytes
+        self.plan = plan
+        self.timestamp = time.time()
+    # __init__ (fin)
+
+    def __repr__(self) -> str:
+        """
+        Representación técnica de la medición.
+        """
+        return (f"QueryRecord(name={self.name!r}, duration={self.duration:.4f}, "
+                f"rows={self.rows}, nbytes={self.nbytes}, call_site={self.call_site!r})")
+    # __repr__ (fin)
+# QueryRecord (fin)
+
+
+class QueryMonitor:
+    """
+    Estadísticas en memoria de las consultas de un modelo.
+
+    Para cada consulta (identificada por su nombre) se guardan las últimas `window` mediciones,
+    con las que se calculan los percentiles de duración. Las consultas que tardan más de
+    `slow_threshold` segundos se registran como lentas en el log y se guardan aparte, junto
+    con su plan de ejecución si `explain_slow` está activado.
+
+    Es segura para usarse desde varios hilos.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float = utils_db.SLOW_QUERY_THRESHOLD_DB,
+        window: int = utils_db.QUERY_STATS_WINDOW_DB,
+        explain_slow: bool = utils_db.EXPLAIN_SLOW_QUERIES_DB,
+        max_slow_queries: int = utils_db.SLOW_QUERY_LOG_SIZE_DB
+    ):
+        """
+        Inicializa el monitor sin mediciones.
+
+        Parámetros:
+        - slow_threshold (float): Segundos a partir de los cuales una consulta se considera lenta.
+        - window (int): Número de mediciones recientes por consulta con las que se calculan los percentiles.
+        - explain_slow (bool): Si es True, se captura `EXPLAIN (ANALYZE, BUFFERS)` de las consultas lentas.
+        - max_slow_queries (int): Número de consultas lentas recientes que se conservan.
+        """
+        self.slow_threshold = slow_threshold
+        self.explain_slow = explain_slow
+        self._window = max(1, window)
+        self._lock = threading.Lock()
+        self._records: Dict[str, Deque[QueryRecord]] = {}
+        self._totals: Dict[str, int] = {}  # Consulta -> número de ejecuciones desde el inicio
+        self._slow_queries: Deque[QueryRecord] = deque(maxlen=max(1, max_slow_queries))
+    # __init__ (fin)
+
+    def record(
+        self,
+        name: str,
+        call_site: str,
+        duration: float,
+        rows: int,
+        nbytes: int,
+        explain: Optional[Callable[[], str]] = None
+    ) -> QueryRecord:
+        """
+        Registra una ejecución de una consulta.
+
+        Parámetros:
+        - name (str): Nombre de la consulta.
+        - call_site (str): Archivo y línea desde donde se ejecutó.
+        - duration (float): Duración en segundos.
+        - rows (int): Número de filas devueltas.
+        - nbytes (int): Bytes recibidos (estimados).
+        - explain (callable | None): Función que devuelve el plan de ejecución de la consulta.
+          Solo se llama si la consulta es lenta y `explain_slow` está activado.
+
+        Retorno:
+        - QueryRecord: La medición registrada.
+        """
+        query_record = QueryRecord(name, call_site, duration, rows, nbytes)
+
+        if duration >= self.slow_threshold:
+            if self.explain_slow and explain is not None:
+                try:
+                    query_record.plan = explain()
+                except Exception as e:
+                    logger.warning("No se pudo obtener el plan de '%s': %s", name, e)
+            logger.warning(
+                "Consulta lenta %s (%s): %.1f ms, %d filas, %d bytes%s",
+                name, call_site, duration * 1000, rows, nbytes,
+                f"\n{query_record.plan}" if query_record.plan else ""
+            )
+            with self._lock:
+                self._slow_queries.append(query_record)
+        else:
+            logger.debug("Consulta %s: %.1f ms, %d filas, %d bytes", name, duration * 1000, rows, nbytes)
+
+        with self._lock:
+            records = self._records.get(name)
+            if records is None:
+                records = self._records[name] = deque(maxlen=self._window)
+            records.append(query_record)
+            self._totals[name] = self._totals.get(name, 0) + 1
+        return query_record
+    # record (fin)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Devuelve las estadísticas de cada consulta sobre sus mediciones recientes.
+
+        Retorno:
+        - dict: {nombre: {"count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "avg_rows", "avg_bytes"}}.
+          `count` es el número total de ejecuciones; el resto se calcula sobre las últimas `window`.
+        """
+        with self._lock:
+            snapshot = {name: list(records) for name, records in self._records.items()}
+            totals = dict(self._totals)
+
+        result = {}
+        for name, records in snapshot.items():
+            durations = sorted(record.duration for record in records)
+            result[name] = {
+                "count": totals[name],
+                "p50_ms": self._percentile(durations, 50) * 1000,
+                "p95_ms": self._percentile(durations, 95) * 1000,
+                "p99_ms": self._percentile(durations, 99) * 1000,
+                "max_ms": durations[-1] * 1000,
+                "avg_rows": sum(record.rows for record in records) / len(records),
+                "avg_bytes": sum(record.nbytes for record in records) / len(records),
+            }
+        return result
+    # stats (fin)
+
+    def slow_queries(self) -> List[QueryRecord]:
+        """
+        Devuelve las consultas lentas más recientes, de la más antigua a la más nueva.
+        """
+        with self._lock:
+            return list(self._slow_queries)
+    # slow_queries (fin)
+
+    def reset(self) -> None:
+        """
+        Descarta todas las mediciones.
+        """
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+            self._slow_queries.clear()
+    # reset (fin)
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percent: float) -> float:
+        """
+        Percentil por el método del rango más cercano sobre una lista ya ordenada.
+        """
+        index = max(0, -(-len(sorted_values) * percent // 100) - 1)  # ceil(n * p / 100) - 1
+        return sorted_values[int(index)]
+    # _percentile (fin)
+
+    # Filas de un resultado cuyo tamaño se mide para estimar el de todo el resultado
+    RESULT_SIZE_SAMPLE_ROWS = 3
+
+    @staticmethod
+    def result_size(pgresult) -> int:
+        """
+        Estima los bytes recibidos en un resultado de libpq.
+
+        Medir cada valor costaría una llamada por celda en cada consulta, es decir, más trabajo
+        que el de las propias consultas medidas. En su lugar, se mide el tamaño de unas pocas
+        filas repartidas por el resultado (`RESULT_SIZE_SAMPLE_ROWS`) y se multiplica su media
+        por el número de filas, de modo que el coste no depende del tamaño del resultado.
+
+        Parámetros:
+        - pgresult: `cursor.pgresult` tras ejecutar la consulta, o None.
+
+        Retorno:
+        - int: Tamaño estimado de los valores del resultado, en bytes (0 si no hay resultado).
+        """
+        if pgresult is None or not pgresult.ntuples:
+            return 0
+        ntuples = pgresult.ntuples
+        nfields = pgresult.nfields
+        samples = min(ntuples, QueryMonitor.RESULT_SIZE_SAMPLE_ROWS)
+        sample_rows = {index * (ntuples - 1) // max(1, samples - 1) for index in range(samples)}
+        sample_bytes = sum(
+            pgresult.get_length(row, column)
+            for row in sample_rows
+            for column in range(nfields)
+        )
+        return sample_bytes * ntuples // len(sample_rows)
+    # result_size (fin)
+# QueryMonitor (fin)
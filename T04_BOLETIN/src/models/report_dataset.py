@@ -0,0 +1,398 @@
+"""
+* WEBGRAFÍA *
+
+- array — Efficient arrays of numeric values. (s. f.). Python documentation. de https://docs.python.org/3/library/array.html
+
+- itertools.compress. (s. f.). Python documentation. de https://docs.python.org/3/library/itertools.html#itertools.compress
+
+- collections.Counter. (s. f.). Python documentation. de https://docs.python.org/3/library/collections.html#collections.Counter
+
+- Dictionary encoding. (s. f.). Apache Arrow. de https://arrow.apache.org/docs/format/Columnar.html#dictionary-encoded-layout
+
+"""
+
+# Archivo: src/models/report_dataset.py
+#
+# Conjunto de datos por columnas del informe de tareas.
+#
+# Las operaciones (filtrar, contar por grupos y ordenar) se expresan sobre columnas completas
+# con `map`, `itertools.compress`, `Counter` y `sorted`, que recorren los datos en C; no hay
+# bucles de Python fila a fila. El proyecto no depende de NumPy, así que las columnas numéricas
+# y los códigos se guardan en `array`.
+
+import operator
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from models.columnar_result import ColumnarResult
+
+
+class DictionaryColumn:
+    """
+    Columna de texto con codificación por diccionario: cada valor distinto se guarda una sola
+    vez en `dictionary` y cada fila guarda solo su posición (`codes`).
+
+    Es adecuada para columnas con pocos valores distintos (usuario, categoría). Las
+    comparaciones se resuelven sobre el diccionario (pocas entradas) y después se aplican a
+    los códigos.
+    """
+
+    __slots__ = ("codes", "dictionary")
+
+    def __init__(self, codes: array, dictionary: Sequence[Any]):
+        """
+        Inicializa la columna.
+
+        Parámetros:
+        - codes (array): Posición en `dictionary` del valor de cada fila.
+        - dictionary (sequence): Valores distintos de la columna.
+        """
+        self.codes = codes
+        self.dictionary: Tuple[Any, ...] = tuple(dictionary)
+    # __init__ (fin)
+
+    @classmethod
+    def encode(cls, values: Sequence[Any], dictionary: Optional[Sequence[Any]] = None) -> "DictionaryColumn":
+        """
+        Codifica una secuencia de valores.
+
+        Parámetros:
+        - values (sequence): Valores de la columna.
+        - dictionary (sequence | None): Valores conocidos de antemano, en el orden deseado (por
+          ejemplo, todas las categorías aunque alguna no tenga tareas). Los valores que no
+          estén se añaden al final en el orden en que aparecen.
+
+        Retorno:
+        - DictionaryColumn: Columna codificada.
+        """
+        entries = list(dictionary or ())
+        code_of = {value: code for code, value in enumerate(entries)}
+        for value in dict.fromkeys(values):  # Valores distintos en orden de aparición
+            if value not in code_of:
+                code_of[value] = len(entries)
+                entries.append(value)
+        return cls(array("l", map(code_of.__getitem__, values)), entries)
+    # encode (fin)
+
+    def __len__(self) -> int:
+        """
+        Número de filas.
+        """
+        return len(self.codes)
+    # __len__ (fin)
+
+    def __getitem__(self, position: int) -> Any:
+        """
+        Valor (decodificado) de una fila.
+        """
+        return self.dictionary[self.codes[position]]
+    # __getitem__ (fin)
+
+    def matching_codes(self, predicate) -> frozenset:
+        """
+        Devuelve los códigos de las entradas del diccionario que cumplen la condición.
+        """
+        return frozenset(code for code, value in enumerate(self.dictionary) if predicate(value))
+    # matching_codes (fin)
+# DictionaryColumn (fin)
+
+
+# Una columna puede ser numérica (array), de texto (tupla) o codificada por diccionario
+Column = Union[array, Tuple[Any, ...], DictionaryColumn]
+
+
+class ReportDataset:
+    """
+    Conjunto de datos por columnas, inmutable.
+
+    Filtrar u ordenar no copia las columnas: devuelve una vista que comparte las columnas
+    con el conjunto original y guarda solo las posiciones de las filas seleccionadas (un
+    `array` de enteros). Así el controlador, la tabla y el gráfico trabajan sobre los mismos
+    datos y una vista puede guardarse en la caché y compartirse entre hilos.
+    """
+
+    __slots__ = ("columns", "_data", "_size", "_index")
+
+    def __init__(self, columns: Mapping[str, Column], index: Optional[array] = None):
+        """
+        Inicializa el conjunto.
+
+        Parámetros:
+        - columns (mapping): Columnas por nombre, en orden. Todas deben tener el mismo número de filas.
+        - index (array | None): Posiciones de las filas seleccionadas, o None para todas.
+
+        Excepciones:
+        - ValueError: Si las columnas no tienen el mismo número de filas.
+        """
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas.")
+
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._data: Dict[str, Column] = dict(columns)
+        self._size = sizes.pop() if sizes else 0
+        self._index = index
+    # __init__ (fin)
+
+    @classmethod
+    def from_columnar(
+        cls,
+        result: ColumnarResult,
+        dictionary_columns: Optional[Mapping[str, Optional[Sequence[Any]]]] = None,
+        integer_columns: Iterable[str] = ()
+    ) -> "ReportDataset":
+        """
+        Construye el conjunto a partir de un resultado por columnas.
+
+        Parámetros:
+        - result (ColumnarResult): Resultado de la consulta.
+        - dictionary_columns (mapping | None): Columnas a codificar por diccionario, con su
+          diccionario inicial (o None). Ver `DictionaryColumn.encode`.
+        - integer_columns (iterable[str]): Columnas enteras sin nulos, que se guardan en un `array`.
+
+        Retorno:
+        - ReportDataset: Conjunto con todas las filas.
+        """
+        dictionary_columns = dictionary_columns or {}
+        integer_columns = set(integer_columns)
+        columns: Dict[str, Column] = {}
+        for name in result.columns:
+            values = result.column(name)
+            if name in dictionary_columns:
+                columns[name] = DictionaryColumn.encode(values, dictionary_columns[name])
+            elif name in integer_columns:
+                columns[name] = array("q", values)
+            else:
+                columns[name] = values
+        return cls(columns)
+    # from_columnar (fin)
+
+    def with_column(self, name: str, column: Column) -> "ReportDataset":
+        """
+        Devuelve un conjunto con una columna más (o sustituida), compartiendo el resto.
+
+        La columna debe tener tantas filas como las columnas originales (no como la vista).
+        """
+        columns = dict(self._data)
+        columns[name] = column
+        return ReportDataset(columns, self._index)
+    # with_column (fin)
+
+    def __len__(self) -> int:
+        """
+        Número de filas seleccionadas.
+        """
+        return self._size if self._index is None else len(self._index)
+    # __len__ (fin)
+
+    def column(self, name: str) -> Column:
+        """
+        Devuelve una columna completa (todas las filas, no solo las seleccionadas), sin copiarla.
+
+        Excepciones:
+        - KeyError: Si la columna no existe.
+        """
+        return self._data[name]
+    # column (fin)
+
+    def value(self, position: int, name: str) -> Any:
+        """
+        Valor de una columna en una fila de la vista.
+
+        Parámetros:
+        - position (int): Posición de la fila en la vista.
+        - name (str): Nombre de la columna.
+        """
+        row = position if self._index is None else self._index[position]
+        return self._data[name][row]
+    # value (fin)
+
+    def row(self, position: int, names: Optional[Sequence[str]] = None) -> Tuple[Any, ...]:
+        """
+        Fila de la vista como tupla.
+
+        Parámetros:
+        - position (int): Posición de la fila en la vista.
+        - names (sequence[str] | None): Columnas a incluir, en orden. Por defecto, todas.
+        """
+        row = position if self._index is None else self._index[position]
+        return tuple(self._data[name][row] for name in (names or self.columns))
+    # row (fin)
+
+    def iter_rows(self, names: Optional[Sequence[str]] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Recorre las filas de la vista como tuplas.
+
+        Parámetros:
+        - names (sequence[str] | None): Columnas a incluir, en orden. Por defecto, todas.
+        """
+        return zip(*(self._values(name) for name in (names or self.columns)))
+    # iter_rows (fin)
+
+    def to_dicts(self, names: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Devuelve las filas de la vista como diccionarios, para el código que trabaja con ese formato.
+        """
+        names = tuple(names or self.columns)
+        return [dict(zip(names, row)) for row in self.iter_rows(names)]
+    # to_dicts (fin)
+
+    def filter_equals(self, name: str, value: Any, case_insensitive: bool = False) -> "ReportDataset":
+        """
+        Selecciona las filas cuya columna es igual al valor indicado.
+
+        Parámetros:
+        - name (str): Nombre de la columna.
+        - value: Valor buscado.
+        - case_insensitive (bool): Si es True, los textos se comparan sin distinguir mayúsculas.
+
+        Retorno:
+        - ReportDataset: Vista con las filas que cumplen la condición.
+        """
+        column = self._data[name]
+        case_insensitive = case_insensitive and isinstance(value, str)
+        if case_insensitive:
+            wanted = value.lower()
+            predicate = lambda candidate: isinstance(candidate, str) and candidate.lower() == wanted
+        else:
+            predicate = lambda candidate: candidate == value
+
+        if isinstance(column, DictionaryColumn):
+            codes = column.matching_codes(predicate)
+            mask = map(codes.__contains__, self._select(column.codes))
+        elif case_insensitive:
+            mask = map(predicate, self._select(column))
+        else:
+            mask = map(operator.eq, self._select(column), repeat(value))
+        return self._take(mask)
+    # filter_equals (fin)
+
+    def filter_contains(self, text: str, names: Sequence[str]) -> "ReportDataset":
+        """
+        Selecciona las filas en las que alguna de las columnas contiene el texto, sin distinguir
+        mayúsculas (equivalente a `ILIKE '%texto%'`). Los valores nulos no coinciden nunca.
+
+        Parámetros:
+        - text (str): Texto a buscar. Si está vacío, se devuelven todas las filas.
+        - names (sequence[str]): Columnas en las que buscar. Las no textuales se comparan por su texto.
+
+        Retorno:
+        - ReportDataset: Vista con las filas que cumplen la condición.
+        """
+        needle = (text or "").lower()
+        if not needle:
+            return self
+
+        combined: Optional[bytes] = None
+        for name in names:
+            column = self._data[name]
+            if isinstance(column, DictionaryColumn):
+                codes = column.matching_codes(lambda value: value is not None and needle in str(value).lower())
+                mask = bytes(map(codes.__contains__, self._select(column.codes)))
+            else:
+                values = self._select(column)
+                mask = map(operator.contains, map(str.lower, map(str, values)), repeat(needle))
+                if not isinstance(column, array) and None in column:
+                    # str(None) es "None": se descartan los nulos como hace ILIKE
+                    mask = map(operator.and_, mask, map(operator.is_not, self._select(column), repeat(None)))
+                mask = bytes(mask)
+            combined = mask if combined is None else bytes(map(operator.or_, combined, mask))
+
+        return self if combined is None else self._take(combined)
+    # filter_contains (fin)
+
+    def count_by(self, name: str) -> Dict[Any, int]:
+        """
+        Cuenta las filas de la vista por cada valor de una columna.
+
+        En las columnas codificadas por diccionario se incluyen todas las entradas del
+        diccionario, en su orden y con 0 si no aparecen en la vista.
+
+        Parámetros:
+        - name (str): Nombre de la columna.
+
+        Retorno:
+        - dict: {valor: número de filas}.
+        """
+        column = self._data[name]
+        if isinstance(column, DictionaryColumn):
+            counts = Counter(self._select(column.codes))
+            totals: Dict[Any, int] = {}
+            for code, value in enumerate(column.dictionary):
+                totals[value] = totals.get(value, 0) + counts.get(code, 0)
+            return totals
+        return dict(Counter(self._select(column)))
+    # count_by (fin)
+
+    def sort_by(self, name: str, descending: bool = False) -> "ReportDataset":
+        """
+        Ordena las filas de la vista por una columna (los nulos se tratan como texto vacío).
+
+        Parámetros:
+        - name (str): Nombre de la columna.
+        - descending (bool): Si es True, de mayor a menor.
+
+        Retorno:
+        - ReportDataset: Vista ordenada (el orden es estable).
+        """
+        column = self._data[name]
+        if isinstance(column, DictionaryColumn):
+            # Rango de cada entrada del diccionario y, a partir de él, clave de cada fila
+            order = sorted(range(len(column.dictionary)), key=lambda code: self._sort_key(column.dictionary[code]))
+            rank = array("l", repeat(0, len(order)))
+            for position, code in enumerate(order):
+                rank[code] = position
+            key = array("l", map(rank.__getitem__, column.codes)).__getitem__
+        elif isinstance(column, array) or None not in column:
+            key = column.__getitem__
+        else:
+            key = lambda row: self._sort_key(column[row])
+
+        rows = self._index if self._index is not None else range(self._size)
+        return ReportDataset(self._data, array("l", sorted(rows, key=key, reverse=descending)))
+    # sort_by (fin)
+
+    def _values(self, name: str) -> Iterable[Any]:
+        """
+        Valores (decodificados) de una columna en las filas de la vista.
+        """
+        column = self._data[name]
+        if self._index is None:
+            return column
+        return map(column.__getitem__, self._index)
+    # _values (fin)
+
+    def _select(self, values: Sequence[Any]) -> Iterable[Any]:
+        """
+        Valores de una secuencia completa (columna o códigos) en las filas de la vista.
+        """
+        if self._index is None:
+            return values
+        return map(values.__getitem__, self._index)
+    # _select (fin)
+
+    def _take(self, mask: Iterable[Any]) -> "ReportDataset":
+        """
+        Devuelve la vista con las filas de la vista actual cuya máscara es verdadera.
+        """
+        rows = self._index if self._index is not None else range(self._size)
+        return ReportDataset(self._data, array("l", compress(rows, mask)))
+    # _take (fin)
+
+    @staticmethod
+    def _sort_key(value: Any) -> Any:
+        """
+        Clave de ordenación que sitúa los nulos como texto vacío.
+        """
+        return "" if value is None else value
+    # _sort_key (fin)
+
+    def __repr__(self) -> str:
+        """
+        Representación técnica del conjunto.
+        """
+        return f"ReportDataset(columns={self.columns!r}, rows={len(self)})"
+    # __repr__ (fin)
+# ReportDataset (fin)
@@ -1,15 +1,38 @@
 """
 WEBGRAFIA:
 - psycopg.rows.dict_row. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/rows.html#psycopg.rows.dict_row
-- information_schema.columns. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/infoschema-columns.html
+- pg_attribute. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/catalog-pg-attribute.html
 - Python fetchall() Method. (s. f.). W3Schools.com. de https://www.w3schools.com/python/ref_cursor_fetchall.asp
+- psycopg.sql – SQL string composition. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/sql.html
+- Pattern Matching (LIKE/ILIKE). (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/functions-matching.html
+- pg_trgm. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/pgtrgm.html
+- Pagination Done the PostgreSQL Way (keyset pagination). (s. f.). Use-the-index-luke.com. de https://use-the-index-luke.com/no-offset
+- Server-side cursors. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/advanced/cursors.html#server-side-cursors
+- LISTEN / NOTIFY. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/sql-notify.html
 """
 # Archivo: src/models/report_model.py
 
-from typing import List, Dict, Optional, Union
+import os
+import sys
+import time
+from array import array
+from typing import Any, Iterator, List, Dict, Optional, Tuple, Union
 import psycopg  # Biblioteca para consultas SQL
-from utils.utils_popup import _printv2  # Utilidad para mostrar popups
+from psycopg import sql  # Composición segura de consultas SQL
+from utils.utils_logging import get_logger  # Registro de mensajes con niveles
 from utils import utils_db
+from models.result_cache import ResultCache  # Caché de resultados con invalidación
+from models.db_change_listener import DbChangeListener  # Notificaciones de cambios (LISTEN/NOTIFY)
+from models.query_monitor import QueryMonitor  # Tiempos y consultas lentas
+from models.columnar_result import ColumnarResult  # Resultados por columnas
+from models.report_dataset import DictionaryColumn, ReportDataset  # Conjunto de datos en memoria
+from models.categoria_entity import CategoriaEntity
+from repositories.base_repository import BaseRepository  # Acceso a las tablas como entidades
+from repositories.usuario_repository import UsuarioRepository
+from repositories.categoria_repository import CategoriaRepository
+from repositories.tarea_repository import TareaRepository
+
+logger = get_logger(__name__)
 
 
 class ReportModel:
@@ -17,25 +40,129 @@ class ReportModel:
     Clase para gestionar operaciones de datos utilizando psycopg.
 
     Facilita la ejecución de consultas SQL y la obtención de datos
-    desde PostgreSQL, utilizando la conexión administrada por ManagerDB.
+    desde PostgreSQL, utilizando las conexiones administradas por ManagerDB
+    (conexión única o pool) a través de `ManagerDB.connection()`.
+
+    Los resultados de las consultas se guardan en una caché (`ResultCache`) con clave
+    (consulta, filtros, página). Los triggers de la migración `0003_notificaciones_cambios.sql`
+    avisan de cada cambio en las tablas mediante LISTEN/NOTIFY y `DbChangeListener` descarta
+    los resultados afectados, de modo que repetir un filtro se sirve desde memoria sin entregar datos obsoletos.
+
+    Todas las consultas se ejecutan a través de `_run_query` (o `_stream_query` para los cursores
+    del lado del servidor), que mide su duración, filas y bytes recibidos (estimados) en `QueryMonitor`.
+
+    Las tablas de `EnumTablasDB` también pueden leerse como entidades con los repositorios de
+    `repositories/` (`_get_repository`), cuyos mapas de identidad se invalidan con la caché.
     """
 
-    def __init__(self, db_manager, popup_parent: Optional[object] = None) -> None:
+    # Columnas de la tabla "tareas" que se muestran en el informe, en orden de presentación
+    TAREAS_REPORT_COLUMNS = ["id_categoria", "nombre", "description", "idusuario"]
+
+    # Columna (clave primaria) por la que se ordenan y paginan las tareas
+    TAREAS_KEY_COLUMN = "nombre"
+
+    # Tablas de las que dependen las consultas de tareas (para invalidar la caché)
+    TAREAS_DEPENDENCIES = (
+        utils_db.EnumTablasDB.TAREAS.value,
+        utils_db.EnumTablasDB.CATEGORIAS.value,
+        utils_db.EnumTablasDB.USUARIOS.value,
+    )
+
+    def __init__(
+        self,
+        db_manager,
+        popup_parent: Optional[object] = None,
+        use_cache: bool = utils_db.USE_RESULT_CACHE_DB
+    ) -> None:
         """
         Inicializa el ReportModel utilizando una instancia de ManagerDB.
 
         Parámetros:
         - db_manager: Instancia de ManagerDB para gestionar la conexión a la base de datos.
         - popup_parent: Widget padre opcional para mostrar popups.
+        - use_cache: Si es True, arranca la escucha de cambios y guarda los resultados en memoria.
+          La caché permanece deshabilitada mientras no se reciban notificaciones.
         """
         self._db_manager = db_manager
         self._popup_parent = popup_parent
+        self._cache = ResultCache()
+        self._change_listener: Optional[DbChangeListener] = None
+        self._query_monitor = QueryMonitor()
+
+        # Un repositorio por tabla; sus mapas de identidad se habilitan junto con la caché
+        self._repositories: Dict[str, BaseRepository] = {
+            repository.TABLE: repository(db_manager, enabled=False)
+            for repository in (UsuarioRepository, CategoriaRepository, TareaRepository)
+        }
+
+        if use_cache:
+            self._start_change_listener()
     # __init__ (fin)
 
+    def _start_change_listener(self) -> None:
+        """
+        Arranca el escuchador de notificaciones que habilita e invalida la caché de resultados.
+        """
+        try:
+            self._change_listener = DbChangeListener(
+                conninfo=self._db_manager.get_conninfo(),
+                on_change=self._on_table_changed,
+                on_status=self._on_listener_status
+            )
+            self._change_listener.start()
+        except Exception as e:
+            self._change_listener = None
+            logger.warning("No se pudo iniciar la caché de resultados: %s", e)
+    # _start_change_listener (fin)
+
+    def _on_table_changed(self, table: Optional[str]) -> None:
+        """
+        Descarta los resultados guardados y las entidades que dependen de la tabla modificada.
+        Se llama desde el hilo de `DbChangeListener`.
+        """
+        self._cache.invalidate(table)
+        for repository in self._repositories.values():
+            repository.invalidate(table)
+    # _on_table_changed (fin)
+
+    def _on_listener_status(self, listening: bool) -> None:
+        """
+        Habilita la caché y los mapas de identidad mientras se reciben las notificaciones de cambios.
+        """
+        self._cache.set_enabled(listening)
+        for repository in self._repositories.values():
+            repository.set_enabled(listening)
+    # _on_listener_status (fin)
+
+    def _get_repository(self, table_name: str) -> Optional[BaseRepository]:
+        """
+        Devuelve el repositorio de una tabla de `EnumTablasDB`, o None si la tabla no es válida.
+        """
+        return self._repositories.get(table_name)
+    # _get_repository (fin)
+
+    def _fetch_categorias(self) -> Optional[List[CategoriaEntity]]:
+        """
+        Obtiene todas las categorías como entidades, ordenadas por su ID.
+
+        Retorno:
+        - Lista de `CategoriaEntity`.
+        - None si ocurre un error.
+        """
+        try:
+            return self._repositories[utils_db.EnumTablasDB.CATEGORIAS.value].get_all()
+        except Exception as e:
+            logger.error("Error al obtener las categorías: %s", e)
+            return None
+    # _fetch_categorias (fin)
+
     def _fetch_data(self, table_name: str) -> Optional[List[Dict[str, Union[str, int, float]]]]:
         """
         Obtiene todos los datos de una tabla específica desde PostgreSQL.
 
+        Las columnas se piden de forma explícita en el orden de la tabla (según `SchemaCatalog`)
+        y cada fila se convierte en diccionario con el decodificador ya preparado para la tabla.
+
         Parámetros:
         - table_name: Nombre de la tabla en PostgreSQL.
 
@@ -44,29 +171,75 @@ class ReportModel:
         - None si ocurre un error.
         """
         if not self._validate_table_name(table_name):
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Tabla '{table_name}' no es válida.")
+            logger.warning("Tabla '%s' no es válida.", table_name)
             return None
 
-        try:
-            connection = self._db_manager.get_connection()
-            if connection is None:
-                raise ValueError("No hay una conexión activa a la base de datos.")
-
-            query = f"SELECT * FROM {table_name};"
-            with connection.cursor(row_factory=psycopg.rows.dict_row) as cursor:
-                cursor.execute(query)
-                data = []
-                for row in cursor.fetchall():
-                    data.append(row)  # Construimos la lista de registros explícitamente
-                return data
-        except Exception as e:
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Error al obtener datos de '{table_name}': {e}")
-            return None
+        def load() -> Optional[List[Dict[str, Union[str, int, float]]]]:
+            try:
+                table_schema = self._db_manager.get_schema_catalog().get_table(table_name)
+                if table_schema is None:
+                    raise ValueError(f"La tabla '{table_name}' no existe.")
+
+                query = sql.SQL("SELECT {columns} FROM {table};").format(
+                    columns=sql.SQL(", ").join(sql.Identifier(name) for name in table_schema.column_names),
+                    table=sql.Identifier(table_name)
+                )
+                return list(map(table_schema.decode_row, self._run_query(query)))
+            except Exception as e:
+                logger.error("Error al obtener datos de '%s': %s", table_name, e)
+                return None
+
+        return self._cache.get_or_load(("data", table_name), (table_name,), load)
     # _fetch_data (fin)
 
+    def _fetch_columnar(self, table_name: str, column_names: Optional[List[str]] = None) -> Optional[ColumnarResult]:
+        """
+        Obtiene los datos de una tabla por columnas, para cargas grandes.
+
+        A diferencia de `_fetch_data`, no se crea un diccionario por fila: las filas se reciben
+        en formato binario (sin convertir los valores a texto en el servidor ni analizarlos en
+        el cliente) como tuplas y se trasponen en una tupla por columna.
+
+        Parámetros:
+        - table_name: Nombre de la tabla en PostgreSQL.
+        - column_names: Columnas a obtener, en orden. Por defecto, todas las de la tabla.
+
+        Retorno:
+        - ColumnarResult con los nombres de las columnas y sus valores.
+        - None si ocurre un error.
+        """
+        if not self._validate_table_name(table_name):
+            logger.warning("Tabla '%s' no es válida.", table_name)
+            return None
+
+        def load() -> Optional[ColumnarResult]:
+            try:
+                table_schema = self._db_manager.get_schema_catalog().get_table(table_name)
+                if table_schema is None:
+                    raise ValueError(f"La tabla '{table_name}' no existe.")
+                columns = list(column_names or table_schema.column_names)
+                table_schema.decoder_for(columns)  # Comprueba que las columnas existen
+
+                query = sql.SQL("SELECT {columns} FROM {table};").format(
+                    columns=sql.SQL(", ").join(sql.Identifier(name) for name in columns),
+                    table=sql.Identifier(table_name)
+                )
+                rows = self._run_query(query, row_factory=psycopg.rows.tuple_row, binary=True)
+                return ColumnarResult.from_rows(columns, rows)
+            except Exception as e:
+                logger.error("Error al obtener datos por columnas de '%s': %s", table_name, e)
+                return None
+
+        cache_key = ("columnar", table_name, tuple(column_names or ()))
+        return self._cache.get_or_load(cache_key, (table_name,), load)
+    # _fetch_columnar (fin)
+
     def _fetch_columns(self, table_name: str) -> Optional[List[str]]:
         """
-        Obtiene los nombres de las columnas de una tabla específica desde PostgreSQL.
+        Obtiene los nombres de las columnas de una tabla específica, en el orden de la tabla.
+
+        Los metadatos se sirven desde `SchemaCatalog`, que los carga para todas las tablas de
+        `EnumTablasDB` con una sola consulta a `pg_catalog` por conexión o inicialización.
 
         Parámetros:
         - table_name: Nombre de la tabla en PostgreSQL.
@@ -76,27 +249,16 @@ class ReportModel:
         - None si ocurre un error.
         """
         if not self._validate_table_name(table_name):
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Tabla '{table_name}' no es válida.")
+            logger.warning("Tabla '%s' no es válida.", table_name)
             return None
 
         try:
-            connection = self._db_manager.get_connection()
-            if connection is None:
-                raise ValueError("No hay una conexión activa a la base de datos.")
-
-            query = f"""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name = '{table_name}';
-            """
-            with connection.cursor() as cursor:
-                cursor.execute(query)
-                columns = []
-                for row in cursor.fetchall():
-                    columns.append(row[0])  # Construimos la lista de columnas explícitamente
-                return columns
+            table_schema = self._db_manager.get_schema_catalog().get_table(table_name)
+            if table_schema is None:
+                raise ValueError(f"La tabla '{table_name}' no existe.")
+            return list(table_schema.column_names)
         except Exception as e:
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Error al obtener columnas de '{table_name}': {e}")
+            logger.error("Error al obtener columnas de '%s': %s", table_name, e)
             return None
     # _fetch_columns (fin)
 
@@ -112,7 +274,7 @@ class ReportModel:
         - None si ocurre un error.
         """
         if not self._validate_table_name(table_name):
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Tabla '{table_name}' no es válida.")
+            logger.warning("Tabla '%s' no es válida.", table_name)
             return None
 
         try:
@@ -126,10 +288,709 @@ class ReportModel:
 
             return {"columns": columns, "data": data}
         except Exception as e:
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Error al obtener modelo de '{table_name}': {e}")
+            logger.error("Error al obtener modelo de '%s': %s", table_name, e)
             return None
     # _get_model (fin)
 
+    def _fetch_filtered_tareas(
+        self,
+        search_text: str = "",
+        category: Optional[str] = None
+    ) -> Optional[Dict[str, Union[List[str], List[Dict[str, Union[str, int, float]]]]]]:
+        """
+        Obtiene desde PostgreSQL solo las tareas que cumplen los filtros indicados.
+
+        El filtrado se realiza en el servidor mediante predicados parametrizados, de modo que
+        solo viajan por la red las filas que coinciden.
+
+        Parámetros:
+        - search_text: Texto a buscar (sin distinguir mayúsculas) en la categoría, nombre,
+          descripción o usuario de la tarea. Si está vacío, no se filtra por texto.
+        - category: Nombre de la categoría a la que deben pertenecer las tareas.
+          Si es None, no se filtra por categoría.
+
+        Retorno:
+        - Diccionario con "columns" y "data", con el mismo formato que `_get_model`.
+        - None si ocurre un error.
+        """
+        def load() -> Optional[Dict[str, Union[List[str], List[Dict[str, Union[str, int, float]]]]]]:
+            try:
+                where_clause, params = self._build_tareas_filter(search_text, category)
+                query = sql.SQL("""
+                    SELECT {columns}
+                    FROM tareas AS t
+                    JOIN categorias AS c ON c.id_categoria = t.id_categoria
+                    WHERE {where}
+                    ORDER BY t.nombre;
+                """).format(
+                    columns=sql.SQL(", ").join(
+                        sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS
+                    ),
+                    where=where_clause
+                )
+                rows = self._run_query(query, params, row_factory=psycopg.rows.dict_row)
+                return {"columns": list(self.TAREAS_REPORT_COLUMNS), "data": rows}
+            except Exception as e:
+                logger.error("Error al filtrar las tareas: %s", e)
+                return None
+
+        cache_key = self._tareas_cache_key("filtered", search_text, category)
+        return self._cache.get_or_load(cache_key, self.TAREAS_DEPENDENCIES, load)
+    # _fetch_filtered_tareas (fin)
+
+    def _fetch_tareas_page(
+        self,
+        search_text: str = "",
+        category: Optional[str] = None,
+        after_key: Optional[str] = None,
+        limit: int = utils_db.PAGE_SIZE_DB
+    ) -> Optional[List[Dict[str, Union[str, int, float]]]]:
+        """
+        Obtiene una página de tareas filtradas usando paginación por clave (keyset).
+
+        En lugar de OFFSET, la página empieza justo después de `after_key` según el orden de la
+        clave primaria, por lo que el coste de cada página es constante sin importar lo lejos
+        que esté del principio de la tabla.
+
+        Parámetros:
+        - search_text: Texto a buscar en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+        - after_key: Valor de la clave de la última fila de la página anterior, o None para la primera página.
+        - limit: Número máximo de filas de la página.
+
+        Retorno:
+        - Lista de registros como diccionarios, ordenados por la clave.
+        - None si ocurre un error.
+        """
+        def load() -> Optional[List[Dict[str, Union[str, int, float]]]]:
+            try:
+                where_clause, params = self._build_tareas_filter(search_text, category)
+                key = sql.Identifier("t", self.TAREAS_KEY_COLUMN)
+                conditions = [where_clause]
+                if after_key is not None:
+                    conditions.append(sql.SQL("{key} > %(after_key)s").format(key=key))
+                    params["after_key"] = after_key
+                params["limite"] = limit
+
+                query = sql.SQL("""
+                    SELECT {columns}
+                    FROM tareas AS t
+                    JOIN categorias AS c ON c.id_categoria = t.id_categoria
+                    WHERE {where}
+                    ORDER BY {key}
+                    LIMIT %(limite)s;
+                """).format(
+                    columns=sql.SQL(", ").join(
+                        sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS
+                    ),
+                    where=sql.SQL(" AND ").join(conditions),
+                    key=key
+                )
+                return self._run_query(query, params, row_factory=psycopg.rows.dict_row)
+            except Exception as e:
+                logger.error("Error al obtener una página de tareas: %s", e)
+                return None
+
+        cache_key = self._tareas_cache_key("page", search_text, category, after_key, limit)
+        return self._cache.get_or_load(cache_key, self.TAREAS_DEPENDENCIES, load)
+    # _fetch_tareas_page (fin)
+
+    def _stream_filtered_tareas(
+        self,
+        search_text: str = "",
+        category: Optional[str] = None,
+        batch_size: int = utils_db.EXPORT_BATCH_SIZE_DB,
+        usuario: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Union[str, int, float]]]]:
+        """
+        Recorre las tareas filtradas por lotes mediante un cursor del lado del servidor.
+
+        A diferencia de `_fetch_filtered_tareas`, las filas no se cargan todas en memoria:
+        PostgreSQL mantiene el cursor abierto y se piden `batch_size` filas cada vez, por lo
+        que la memoria usada depende del tamaño del lote y no del número de tareas.
+
+        La conexión permanece ocupada mientras se recorre el generador; al agotarlo o cerrarlo
+        (por ejemplo, al cancelar una exportación) el cursor y la transacción se liberan.
+
+        Parámetros:
+        - search_text: Texto a buscar en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+        - batch_size: Número de filas de cada lote.
+        - usuario: Email del usuario cuyas tareas se exportan, o None para no filtrar por usuario.
+
+        Retorno:
+        - Generador de lotes (listas de registros como diccionarios), ordenados por la clave.
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta. Se propaga para que quien consume el generador
+          pueda interrumpir el proceso en lugar de obtener un resultado incompleto.
+        """
+        where_clause, params = self._build_tareas_filter(search_text, category, usuario)
+        query = sql.SQL("""
+            SELECT {columns}
+            FROM tareas AS t
+            JOIN categorias AS c ON c.id_categoria = t.id_categoria
+            WHERE {where}
+            ORDER BY {key};
+        """).format(
+            columns=sql.SQL(", ").join(
+                sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS
+            ),
+            where=where_clause,
+            key=sql.Identifier("t", self.TAREAS_KEY_COLUMN)
+        )
+        yield from self._stream_query(
+            query, params, "exportacion_tareas", batch_size, row_factory=psycopg.rows.dict_row
+        )
+    # _stream_filtered_tareas (fin)
+
+    def _stream_partitioned_tareas(
+        self,
+        partition: utils_db.EnumParticion,
+        search_text: str = "",
+        category: Optional[str] = None,
+        batch_size: int = utils_db.EXPORT_BATCH_SIZE_DB
+    ) -> Iterator[List[Dict[str, Union[str, int, float]]]]:
+        """
+        Recorre las tareas filtradas de todas las particiones (usuarios o categorías) con una sola
+        consulta y un cursor del lado del servidor, ordenadas por partición y por la clave.
+
+        Las filas de cada partición llegan seguidas, por lo que pueden agruparse a medida que se
+        leen (`itertools.groupby`) sin cargar todas las tareas en memoria. Cada partición aparece
+        aunque no tenga tareas que cumplan los filtros, con una única fila con las columnas de la
+        tarea a None.
+
+        Parámetros:
+        - partition: Clave de partición (`EnumParticion.USUARIO` o `EnumParticion.CATEGORIA`).
+        - search_text: Texto a buscar en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+        - batch_size: Número de filas de cada lote.
+
+        Retorno:
+        - Generador de lotes de registros como diccionarios, con "particion" (email del usuario o
+          `id_categoria`, la misma expresión por la que se ordena), "nombre_particion" (email o
+          nombre de la categoría, que puede repetirse), las columnas de `TAREAS_REPORT_COLUMNS`
+          y "nombre_categoria".
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta.
+        """
+        where_clause, params = self._build_tareas_filter(search_text, category)
+        columns = sql.SQL(", ").join(sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS)
+        if partition == utils_db.EnumParticion.USUARIO:
+            # El filtro va en la condición del LEFT JOIN para conservar los usuarios sin tareas
+            query = sql.SQL("""
+                SELECT u.email AS particion, u.email AS nombre_particion, {columns}, c.nombre_categoria
+                FROM usuarios AS u
+                LEFT JOIN (tareas AS t JOIN categorias AS c ON c.id_categoria = t.id_categoria)
+                    ON t.idusuario = u.email AND {where}
+                ORDER BY u.email, {key};
+            """)
+        else:
+            query = sql.SQL("""
+                SELECT c.id_categoria AS particion, c.nombre_categoria AS nombre_particion,
+                       {columns}, c.nombre_categoria
+                FROM categorias AS c
+                LEFT JOIN tareas AS t ON t.id_categoria = c.id_categoria AND {where}
+                ORDER BY c.id_categoria, {key};
+            """)
+        query = query.format(columns=columns, where=where_clause, key=sql.Identifier("t", self.TAREAS_KEY_COLUMN))
+        yield from self._stream_query(
+            query, params, "particiones_tareas", batch_size, row_factory=psycopg.rows.dict_row
+        )
+    # _stream_partitioned_tareas (fin)
+
+    def _fetch_category_totals(
+        self,
+        search_text: str = "",
+        category: Optional[str] = None,
+        usuario: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Calcula en PostgreSQL el número de tareas por categoría que cumplen los filtros.
+
+        La agregación (`GROUP BY`) se realiza en el servidor, por lo que solo se transfiere
+        una fila por categoría. Las categorías sin tareas que cumplan los filtros aparecen con 0.
+
+        Parámetros:
+        - search_text: Texto a buscar en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+        - usuario: Email del usuario o None para no filtrar por usuario.
+
+        Retorno:
+        - Diccionario con:
+          - "total": Número total de tareas que cumplen los filtros.
+          - "categories": Diccionario {nombre de la categoría: número de tareas}.
+          - "chart": Datos para el gráfico, con las claves de `EnumEjes`.
+        - None si ocurre un error.
+        """
+        def load() -> Optional[Dict[str, Any]]:
+            try:
+                where_clause, params = self._build_tareas_filter(search_text, category, usuario)
+                # El filtro va en la condición del LEFT JOIN para conservar las categorías sin tareas
+                query = sql.SQL("""
+                    SELECT c.nombre_categoria, COUNT(t.nombre) AS total
+                    FROM categorias AS c
+                    LEFT JOIN tareas AS t ON t.id_categoria = c.id_categoria AND {where}
+                    GROUP BY c.nombre_categoria
+                    ORDER BY MIN(c.id_categoria);
+                """).format(where=where_clause)
+                categories = {nombre_categoria: total for nombre_categoria, total in self._run_query(query, params)}
+                return self._build_totals(categories)
+            except Exception as e:
+                logger.error("Error al calcular los totales por categoría: %s", e)
+                return None
+
+        cache_key = self._tareas_cache_key("totals", search_text, category, usuario)
+        return self._cache.get_or_load(cache_key, self.TAREAS_DEPENDENCIES, load)
+    # _fetch_category_totals (fin)
+
+    def _fetch_report_dataset(self, max_rows: int = utils_db.DATASET_MAX_ROWS_DB) -> Optional[ReportDataset]:
+        """
+        Carga todas las tareas en un conjunto de datos por columnas para filtrarlas y agregarlas en memoria.
+
+        El usuario y la categoría se guardan codificados por diccionario; el diccionario de la
+        categoría contiene todas las categorías en orden de `id_categoria`, de modo que los
+        totales incluyen también las que no tienen tareas (igual que `_fetch_category_totals`).
+        Las filas se guardan ordenadas por la clave, como en la tabla paginada. Las categorías y
+        las tareas se leen en una misma transacción REPEATABLE READ, de modo que ambas ven la misma
+        instantánea y toda categoría de una tarea está en el diccionario.
+
+        El conjunto solo se usa mientras la caché de resultados está habilitada: así se carga
+        una vez y se descarta cuando llega una notificación de cambio. Sin caché habría que
+        descargar la tabla entera en cada filtro, y es preferible filtrar en PostgreSQL.
+
+        Parámetros:
+        - max_rows: Número máximo de tareas; si la tabla tiene más, no se carga.
+
+        Retorno:
+        - ReportDataset con las columnas de `TAREAS_REPORT_COLUMNS` y "nombre_categoria".
+        - None si la caché está deshabilitada, la tabla supera `max_rows` o ocurre un error.
+        """
+        if not self._cache.is_enabled():
+            return None
+
+        def load() -> Optional[ReportDataset]:
+            try:
+                query = sql.SQL("""
+                    SELECT {columns}
+                    FROM tareas AS t
+                    ORDER BY {key}
+                    LIMIT %(limite)s;
+                """).format(
+                    columns=sql.SQL(", ").join(
+                        sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS
+                    ),
+                    key=sql.Identifier("t", self.TAREAS_KEY_COLUMN)
+                )
+                with self._db_manager.connection() as connection:
+                    # Debe ser la primera sentencia de la transacción; la instantánea se toma en la primera consulta
+                    connection.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY;")
+                    categories = self._run_query(sql.SQL(
+                        "SELECT id_categoria, nombre_categoria FROM categorias ORDER BY id_categoria;"
+                    ), connection=connection)
+                    rows = self._run_query(
+                        query, {"limite": max_rows + 1}, row_factory=psycopg.rows.tuple_row, binary=True,
+                        connection=connection
+                    )
+                if len(rows) > max_rows:
+                    logger.info("Más de %d tareas: se filtrarán en PostgreSQL.", max_rows)
+                    return None
+
+                dataset = ReportDataset.from_columnar(
+                    ColumnarResult.from_rows(self.TAREAS_REPORT_COLUMNS, rows),
+                    dictionary_columns={"idusuario": None},
+                    integer_columns=("id_categoria",)
+                )
+                # La categoría de cada tarea se codifica con la posición de su id en la tabla de categorías
+                position_of = {id_categoria: position for position, (id_categoria, _) in enumerate(categories)}
+                category_column = DictionaryColumn(
+                    array("l", map(position_of.__getitem__, dataset.column("id_categoria"))),
+                    [nombre_categoria for _, nombre_categoria in categories]
+                )
+                return dataset.with_column("nombre_categoria", category_column)
+            except Exception as e:
+                logger.error("Error al cargar el conjunto de datos de tareas: %s", e)
+                return None
+
+        return self._cache.get_or_load(("dataset", max_rows), self.TAREAS_DEPENDENCIES, load)
+    # _fetch_report_dataset (fin)
+
+    def _filter_report_dataset(
+        self,
+        dataset: ReportDataset,
+        search_text: str = "",
+        category: Optional[str] = None
+    ) -> ReportDataset:
+        """
+        Aplica al conjunto en memoria los mismos filtros que `_build_tareas_filter` aplica en PostgreSQL.
+
+        Parámetros:
+        - dataset: Conjunto obtenido con `_fetch_report_dataset`.
+        - search_text: Texto a buscar (sin distinguir mayúsculas) en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+
+        Retorno:
+        - Vista del conjunto con las tareas que cumplen los filtros (sin copiar los datos).
+        """
+        search_text = (search_text or "").strip()
+        if search_text:
+            dataset = dataset.filter_contains(search_text, self.TAREAS_REPORT_COLUMNS)
+        if category:
+            dataset = dataset.filter_equals("nombre_categoria", category, case_insensitive=True)
+        return dataset
+    # _filter_report_dataset (fin)
+
+    def _report_dataset_totals(self, dataset: ReportDataset) -> Dict[str, Any]:
+        """
+        Calcula los totales por categoría de una vista del conjunto en memoria.
+
+        Retorno:
+        - Diccionario con el mismo formato que `_fetch_category_totals`.
+        """
+        return self._build_totals(dataset.count_by("nombre_categoria"))
+    # _report_dataset_totals (fin)
+
+    @staticmethod
+    def _build_totals(categories: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Construye el resultado de los totales a partir del número de tareas por categoría.
+
+        Parámetros:
+        - categories: Diccionario {nombre de la categoría: número de tareas}, en orden de presentación.
+
+        Retorno:
+        - Diccionario con "total", "categories" y "chart" (ver `_fetch_category_totals`).
+        """
+        return {
+            "total": sum(categories.values()),
+            "categories": categories,
+            "chart": {
+                utils_db.EnumEjes.EJE_X.value: list(categories.keys()),
+                utils_db.EnumEjes.EJE_Y.value: {"Totales": list(categories.values())}
+            }
+        }
+    # _build_totals (fin)
+
+    def _search_tareas(
+        self,
+        search_text: str,
+        category: Optional[str] = None,
+        limit: int = utils_db.SEARCH_LIMIT_DB
+    ) -> Optional[List[Dict[str, Union[str, int, float]]]]:
+        """
+        Busca tareas por parecido con el texto y las devuelve ordenadas por relevancia.
+
+        Las coincidencias se filtran con el operador `<%` de pg_trgm (similitud por palabras por
+        encima de `pg_trgm.word_similarity_threshold`) sobre el nombre, la descripción y el usuario,
+        que PostgreSQL resuelve con los índices GIN de trigramas de la migración
+        `0002_indices_busqueda.sql`. Así solo se puntúan y ordenan las tareas parecidas al texto,
+        no todas las que lo contienen, y se devuelven las `limit` mejores según `word_similarity`.
+        A diferencia del filtro de `_build_tareas_filter`, tolera errores de escritura.
+
+        Parámetros:
+        - search_text: Texto a buscar.
+        - category: Nombre de la categoría a la que deben pertenecer las tareas, o None.
+        - limit: Número máximo de resultados.
+
+        Retorno:
+        - Lista de registros como diccionarios, con las columnas de `TAREAS_REPORT_COLUMNS`
+          y "relevancia", de mayor a menor relevancia.
+        - None si ocurre un error.
+        """
+        def load() -> Optional[List[Dict[str, Union[str, int, float]]]]:
+            try:
+                where_clause, params = self._build_tareas_filter("", category)
+                params["texto"] = (search_text or "").strip()
+                params["limite"] = limit
+                query = sql.SQL("""
+                    SELECT {columns},
+                           GREATEST(
+                               word_similarity(%(texto)s, t.nombre),
+                               word_similarity(%(texto)s, COALESCE(t.description, '')),
+                               word_similarity(%(texto)s, t.idusuario)
+                           ) AS relevancia
+                    FROM tareas AS t
+                    JOIN categorias AS c ON c.id_categoria = t.id_categoria
+                    WHERE (
+                        %(texto)s <%% t.nombre
+                        OR %(texto)s <%% t.description
+                        OR %(texto)s <%% t.idusuario
+                    ) AND {where}
+                    ORDER BY relevancia DESC, {key}
+                    LIMIT %(limite)s;
+                """).format(
+                    columns=sql.SQL(", ").join(
+                        sql.Identifier("t", column) for column in self.TAREAS_REPORT_COLUMNS
+                    ),
+                    where=where_clause,
+                    key=sql.Identifier("t", self.TAREAS_KEY_COLUMN)
+                )
+                return self._run_query(query, params, row_factory=psycopg.rows.dict_row)
+            except Exception as e:
+                logger.error("Error al buscar tareas: %s", e)
+                return None
+
+        cache_key = self._tareas_cache_key("search", search_text, category, limit)
+        return self._cache.get_or_load(cache_key, self.TAREAS_DEPENDENCIES, load)
+    # _search_tareas (fin)
+
+    def _run_query(
+        self,
+        query: sql.Composable,
+        params: Optional[Dict[str, Any]] = None,
+        row_factory: Optional[Any] = None,
+        binary: bool = False,
+        connection: Optional[psycopg.Connection] = None
+    ) -> List[Any]:
+        """
+        Ejecuta una consulta y devuelve todas sus filas, registrando su duración, el número de
+        filas, los bytes recibidos (estimados) y el método desde el que se ejecutó en `QueryMonitor`.
+
+        Las consultas del informe se repiten con distintos parámetros, por lo que se preparan en
+        el servidor (`prepare=True`): cada conexión las analiza y planifica una sola vez y las
+        siguientes ejecuciones solo envían los parámetros. Por eso los valores deben pasarse
+        siempre en `params` y los nombres de tablas y columnas componerse con `sql.Identifier`.
+
+        Parámetros:
+        - query: Consulta SQL compuesta.
+        - params: Parámetros de la consulta.
+        - row_factory: Fábrica de filas del cursor (por ejemplo, `dict_row`). Por defecto, tuplas.
+        - binary: Si es True, los resultados se reciben en formato binario.
+        - connection: Conexión (ya obtenida con `ManagerDB.connection()`) en cuya transacción se
+          ejecuta la consulta, para leer varias consultas de una misma instantánea. Si es None,
+          se usa una conexión propia.
+
+        Retorno:
+        - Lista de filas.
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta.
+        """
+        name, call_site = self._query_origin(sys._getframe(1))
+        if connection is not None:
+            return self._fetch_all(connection, name, call_site, query, params, row_factory, binary)
+        with self._db_manager.connection() as connection:
+            return self._fetch_all(connection, name, call_site, query, params, row_factory, binary)
+    # _run_query (fin)
+
+    def _fetch_all(
+        self,
+        connection: psycopg.Connection,
+        name: str,
+        call_site: str,
+        query: sql.Composable,
+        params: Optional[Dict[str, Any]],
+        row_factory: Optional[Any],
+        binary: bool
+    ) -> List[Any]:
+        """
+        Ejecuta una consulta preparada en la conexión indicada y la registra en `QueryMonitor` (ver `_run_query`).
+        """
+        with connection.cursor(row_factory=row_factory, binary=binary) as cursor:
+            start = time.perf_counter()
+            cursor.execute(query, params, prepare=True)
+            rows = cursor.fetchall()
+            duration = time.perf_counter() - start
+
+            self._query_monitor.record(
+                name, call_site, duration, len(rows), QueryMonitor.result_size(cursor.pgresult),
+                explain=lambda: self._explain(connection, query, params)
+            )
+        return rows
+    # _fetch_all (fin)
+
+    def _stream_query(
+        self,
+        query: sql.Composable,
+        params: Optional[Dict[str, Any]],
+        cursor_name: str,
+        batch_size: int,
+        row_factory: Optional[Any] = None
+    ) -> Iterator[List[Any]]:
+        """
+        Ejecuta una consulta con un cursor del lado del servidor y entrega sus filas por lotes.
+
+        Se registra en `QueryMonitor` al terminar (o al cerrarse el generador). La duración solo
+        incluye el tiempo de espera a la base de datos, no el que emplea quien consume los lotes.
+        Los cursores del lado del servidor no admiten sentencias preparadas (usan DECLARE).
+
+        Parámetros:
+        - query: Consulta SQL compuesta.
+        - params: Parámetros de la consulta.
+        - cursor_name: Nombre del cursor del lado del servidor.
+        - batch_size: Número de filas de cada lote.
+        - row_factory: Fábrica de filas del cursor. Por defecto, tuplas.
+
+        Retorno:
+        - Generador de lotes de filas.
+        """
+        name, call_site = self._query_origin(sys._getframe(1))
+        batch_size = max(1, batch_size)
+        duration = 0.0
+        total_rows = 0
+        total_bytes = 0
+        try:
+            # Un cursor con nombre es un cursor del lado del servidor (DECLARE ... CURSOR)
+            with self._db_manager.connection() as connection, \
+                    connection.cursor(name=cursor_name, row_factory=row_factory) as cursor:
+                cursor.itersize = batch_size
+                start = time.perf_counter()
+                cursor.execute(query, params)
+                duration += time.perf_counter() - start
+                while True:
+                    start = time.perf_counter()
+                    rows = cursor.fetchmany(batch_size)
+                    duration += time.perf_counter() - start
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    total_bytes += QueryMonitor.result_size(cursor.pgresult)
+                    yield rows
+        finally:
+            self._query_monitor.record(name, call_site, duration, total_rows, total_bytes)
+    # _stream_query (fin)
+
+    @staticmethod
+    def _explain(connection, query: sql.Composable, params: Optional[Dict[str, Any]]) -> str:
+        """
+        Devuelve el plan de ejecución de una consulta con `EXPLAIN (ANALYZE, BUFFERS)`.
+
+        ANALYZE vuelve a ejecutar la consulta, por lo que solo se usa con las consultas lentas
+        y si `EXPLAIN_SLOW_QUERIES_DB` está activado.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql.SQL("EXPLAIN (ANALYZE, BUFFERS) ") + query, params)
+            return "\n".join(row[0] for row in cursor.fetchall())
+    # _explain (fin)
+
+    @staticmethod
+    def _query_origin(frame) -> Tuple[str, str]:
+        """
+        Obtiene el nombre de la consulta (método del modelo) y el archivo y línea desde donde se ejecuta.
+
+        Parámetros:
+        - frame: Marco de pila de quien llama a `_run_query` o `_stream_query`.
+
+        Retorno:
+        - Tupla (nombre, "archivo:línea").
+        """
+        code = frame.f_code
+        # Las funciones `load` anidadas se atribuyen al método que las define
+        name = getattr(code, "co_qualname", code.co_name).split(".<locals>")[0]
+        return name, f"{os.path.basename(code.co_filename)}:{frame.f_lineno}"
+    # _query_origin (fin)
+
+    def _get_query_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Devuelve los percentiles de duración, filas y bytes de cada consulta ejecutada.
+
+        Retorno:
+        - Diccionario {consulta: estadísticas}, con el formato de `QueryMonitor.stats`.
+        """
+        return self._query_monitor.stats()
+    # _get_query_stats (fin)
+
+    def _get_prepared_statement_stats(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Devuelve las sentencias preparadas en el servidor por cada conexión (ver `ManagerDB.get_prepared_statement_stats`).
+
+        Retorno:
+        - Lista con una entrada por conexión.
+        - None si ocurre un error.
+        """
+        try:
+            return self._db_manager.get_prepared_statement_stats()
+        except Exception as e:
+            logger.error("Error al consultar las sentencias preparadas: %s", e)
+            return None
+    # _get_prepared_statement_stats (fin)
+
+    @staticmethod
+    def _tareas_cache_key(kind: str, search_text: str, category: Optional[str], *extra: Any) -> Tuple[Any, ...]:
+        """
+        Construye la clave de caché de una consulta de tareas.
+
+        El texto y la categoría se normalizan igual que en `_build_tareas_filter`, para que
+        filtros equivalentes (por ejemplo, con espacios o mayúsculas distintas) compartan resultado.
+
+        Parámetros:
+        - kind: Tipo de consulta (por ejemplo, "page" o "totals").
+        - search_text: Texto de búsqueda.
+        - category: Nombre de la categoría o None.
+        - *extra: Resto de parámetros de la consulta (página, límite, etc.).
+
+        Retorno:
+        - Tupla (tabla, tipo de consulta, filtros, parámetros).
+        """
+        return (
+            utils_db.EnumTablasDB.TAREAS.value,
+            kind,
+            (search_text or "").strip(),
+            category.lower() if category else None,
+        ) + extra
+    # _tareas_cache_key (fin)
+
+    def _build_tareas_filter(
+        self,
+        search_text: str,
+        category: Optional[str],
+        usuario: Optional[str] = None
+    ) -> Tuple[sql.Composable, Dict[str, Any]]:
+        """
+        Construye la cláusula WHERE parametrizada para filtrar tareas.
+
+        La consulta que la utilice debe referirse a la tabla "tareas" con el alias `t`
+        y a la tabla "categorias" con el alias `c`.
+
+        Parámetros:
+        - search_text: Texto a buscar en la categoría, nombre, descripción o usuario.
+        - category: Nombre de la categoría o None para no filtrar por categoría.
+        - usuario: Email exacto del usuario o None para no filtrar por usuario.
+
+        Retorno:
+        - Tupla con la cláusula SQL compuesta y el diccionario de parámetros asociado.
+        """
+        conditions = []
+        params: Dict[str, Any] = {}
+
+        search_text = (search_text or "").strip()
+        if search_text:
+            conditions.append(sql.SQL("""(
+                CAST(t.id_categoria AS TEXT) ILIKE %(patron)s
+                OR t.nombre ILIKE %(patron)s
+                OR t.description ILIKE %(patron)s
+                OR t.idusuario ILIKE %(patron)s
+            )"""))
+            params["patron"] = f"%{self._escape_like(search_text)}%"
+
+        if category:
+            conditions.append(sql.SQL("lower(c.nombre_categoria) = lower(%(categoria)s)"))
+            params["categoria"] = category
+
+        if usuario:
+            conditions.append(sql.SQL("t.idusuario = %(usuario)s"))
+            params["usuario"] = usuario
+
+        if not conditions:
+            return sql.SQL("TRUE"), params
+        return sql.SQL(" AND ").join(conditions), params
+    # _build_tareas_filter (fin)
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        """
+        Escapa los caracteres comodín de LIKE/ILIKE para que se busquen de forma literal.
+
+        Parámetros:
+        - text: Texto introducido por el usuario.
+
+        Retorno:
+        - Texto con `\\`, `%` y `_` escapados.
+        """
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    # _escape_like (fin)
+
     def _validate_table_name(self, table_name: str) -> bool:
         """
         Valida si el nombre de la tabla está permitido según la configuración.
@@ -151,10 +1012,16 @@ class ReportModel:
         Cierra la conexión a la base de datos delegando la lógica a ManagerDB.
 
         Esto asegura que la conexión se cierre correctamente cuando ya no sea necesaria.
+        También detiene la escucha de cambios y vacía la caché de resultados.
         """
+        if self._change_listener is not None:
+            self._change_listener.stop(timeout=utils_db.NOTIFY_RETRY_INTERVAL_DB)
+            self._change_listener = None
+        self._on_listener_status(False)
+
         try:
             self._db_manager.close_connection()
         except Exception as e:
-            _printv2(show_popup=False, parent=self._popup_parent, message=f"Error al cerrar la conexión: {e}")
+            logger.error("Error al cerrar la conexión: %s", e)
     # _close_connection (fin)
 # ReportModel (fin)
@@ -0,0 +1,178 @@
+"""
+* WEBGRAFÍA *
+
+- collections.OrderedDict. (s. f.). Python documentation. de https://docs.python.org/3/library/collections.html#collections.OrderedDict
+
+- time.monotonic. (s. f.). Python documentation. de https://docs.python.org/3/library/time.html#time.monotonic
+
+"""
+
+# Archivo: src/models/result_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+from utils import utils_db
+
+
+class ResultCache:
+    """
+    Caché en memoria de resultados de consultas, con expulsión LRU y caducidad (TTL).
+
+    Cada entrada se guarda con una clave (por ejemplo, tabla, filtros y página) y con las tablas
+    de las que depende su resultado. Cuando una de esas tablas cambia, `invalidate` descarta
+    todas las entradas que dependen de ella.
+
+    La caché solo entrega resultados mientras está habilitada. Se habilita cuando hay un
+    escuchador de cambios activo (ver `models/db_change_listener.py`); si se pierde la
+    conexión con el escuchador, se vacía y se deshabilita para no servir datos obsoletos.
+
+    Es segura para usarse desde varios hilos (el hilo de la interfaz, los hilos del
+    `DbWorker` y el hilo del escuchador).
+
+    Los resultados se comparten entre las llamadas que los piden, por lo que no deben modificarse.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = utils_db.RESULT_CACHE_MAX_ENTRIES_DB,
+        ttl: float = utils_db.RESULT_CACHE_TTL_DB
+    ):
+        """
+        Inicializa la caché vacía y deshabilitada.
+
+        Parámetros:
+        - max_entries (int): Número máximo de entradas; al superarlo se descartan las menos usadas.
+        - ttl (float): Segundos que una entrada es válida desde que se guardó (0 o menos: sin caducidad).
+        """
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._enabled = False
+
+        # Clave -> (instante en que se guardó, tablas de las que depende, resultado)
+        self._entries: "OrderedDict[Hashable, Tuple[float, frozenset, Any]]" = OrderedDict()
+
+        # Número de invalidaciones por tabla y de vaciados completos. Permiten detectar si una
+        # tabla cambió mientras se ejecutaba la consulta cuyo resultado se va a guardar.
+        self._versions: Dict[str, int] = {}
+        self._generation = 0
+    # __init__ (fin)
+
+    def is_enabled(self) -> bool:
+        """
+        Indica si la caché está entregando y guardando resultados.
+
+        Retorno:
+        - bool: True si está habilitada.
+        """
+        return self._enabled
+    # is_enabled (fin)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Habilita o deshabilita la caché. Al cambiar de estado se vacía.
+
+        Parámetros:
+        - enabled (bool): True para habilitarla.
+        """
+        with self._lock:
+            if self._enabled != enabled:
+                self._enabled = enabled
+                self._clear_locked()
+    # set_enabled (fin)
+
+    def get_or_load(self, key: Hashable, tables: Iterable[str], loader: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado guardado para `key` o lo obtiene con `loader` y lo guarda.
+
+        El resultado solo se guarda si no es None (los errores no se guardan) y si ninguna de
+        las tablas de las que depende ha cambiado mientras se obtenía.
+
+        Parámetros:
+        - key (Hashable): Clave de la consulta.
+        - tables (iterable[str]): Tablas de las que depende el resultado.
+        - loader (callable): Función sin argumentos que ejecuta la consulta.
+
+        Retorno:
+        - Resultado guardado o el devuelto por `loader`.
+        """
+        tables = frozenset(table.lower() for table in tables)
+        with self._lock:
+            if not self._enabled:
+                cached, snapshot = None, None
+            else:
+                cached = self._get_locked(key)
+                snapshot = self._snapshot_locked(tables)
+            if cached is not None:
+                return cached
+
+        result = loader()
+        if result is None or snapshot is None:
+            return result
+
+        with self._lock:
+            if self._enabled and self._snapshot_locked(tables) == snapshot:
+                self._entries[key] = (time.monotonic(), tables, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return result
+    # get_or_load (fin)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """
+        Descarta las entradas que dependen de una tabla, o todas si no se indica ninguna.
+
+        Parámetros:
+        - table (str | None): Nombre de la tabla que ha cambiado (sin distinguir mayúsculas).
+        """
+        with self._lock:
+            if not table:
+                self._clear_locked()
+                return
+            table = table.lower()
+            self._versions[table] = self._versions.get(table, 0) + 1
+            for key in [key for key, (_, tables, _) in self._entries.items() if table in tables]:
+                del self._entries[key]
+    # invalidate (fin)
+
+    def clear(self) -> None:
+        """
+        Descarta todas las entradas.
+        """
+        with self._lock:
+            self._clear_locked()
+    # clear (fin)
+
+    def _get_locked(self, key: Hashable) -> Any:
+        """
+        Devuelve una entrada vigente (o None) y la marca como usada. Requiere tener el cerrojo.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, _, result = entry
+        if self._ttl > 0 and time.monotonic() - stored_at > self._ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+    # _get_locked (fin)
+
+    def _snapshot_locked(self, tables: frozenset) -> Tuple[int, Tuple[int, ...]]:
+        """
+        Devuelve las versiones actuales de las tablas indicadas. Requiere tener el cerrojo.
+        """
+        return self._generation, tuple(self._versions.get(table, 0) for table in sorted(tables))
+    # _snapshot_locked (fin)
+
+    def _clear_locked(self) -> None:
+        """
+        Vacía la caché y descarta los resultados de las consultas en curso. Requiere tener el cerrojo.
+        """
+        self._entries.clear()
+        self._generation += 1
+    # _clear_locked (fin)
+# ResultCache (fin)
@@ -1,6 +1,9 @@
 # Archivo: src/models/rol_entity.py
 
-class RolEntity:
+from models.base_entity import BaseEntity
+
+
+class RolEntity(BaseEntity):
     """
     Clase que representa un rol en la aplicación.
     Cada instancia corresponde a un registro en la tabla `roles` de la base de datos.
@@ -8,12 +11,19 @@ class RolEntity:
     Métodos disponibles:
     - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
     - _from_dict(data): Crea una instancia de RolEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
     - __str__(): Representación legible para humanos.
     - __repr__(): Representación técnica detallada del objeto.
     - __eq__(): Compara dos roles basándose en su atributo 'id_rol'.
     - __hash__(): Genera un hash único basado en 'id_rol'.
     """
 
+    __slots__ = ("_id_rol", "_nombre_rol")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("id_rol", "nombre_rol")
+
     def __init__(self, id_rol, nombre_rol):
         """
         Inicializa un objeto RolEntity con los datos de un rol.
@@ -0,0 +1,197 @@
+"""
+* WEBGRAFÍA *
+
+- pg_attribute. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/catalog-pg-attribute.html
+
+- System Information Functions (format_type, current_schemas). (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/functions-info.html
+
+- pg_index. (s. f.). Postgresql.org. de https://www.postgresql.org/docs/current/catalog-pg-index.html
+
+- psycopg.rows.tuple_row. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/rows.html#psycopg.rows.tuple_row
+
+"""
+
+# Archivo: src/models/schema_catalog.py
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from utils import utils_db
+
+# Firma de un decodificador de filas: tupla devuelta por el cursor -> diccionario columna-valor
+RowDecoder = Callable[[Sequence[Any]], Dict[str, Any]]
+
+
+class ColumnInfo:
+    """
+    Descripción de una columna de una tabla: nombre, tipo, posición y si forma parte de la clave primaria.
+    """
+
+    def __init__(self, name: str, data_type: str, ordinal_position: int, is_primary_key: bool = False):
+        """
+        Inicializa la descripción de la columna.
+
+        Parámetros:
+        - name (str): Nombre de la columna.
+        - data_type (str): Tipo de la columna tal como lo muestra PostgreSQL (por ejemplo, "character varying(255)").
+        - ordinal_position (int): Posición de la columna en la tabla, empezando en 1.
+        - is_primary_key (bool): True si la columna forma parte de la clave primaria.
+        """
+        self.name = name
+        self.data_type = data_type
+        self.ordinal_position = ordinal_position
+        self.is_primary_key = is_primary_key
+    # __init__ (fin)
+
+    def __repr__(self) -> str:
+        """
+        Representación técnica de la columna.
+        """
+        return (f"ColumnInfo(name={self.name!r}, data_type={self.data_type!r}, "
+                f"ordinal_position={self.ordinal_position}, is_primary_key={self.is_primary_key})")
+    # __repr__ (fin)
+# ColumnInfo (fin)
+
+
+class TableSchema:
+    """
+    Columnas de una tabla en el orden en que están definidas, con su decodificador de filas.
+
+    El decodificador se construye una sola vez al cargar el esquema, de modo que convertir
+    cada fila (una tupla del cursor) en diccionario no necesita volver a consultar los nombres
+    de las columnas.
+    """
+
+    def __init__(self, table_name: str, columns: List[ColumnInfo]):
+        """
+        Inicializa el esquema de la tabla.
+
+        Parámetros:
+        - table_name (str): Nombre de la tabla.
+        - columns (list[ColumnInfo]): Columnas ordenadas por su posición.
+        """
+        self.table_name = table_name
+        self.columns = columns
+        self.column_names: Tuple[str, ...] = tuple(column.name for column in columns)
+        self.primary_key: Tuple[str, ...] = tuple(column.name for column in columns if column.is_primary_key)
+        self.decode_row: RowDecoder = self._build_decoder(self.column_names)
+    # __init__ (fin)
+
+    def decoder_for(self, column_names: Sequence[str]) -> RowDecoder:
+        """
+        Devuelve un decodificador para filas que contienen solo algunas columnas, en el orden indicado.
+
+        Parámetros:
+        - column_names (sequence[str]): Columnas de la consulta, en orden.
+
+        Retorno:
+        - callable: Función que convierte una tupla de esas columnas en diccionario.
+
+        Excepciones:
+        - KeyError: Si alguna columna no existe en la tabla.
+        """
+        missing = [name for name in column_names if name not in self.column_names]
+        if missing:
+            raise KeyError(f"Columnas desconocidas en '{self.table_name}': {', '.join(missing)}")
+        return self._build_decoder(tuple(column_names))
+    # decoder_for (fin)
+
+    @staticmethod
+    def _build_decoder(column_names: Tuple[str, ...]) -> RowDecoder:
+        """
+        Construye la función que convierte una tupla en diccionario con los nombres indicados.
+        """
+        def decode_row(row: Sequence[Any]) -> Dict[str, Any]:
+            return dict(zip(column_names, row))
+        return decode_row
+    # _build_decoder (fin)
+# TableSchema (fin)
+
+
+class SchemaCatalog:
+    """
+    Caché de los metadatos (columnas, tipos y posiciones) de las tablas de `EnumTablasDB`.
+
+    Todas las tablas se cargan con una única consulta a `pg_catalog` (mucho más rápida que la
+    vista `information_schema.columns`) la primera vez que se necesitan, y después se sirven
+    desde memoria. ManagerDB descarta la caché al abrir una conexión o un pool nuevos y al
+    ejecutar los scripts de inicialización, ya que pueden cambiar el esquema.
+
+    Es segura para usarse desde varios hilos.
+    """
+
+    # Columnas de las tablas del esquema de búsqueda de la conexión, en orden de definición.
+    # Se descartan las columnas de sistema (attnum <= 0) y las eliminadas.
+    _COLUMNS_QUERY = """
+        SELECT c.relname, a.attname, format_type(a.atttypid, a.atttypmod),
+               COALESCE(a.attnum = ANY(i.indkey), FALSE) AS es_clave_primaria
+        FROM pg_catalog.pg_attribute AS a
+        JOIN pg_catalog.pg_class AS c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace AS n ON n.oid = c.relnamespace
+        LEFT JOIN pg_catalog.pg_index AS i ON i.indrelid = c.oid AND i.indisprimary
+        WHERE n.nspname = ANY(current_schemas(false))
+          AND c.relname = ANY(%(tablas)s)
+          AND c.relkind IN ('r', 'p', 'v', 'm')
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+        ORDER BY c.relname, a.attnum;
+    """
+
+    def __init__(self, db_manager, table_names: Optional[Sequence[str]] = None):
+        """
+        Inicializa la caché sin cargar.
+
+        Parámetros:
+        - db_manager: Instancia de ManagerDB con la que se consultan los metadatos.
+        - table_names (sequence[str] | None): Tablas a cargar. Por defecto, todas las de `EnumTablasDB`.
+        """
+        self._db_manager = db_manager
+        self._table_names = list(table_names or (table.value for table in utils_db.EnumTablasDB))
+        self._lock = threading.Lock()
+        self._tables: Optional[Dict[str, TableSchema]] = None
+    # __init__ (fin)
+
+    def get_table(self, table_name: str) -> Optional[TableSchema]:
+        """
+        Devuelve el esquema de una tabla, cargando los metadatos si aún no se han cargado.
+
+        Parámetros:
+        - table_name (str): Nombre de la tabla.
+
+        Retorno:
+        - TableSchema | None: Esquema de la tabla, o None si la tabla no existe.
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta de los metadatos.
+        """
+        with self._lock:
+            if self._tables is None:
+                self._tables = self._load()
+            return self._tables.get(table_name)
+    # get_table (fin)
+
+    def invalidate(self) -> None:
+        """
+        Descarta los metadatos cargados; se volverán a consultar la próxima vez que se pidan.
+        """
+        with self._lock:
+            self._tables = None
+    # invalidate (fin)
+
+    def _load(self) -> Dict[str, TableSchema]:
+        """
+        Consulta las columnas de todas las tablas y construye sus esquemas.
+        """
+        columns_by_table: Dict[str, List[ColumnInfo]] = {name: [] for name in self._table_names}
+        with self._db_manager.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(self._COLUMNS_QUERY, {"tablas": self._table_names})
+            for table_name, column_name, data_type, is_primary_key in cursor.fetchall():
+                columns = columns_by_table[table_name]
+                columns.append(ColumnInfo(column_name, data_type, len(columns) + 1, is_primary_key))
+
+        return {
+            table_name: TableSchema(table_name, columns)
+            for table_name, columns in columns_by_table.items()
+            if columns
+        }
+    # _load (fin)
+# SchemaCatalog (fin)
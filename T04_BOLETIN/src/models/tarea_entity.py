@@ -0,0 +1,142 @@
+# Archivo: src/models/tarea_entity.py
+
+from models.base_entity import BaseEntity
+
+
+class TareaEntity(BaseEntity):
+    """
+    Clase que representa una tarea en la aplicación.
+    Cada instancia corresponde a un registro en la tabla `tareas` de la base de datos.
+
+    Métodos disponibles:
+    - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
+    - _from_dict(data): Crea una instancia de TareaEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
+    - __str__(): Representación legible para humanos.
+    - __repr__(): Representación técnica detallada del objeto.
+    - __eq__(): Compara dos tareas basándose en su atributo 'nombre'.
+    - __hash__(): Genera un hash único basado en 'nombre'.
+    """
+
+    __slots__ = ("_nombre", "_descripcion", "_email_usuario", "_id_categoria")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("nombre", "descripcion", "email_usuario", "id_categoria")
+
+    def __init__(self, nombre, descripcion, email_usuario, id_categoria):
+        """
+        Inicializa un objeto TareaEntity con los datos de una tarea.
+
+        Parámetros:
+        - nombre (str): Nombre único de la tarea (columna `nombre`).
+        - descripcion (str): Descripción de la tarea (columna `description`).
+        - email_usuario (str): Email del usuario al que pertenece la tarea (columna `idUsuario`).
+        - id_categoria (int): ID de la categoría de la tarea.
+        """
+        self._nombre = nombre
+        self._descripcion = descripcion
+        self._email_usuario = email_usuario
+        self._id_categoria = id_categoria
+    # __init__ (fin)
+
+    def _to_dict(self):
+        """
+        Convierte la instancia actual en un diccionario.
+
+        Esto es útil para preparar los datos para operaciones como:
+        - Serialización (e.g., guardar en JSON o enviar a una API).
+        - Interacción con la base de datos para insertar o actualizar registros.
+
+        Retorno:
+        - dict: Representación de la tarea como un diccionario.
+        """
+        return {
+            "nombre": self._nombre,
+            "descripcion": self._descripcion,
+            "email_usuario": self._email_usuario,
+            "id_categoria": self._id_categoria
+        }
+    # _to_dict (fin)
+
+    @classmethod
+    def _from_dict(cls, data):
+        """
+        Crea una instancia de TareaEntity a partir de un diccionario.
+
+        Esto es útil al recibir datos desde una API o al obtener registros de la base de datos.
+
+        Parámetros:
+        - cls: Hace referencia a la clase `TareaEntity`. Se usa en métodos de clase para crear instancias
+               de la clase en lugar de usar una instancia existente (`self`).
+        - data (dict): Diccionario con los datos de la tarea.
+
+        Retorno:
+        - TareaEntity: Instancia creada con los datos proporcionados.
+
+        Nota:
+        - Usamos `cls` para garantizar que el método funcione correctamente incluso si la clase
+          es heredada o renombrada en algún momento.
+        """
+        return cls(
+            nombre=data.get("nombre"),
+            descripcion=data.get("descripcion"),
+            email_usuario=data.get("email_usuario"),
+            id_categoria=data.get("id_categoria")
+        )
+    # _from_dict (fin)
+
+    def __str__(self):
+        """
+        Devuelve una representación legible de la tarea.
+
+        Esto es útil para:
+        - Mostrar datos de la tarea en la interfaz de usuario.
+        - Generar registros de logs o mensajes de depuración.
+
+        Retorno:
+        - str: Representación en formato legible.
+        """
+        return f"Tarea: {self._nombre}, Usuario: {self._email_usuario}, Categoría: {self._id_categoria}"
+    # __str__ (fin)
+
+    def __repr__(self):
+        """
+        Devuelve una representación técnica de la tarea.
+
+        Esto es útil al depurar o inspeccionar el objeto en entornos interactivos.
+
+        Retorno:
+        - str: Representación en formato técnico.
+        """
+        return (
+            f"TareaEntity(nombre='{self._nombre}', descripcion='{self._descripcion}', "
+            f"email_usuario='{self._email_usuario}', id_categoria={self._id_categoria})"
+        )
+    # __repr__ (fin)
+
+    def __eq__(self, other):
+        """
+        Comprueba si dos instancias de TareaEntity son iguales, basándose en su nombre.
+
+        Parámetros:
+        - other (TareaEntity): Otra instancia a comparar.
+
+        Retorno:
+        - bool: True si los nombres son iguales, False en caso contrario.
+        """
+        if not isinstance(other, TareaEntity):
+            return False
+        return self._nombre == other._nombre
+    # __eq__ (fin)
+
+    def __hash__(self):
+        """
+        Devuelve el hash de la instancia, basado en su nombre.
+
+        Retorno:
+        - int: Valor hash de la instancia.
+        """
+        return hash(self._nombre)
+    # __hash__ (fin)
+# TareaEntity (fin)
@@ -1,6 +1,9 @@
 # Archivo: src/models/usuario_entity.py
 
-class UsuarioEntity:
+from models.base_entity import BaseEntity
+
+
+class UsuarioEntity(BaseEntity):
     """
     Clase que representa un usuario en la aplicación.
     Cada instancia corresponde a un registro en la tabla `usuarios` de la base de datos.
@@ -8,12 +11,19 @@ class UsuarioEntity:
     Métodos disponibles:
     - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
     - _from_dict(data): Crea una instancia de UsuarioEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
     - __str__(): Representación legible para humanos.
     - __repr__(): Representación técnica detallada del objeto.
     - __eq__(): Compara dos usuarios basándose en su atributo 'email'.
     - __hash__(): Genera un hash único basado en 'email'.
     """
 
+    __slots__ = ("_email", "_nombre_usuario", "_password", "_id_rol")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("email", "nombre_usuario", "password", "id_rol")
+
     def __init__(self, email, nombre_usuario, password, id_rol):
         """
         Inicializa un objeto UsuarioEntity con los datos de un usuario.
@@ -1,6 +1,9 @@
 # Archivo: src/models/venta_entity.py
 
-class VentaEntity:
+from models.base_entity import BaseEntity
+
+
+class VentaEntity(BaseEntity):
     """
     Clase que representa una venta en la aplicación.
     Cada instancia corresponde a un registro en la tabla `ventas` de la base de datos.
@@ -8,12 +11,19 @@ class VentaEntity:
     Métodos disponibles:
     - _to_dict(): Convierte la instancia en un diccionario para facilitar la manipulación de datos.
     - _from_dict(data): Crea una instancia de VentaEntity a partir de un diccionario.
+    - from_rows(rows): Crea las instancias a partir de filas de un cursor (heredado de BaseEntity).
+    - _to_dicts(entities): Convierte varias instancias en diccionarios (heredado de BaseEntity).
     - __str__(): Representación legible para humanos.
     - __repr__(): Representación técnica detallada del objeto.
     - __eq__(): Compara dos ventas basándose en su atributo 'id_venta'.
     - __hash__(): Genera un hash único basado en 'id_venta'.
     """
 
+    __slots__ = ("_id_venta", "_codigo_producto", "_email_usuario", "_cantidad_vendida", "_fecha_venta")
+
+    # Campos en el orden de las columnas de la tabla (y de los parámetros de __init__)
+    FIELDS = ("id_venta", "codigo_producto", "email_usuario", "cantidad_vendida", "fecha_venta")
+
     def __init__(self, id_venta, codigo_producto, email_usuario, cantidad_vendida, fecha_venta):
         """
         Inicializa un objeto VentaEntity con los datos de una venta.
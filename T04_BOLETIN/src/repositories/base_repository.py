@@ -0,0 +1,242 @@
+"""
+* WEBGRAFÍA *
+
+- Row factories. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/advanced/rows.html
+
+- psycopg.rows.args_row / class_row. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/api/rows.html
+
+- Server-side cursors. (s. f.). Psycopg.org. de https://www.psycopg.org/psycopg3/docs/advanced/cursors.html#server-side-cursors
+
+- Identity Map. (s. f.). Martinfowler.com. de https://martinfowler.com/eaaCatalog/identityMap.html
+
+"""
+
+# Archivo: src/repositories/base_repository.py
+
+import threading
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Type, TypeVar
+from psycopg import sql  # Composición segura de consultas SQL
+from models.base_entity import BaseEntity
+from utils import utils_db
+
+EntityType = TypeVar("EntityType", bound=BaseEntity)
+
+
+class BaseRepository(Generic[EntityType]):
+    """
+    Acceso a una tabla devolviendo entidades en lugar de diccionarios.
+
+    Cada repositorio concreto indica su entidad (`ENTITY`), su tabla (`TABLE`), el campo clave
+    (`KEY_FIELD`) y, si algún campo de la entidad no se llama igual que su columna, la columna
+    de la que se lee (`COLUMNS`). La consulta pide las columnas en el orden de `ENTITY.FIELDS` y
+    la fábrica de filas del cursor crea cada entidad con esos valores como argumentos posicionales
+    (como `psycopg.rows.args_row`): ni se construye un diccionario por fila (como haría `dict_row`)
+    ni uno de argumentos con nombre (como haría `class_row`), ni se recorren después las filas para convertirlas.
+
+    Las entidades leídas se guardan en un mapa de identidad (clave -> entidad), de modo que
+    `get` y `get_many` solo consultan las claves que aún no se han cargado. Como `ResultCache`,
+    el mapa solo se usa mientras está habilitado: quien lo use debe vaciarlo con `invalidate`
+    cuando la tabla cambie (ver `ReportModel`, que lo conecta a `DbChangeListener`).
+
+    Es seguro para usarse desde varios hilos.
+    """
+
+    # Clase de las entidades que devuelve el repositorio
+    ENTITY: Type[BaseEntity] = BaseEntity
+
+    # Tabla de la que se leen las entidades
+    TABLE: str = ""
+
+    # Campo de la entidad que es la clave primaria de la tabla
+    KEY_FIELD: str = ""
+
+    # Columna de la que se lee cada campo cuando no coincide con su nombre (None selecciona NULL)
+    COLUMNS: Mapping[str, Optional[str]] = {}
+
+    def __init__(self, db_manager, enabled: bool = True, batch_size: int = utils_db.REPOSITORY_BATCH_SIZE_DB):
+        """
+        Inicializa el repositorio con el mapa de identidad vacío.
+
+        Parámetros:
+        - db_manager: Instancia de ManagerDB que proporciona las conexiones.
+        - enabled (bool): Si es False, el mapa de identidad queda deshabilitado hasta llamar a `set_enabled(True)`.
+        - batch_size (int): Número de claves por consulta en `get_many` y de filas por lote en `iter_all`.
+        """
+        self._db_manager = db_manager
+        self._batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._enabled = enabled
+        self._generation = 0  # Aumenta al vaciar el mapa, para descartar las cargas en curso
+        self._identity_map: Dict[Hashable, EntityType] = {}
+        self._key_position = self.ENTITY.FIELDS.index(self.KEY_FIELD)
+        self._select = sql.SQL("SELECT {columns} FROM {table}").format(
+            columns=sql.SQL(", ").join(self._select_column(field) for field in self.ENTITY.FIELDS),
+            table=sql.Identifier(self.TABLE)
+        )
+        self._key_column = sql.Identifier(self.COLUMNS.get(self.KEY_FIELD) or self.KEY_FIELD)
+    # __init__ (fin)
+
+    def get_all(self) -> List[EntityType]:
+        """
+        Devuelve todas las entidades de la tabla, ordenadas por su clave.
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta.
+        """
+        query = self._select + sql.SQL(" ORDER BY {key};").format(key=self._key_column)
+        return list(self._load(query).values())
+    # get_all (fin)
+
+    def get(self, key: Hashable) -> Optional[EntityType]:
+        """
+        Devuelve la entidad con una clave, o None si no existe.
+        """
+        entities = self.get_many([key])
+        return entities[0] if entities else None
+    # get (fin)
+
+    def get_many(self, keys: Iterable[Hashable]) -> List[EntityType]:
+        """
+        Devuelve las entidades con las claves indicadas, en el orden de `keys` (sin repetidas).
+
+        Las que ya están en el mapa de identidad se devuelven sin consultar la base de datos;
+        el resto se piden en lotes de `batch_size` claves con `WHERE clave = ANY(%(keys)s)`,
+        en lugar de una consulta por clave. Las claves que no existen se omiten.
+
+        Excepciones:
+        - psycopg.Error: Si falla alguna consulta.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: Dict[Hashable, EntityType] = {}
+        with self._lock:
+            if self._enabled:
+                identity_map = self._identity_map
+                found = {key: identity_map[key] for key in keys if key in identity_map}
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            query = self._select + sql.SQL(" WHERE {key} = ANY(%(keys)s);").format(key=self._key_column)
+            for start in range(0, len(missing), self._batch_size):
+                found.update(self._load(query, {"keys": missing[start:start + self._batch_size]}))
+        return [found[key] for key in keys if key in found]
+    # get_many (fin)
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[EntityType]:
+        """
+        Recorre todas las entidades de la tabla con un cursor del lado del servidor, de modo que
+        nunca hay más de `batch_size` filas en memoria.
+
+        Las entidades no se guardan en el mapa de identidad (serían todas las de la tabla).
+        La conexión permanece ocupada hasta que se termina de recorrer o se cierra el generador.
+
+        Excepciones:
+        - psycopg.Error: Si falla la consulta.
+        """
+        batch_size = max(1, batch_size or self._batch_size)
+        query = self._select + sql.SQL(" ORDER BY {key};").format(key=self._key_column)
+        # Un cursor con nombre es un cursor del lado del servidor (DECLARE ... CURSOR)
+        with self._db_manager.connection() as connection, \
+                connection.cursor(name=f"{self.TABLE}_repositorio", row_factory=self._row_factory(None)) as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query)
+            while True:
+                entities = cursor.fetchmany(batch_size)
+                if not entities:
+                    break
+                yield from entities
+    # iter_all (fin)
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Habilita o deshabilita el mapa de identidad. Al cambiar de estado se vacía.
+        """
+        with self._lock:
+            if self._enabled != enabled:
+                self._enabled = enabled
+                self._clear_locked()
+    # set_enabled (fin)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """
+        Vacía el mapa de identidad si ha cambiado su tabla (o si no se indica ninguna).
+        Tiene la firma de `ResultCache.invalidate` para poder conectarse a `DbChangeListener`.
+
+        Parámetros:
+        - table (str | None): Nombre de la tabla que ha cambiado (sin distinguir mayúsculas).
+        """
+        if table and table.lower() != self.TABLE.lower():
+            return
+        with self._lock:
+            self._clear_locked()
+    # invalidate (fin)
+
+    def __len__(self) -> int:
+        """
+        Número de entidades en el mapa de identidad.
+        """
+        return len(self._identity_map)
+    # __len__ (fin)
+
+    def _load(self, query: sql.Composable, params: Optional[Dict[str, Any]] = None) -> Dict[Hashable, EntityType]:
+        """
+        Ejecuta una consulta y devuelve sus entidades por clave (en el orden de las filas),
+        guardándolas en el mapa de identidad.
+
+        Las entidades se guardan de una vez al terminar la consulta y solo si el mapa no se ha
+        vaciado mientras tanto, para no guardar datos leídos antes de un cambio.
+        """
+        with self._lock:
+            generation = self._generation
+
+        loaded: Dict[Hashable, EntityType] = {}
+        with self._db_manager.connection() as connection, \
+                connection.cursor(row_factory=self._row_factory(loaded)) as cursor:
+            cursor.execute(query, params, prepare=True)
+            cursor.fetchall()
+
+        with self._lock:
+            if self._enabled and self._generation == generation:
+                self._identity_map.update(loaded)
+        return loaded
+    # _load (fin)
+
+    def _row_factory(self, loaded: Optional[Dict[Hashable, EntityType]]) -> Callable:
+        """
+        Devuelve la fábrica de filas del cursor, que crea cada entidad con los valores de la fila.
+
+        Parámetros:
+        - loaded (dict | None): Diccionario donde se guarda cada entidad creada por su clave, o None.
+        """
+        entity_class = self.ENTITY
+        key_position = self._key_position
+
+        def factory(cursor) -> Callable[[Sequence[Any]], EntityType]:
+            if loaded is None:
+                return lambda values: entity_class(*values)
+
+            def make_row(values: Sequence[Any]) -> EntityType:
+                entity = loaded[values[key_position]] = entity_class(*values)
+                return entity
+            return make_row
+        return factory
+    # _row_factory (fin)
+
+    def _select_column(self, field: str) -> sql.Composable:
+        """
+        Devuelve la expresión del SELECT para un campo de la entidad.
+        """
+        if field not in self.COLUMNS:
+            return sql.Identifier(field)
+        column = self.COLUMNS[field]
+        source = sql.SQL("NULL") if column is None else sql.Identifier(column)
+        return sql.SQL("{source} AS {field}").format(source=source, field=sql.Identifier(field))
+    # _select_column (fin)
+
+    def _clear_locked(self) -> None:
+        """
+        Vacía el mapa de identidad y descarta las cargas en curso. Requiere tener el cerrojo.
+        """
+        self._identity_map.clear()
+        self._generation += 1
+    # _clear_locked (fin)
+# BaseRepository (fin)
@@ -0,0 +1,16 @@
+# Archivo: src/repositories/categoria_repository.py
+
+from models.categoria_entity import CategoriaEntity
+from repositories.base_repository import BaseRepository
+from utils import utils_db
+
+
+class CategoriaRepository(BaseRepository[CategoriaEntity]):
+    """
+    Repositorio de categorías: devuelve instancias de `CategoriaEntity` (ver `BaseRepository`).
+    """
+
+    ENTITY = CategoriaEntity
+    TABLE = utils_db.EnumTablasDB.CATEGORIAS.value
+    KEY_FIELD = "id_categoria"
+# CategoriaRepository (fin)
@@ -0,0 +1,18 @@
+# Archivo: src/repositories/producto_repository.py
+
+from models.producto_entity import ProductoEntity
+from repositories.base_repository import BaseRepository
+from utils import utils_db
+
+
+class ProductoRepository(BaseRepository[ProductoEntity]):
+    """
+    Repositorio de productos: devuelve instancias de `ProductoEntity` (ver `BaseRepository`).
+
+    Las migraciones actuales aún no crean la tabla `productos`; las consultas fallarán hasta que exista.
+    """
+
+    ENTITY = ProductoEntity
+    TABLE = utils_db.PRODUCTOS_TABLE_DB
+    KEY_FIELD = "codigo"
+# ProductoRepository (fin)
@@ -0,0 +1,17 @@
+# Archivo: src/repositories/tarea_repository.py
+
+from models.tarea_entity import TareaEntity
+from repositories.base_repository import BaseRepository
+from utils import utils_db
+
+
+class TareaRepository(BaseRepository[TareaEntity]):
+    """
+    Repositorio de tareas: devuelve instancias de `TareaEntity` (ver `BaseRepository`).
+    """
+
+    ENTITY = TareaEntity
+    TABLE = utils_db.EnumTablasDB.TAREAS.value
+    KEY_FIELD = "nombre"
+    COLUMNS = {"descripcion": "description", "email_usuario": "idusuario"}
+# TareaRepository (fin)
@@ -0,0 +1,19 @@
+# Archivo: src/repositories/usuario_repository.py
+
+from models.usuario_entity import UsuarioEntity
+from repositories.base_repository import BaseRepository
+from utils import utils_db
+
+
+class UsuarioRepository(BaseRepository[UsuarioEntity]):
+    """
+    Repositorio de usuarios: devuelve instancias de `UsuarioEntity` (ver `BaseRepository`).
+
+    La tabla `usuarios` no tiene la columna `id_rol` de la entidad, por lo que se lee como NULL.
+    """
+
+    ENTITY = UsuarioEntity
+    TABLE = utils_db.EnumTablasDB.USUARIOS.value
+    KEY_FIELD = "email"
+    COLUMNS = {"id_rol": None}
+# UsuarioRepository (fin)
@@ -0,0 +1,18 @@
+# Archivo: src/repositories/venta_repository.py
+
+from models.venta_entity import VentaEntity
+from repositories.base_repository import BaseRepository
+from utils import utils_db
+
+
+class VentaRepository(BaseRepository[VentaEntity]):
+    """
+    Repositorio de ventas: devuelve instancias de `VentaEntity` (ver `BaseRepository`).
+
+    Las migraciones actuales aún no crean la tabla `ventas`; las consultas fallarán hasta que exista.
+    """
+
+    ENTITY = VentaEntity
+    TABLE = utils_db.VENTAS_TABLE_DB
+    KEY_FIELD = "id_venta"
+# VentaRepository (fin)
@@ -0,0 +1,225 @@
+"""
+* WEBGRAFÍA *
+
+- Steinarsson, S. (2013). Downsampling Time Series for Visual Representation (Largest-Triangle-Three-Buckets). de https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf
+
+- date.isocalendar. (s. f.). Python documentation. de https://docs.python.org/3/library/datetime.html#datetime.date.isocalendar
+
+- heapq.nlargest. (s. f.). Python documentation. de https://docs.python.org/3/library/heapq.html#heapq.nlargest
+
+"""
+
+# Archivo: src/utils/utils_chart.py
+#
+# Reducción de los datos de los gráficos antes de dibujarlos.
+#
+# Los datos de un gráfico de barras tienen el formato de `EnumEjes`:
+#   {"eje_x": [categorías], "barritas_datos": {nombre del conjunto: [valor por categoría]}}
+# `reduce_chart_data` devuelve datos con el mismo formato y, como mucho, `max_points` categorías,
+# de modo que el coste de dibujar el gráfico no depende del tamaño de los datos de entrada:
+# - Categorías sin orden (productos, usuarios...): las `max_points - 1` con mayor total y un
+#   grupo "Otros" con la suma del resto.
+# - Fechas: agrupadas por día, semana, mes o año (la unidad más pequeña que no supera el límite).
+# - Valores numéricos ordenados: muestreo LTTB, que conserva la forma de la serie.
+
+import heapq
+from datetime import date
+from numbers import Number
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from utils.utils_db import EnumEjes, CHART_MAX_POINTS, CHART_OTHER_LABEL
+
+# Modos de reducción de `reduce_chart_data`
+MODE_AUTO = "auto"
+MODE_TOP_N = "top_n"
+MODE_TIME = "time"
+MODE_LTTB = "lttb"
+
+# Unidades de agrupación de fechas, de la más pequeña a la más grande: (nombre, clave, etiqueta)
+TIME_UNITS: List[Tuple[str, Callable[[date], Tuple[int, ...]], Callable[[Tuple[int, ...]], str]]] = [
+    ("día", lambda value: (value.year, value.month, value.day), lambda key: "%04d-%02d-%02d" % key),
+    ("semana", lambda value: tuple(value.isocalendar())[:2], lambda key: "%04d-S%02d" % key),
+    ("mes", lambda value: (value.year, value.month), lambda key: "%04d-%02d" % key),
+    ("año", lambda value: (value.year,), lambda key: "%04d" % key),
+]
+
+
+def reduce_chart_data(data: Dict[str, Any], max_points: int = CHART_MAX_POINTS, mode: str = MODE_AUTO) -> Dict[str, Any]:
+    """
+    Reduce los datos de un gráfico a un máximo de `max_points` categorías en el eje X.
+
+    Parámetros:
+    - data (dict): Datos del gráfico con el formato de `EnumEjes`.
+    - max_points (int): Número máximo de categorías del resultado (al menos 2).
+    - mode (str): `MODE_TOP_N`, `MODE_TIME`, `MODE_LTTB` o `MODE_AUTO` (elige según el tipo de
+      las categorías: fechas -> agrupación temporal, números -> LTTB, el resto -> top-N).
+
+    Retorno:
+    - dict: Datos con el mismo formato. Si ya no superaban el límite, se devuelven sin cambios.
+
+    Excepciones:
+    - ValueError: Si el modo no es válido.
+    """
+    eje_x: Sequence[Any] = data.get(EnumEjes.EJE_X.value, [])
+    barritas_datos: Dict[str, Sequence[float]] = data.get(EnumEjes.EJE_Y.value, {})
+    max_points = max(2, max_points)
+    if len(eje_x) <= max_points or not barritas_datos:
+        return data
+
+    if mode == MODE_AUTO:
+        if all(isinstance(value, date) for value in eje_x):
+            mode = MODE_TIME
+        elif all(isinstance(value, Number) for value in eje_x):
+            mode = MODE_LTTB
+        else:
+            mode = MODE_TOP_N
+
+    if mode == MODE_TOP_N:
+        eje_x, barritas_datos = top_n(eje_x, barritas_datos, max_points - 1)
+    elif mode == MODE_TIME:
+        eje_x, barritas_datos = time_buckets(eje_x, barritas_datos, max_points)
+        if len(eje_x) > max_points:
+            eje_x, barritas_datos = _take(eje_x, barritas_datos, lttb(range(len(eje_x)), _totals(barritas_datos), max_points))
+    elif mode == MODE_LTTB:
+        x_values = eje_x if all(isinstance(value, Number) for value in eje_x) else range(len(eje_x))
+        eje_x, barritas_datos = _take(eje_x, barritas_datos, lttb(x_values, _totals(barritas_datos), max_points))
+    else:
+        raise ValueError(f"Modo de reducción no válido: {mode}")
+
+    return {EnumEjes.EJE_X.value: list(eje_x), EnumEjes.EJE_Y.value: barritas_datos}
+# reduce_chart_data (fin)
+
+
+def top_n(
+    eje_x: Sequence[Any],
+    barritas_datos: Dict[str, Sequence[float]],
+    n: int,
+    other_label: str = CHART_OTHER_LABEL
+) -> Tuple[List[Any], Dict[str, List[float]]]:
+    """
+    Conserva las `n` categorías con mayor total (suma de todos los conjuntos), en su orden
+    original, y añade una categoría `other_label` con la suma del resto en cada conjunto.
+
+    Retorno:
+    - tuple: (categorías, valores de cada conjunto).
+    """
+    totals = _totals(barritas_datos)
+    kept = sorted(heapq.nlargest(n, range(len(eje_x)), key=totals.__getitem__))
+    if len(kept) == len(eje_x):
+        return list(eje_x), {name: list(values) for name, values in barritas_datos.items()}
+
+    new_x, new_sets = _take(eje_x, barritas_datos, kept)
+    new_x.append(other_label)
+    for name, values in barritas_datos.items():
+        new_sets[name].append(sum(values) - sum(new_sets[name]))
+    return new_x, new_sets
+# top_n (fin)
+
+
+def time_buckets(
+    eje_x: Sequence[date],
+    barritas_datos: Dict[str, Sequence[float]],
+    max_buckets: int
+) -> Tuple[List[str], Dict[str, List[float]]]:
+    """
+    Agrupa las fechas por la unidad más pequeña (día, semana, mes o año) que no genera más de
+    `max_buckets` grupos y suma los valores de cada grupo. Los grupos se ordenan por fecha.
+
+    Si ni siquiera por años se llega al límite, se devuelven los grupos por año (más de
+    `max_buckets`); `reduce_chart_data` los muestrea después con LTTB.
+
+    Retorno:
+    - tuple: (etiquetas de los grupos, valores de cada conjunto).
+    """
+    for _, key_of, label_of in TIME_UNITS:
+        keys = [key_of(value) for value in eje_x]
+        if len(set(keys)) <= max_buckets:
+            break
+
+    positions = {key: position for position, key in enumerate(sorted(set(keys)))}
+    new_sets = {name: [0] * len(positions) for name in barritas_datos}
+    for name, values in barritas_datos.items():
+        bucket_values = new_sets[name]
+        for key, value in zip(keys, values):
+            bucket_values[positions[key]] += value
+    return [label_of(key) for key in positions], new_sets
+# time_buckets (fin)
+
+
+def lttb(x_values: Sequence[float], y_values: Sequence[float], threshold: int) -> List[int]:
+    """
+    Elige `threshold` puntos de una serie con el algoritmo Largest-Triangle-Three-Buckets.
+
+    El primer y el último punto se conservan siempre; el resto de la serie se divide en
+    `threshold - 2` tramos y de cada uno se elige el punto que forma el triángulo de mayor área
+    con el punto elegido en el tramo anterior y la media del tramo siguiente. Así se conservan
+    los picos y valles que definen la forma de la serie.
+
+    Parámetros:
+    - x_values (sequence[float]): Posiciones de los puntos, en orden creciente.
+    - y_values (sequence[float]): Valores de los puntos.
+    - threshold (int): Número de puntos a conservar.
+
+    Retorno:
+    - list[int]: Índices de los puntos elegidos, en orden creciente.
+    """
+    length = len(y_values)
+    if threshold >= length:
+        return list(range(length))
+    if threshold < 3:
+        return [0, length - 1][:max(threshold, 0)]
+
+    x_values = list(x_values)
+    selected = [0]
+    bucket_size = (length - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Media del tramo siguiente (el último tramo usa el último punto)
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        if next_start >= length - 1:
+            next_start, next_end = length - 1, length
+        count = next_end - next_start
+        average_x = sum(x_values[next_start:next_end]) / count
+        average_y = sum(y_values[next_start:next_end]) / count
+
+        point_x, point_y = x_values[previous], y_values[previous]
+        best_index, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs(
+                (point_x - average_x) * (y_values[index] - point_y)
+                - (point_x - x_values[index]) * (average_y - point_y)
+            )
+            if area > best_area:
+                best_index, best_area = index, area
+        selected.append(best_index)
+        previous = best_index
+
+    selected.append(length - 1)
+    return selected
+# lttb (fin)
+
+
+def _totals(barritas_datos: Dict[str, Sequence[float]]) -> List[float]:
+    """
+    Devuelve la suma de todos los conjuntos para cada categoría.
+    """
+    return [sum(values) for values in zip(*barritas_datos.values())]
+# _totals (fin)
+
+
+def _take(
+    eje_x: Sequence[Any],
+    barritas_datos: Dict[str, Sequence[float]],
+    indices: Sequence[int]
+) -> Tuple[List[Any], Dict[str, List[float]]]:
+    """
+    Devuelve las categorías y valores de las posiciones indicadas.
+    """
+    return (
+        [eje_x[index] for index in indices],
+        {name: [values[index] for index in indices] for name, values in barritas_datos.items()}
+    )
+# _take (fin)
@@ -45,6 +45,108 @@ PORT_DB = 60000
 # Esto ayuda a identificar claramente la conexión en aplicaciones más complejas.
 CONNECTION_NAME = NAME_DB
 
+# USE_POOL_DB indica si la aplicación trabaja con un pool de conexiones (psycopg_pool)
+# en lugar de una única conexión compartida por todos los modelos.
+USE_POOL_DB = True
+
+# POOL_MIN_SIZE_DB y POOL_MAX_SIZE_DB definen el número mínimo de conexiones que el pool
+# mantiene abiertas y el máximo que puede llegar a abrir en momentos de carga.
+POOL_MIN_SIZE_DB = 1
+POOL_MAX_SIZE_DB = 5
+
+# POOL_TIMEOUT_DB es el tiempo máximo (en segundos) que se espera a obtener una conexión libre del pool.
+POOL_TIMEOUT_DB = 10.0
+
+# POOL_MAX_IDLE_DB es el tiempo (en segundos) que una conexión sobrante puede permanecer inactiva
+# antes de que el pool la cierre para liberar recursos en el servidor.
+POOL_MAX_IDLE_DB = 300.0
+
+# PREPARE_THRESHOLD_DB es el número de veces que psycopg ejecuta una misma consulta antes de
+# prepararla en el servidor (PREPARE), de modo que PostgreSQL no vuelve a analizarla y planificarla
+# en cada ejecución. Las consultas de ReportModel se preparan desde la primera ejecución.
+PREPARE_THRESHOLD_DB = 5
+
+# SEARCH_LIMIT_DB es el número máximo de resultados que devuelve el buscador de tareas,
+# ordenados por relevancia (las sugerencias del cuadro de búsqueda).
+SEARCH_LIMIT_DB = 10
+
+# SEARCH_MIN_LENGTH_DB es el número mínimo de caracteres del texto a partir del cual se piden
+# sugerencias al buscador. Con menos caracteres los índices de trigramas apenas filtran.
+SEARCH_MIN_LENGTH_DB = 3
+
+# PAGE_SIZE_DB es el número de filas que se piden a la base de datos en cada página
+# cuando la tabla del informe se carga de forma paginada (paginación por clave / keyset).
+PAGE_SIZE_DB = 200
+
+# USE_IN_MEMORY_DATASET_DB indica si el informe carga las tareas una sola vez en un conjunto de datos
+# por columnas y filtra y agrega en memoria. Solo se usa mientras la caché de resultados está
+# habilitada (es decir, mientras se reciben las notificaciones de cambios); si no, el filtrado y
+# los totales se piden a PostgreSQL y la tabla se carga por páginas.
+USE_IN_MEMORY_DATASET_DB = True
+
+# DATASET_MAX_ROWS_DB es el número máximo de tareas que se cargan en memoria. Si la tabla tiene más,
+# se usa el filtrado en PostgreSQL con paginación.
+DATASET_MAX_ROWS_DB = 200000
+
+# PAGE_CACHE_MAX_PAGES_DB es el número máximo de páginas que la tabla mantiene en memoria.
+# Las páginas menos usadas se descartan y se vuelven a pedir si el usuario regresa a ellas.
+PAGE_CACHE_MAX_PAGES_DB = 20
+
+# EXPORT_BATCH_SIZE_DB es el número de filas que se leen en cada lote del cursor del lado
+# del servidor al exportar el informe, de modo que nunca se cargan todas las tareas en memoria.
+EXPORT_BATCH_SIZE_DB = 1000
+
+# BULK_BATCH_SIZE_DB es el número de filas que la carga masiva (COPY) envía entre dos avisos de progreso.
+BULK_BATCH_SIZE_DB = 10000
+
+# USE_RESULT_CACHE_DB indica si ReportModel guarda en memoria los resultados de sus consultas.
+# La caché solo se usa mientras se reciben las notificaciones de cambios de PostgreSQL
+# (LISTEN/NOTIFY), de modo que nunca entrega datos obsoletos.
+USE_RESULT_CACHE_DB = True
+
+# RESULT_CACHE_MAX_ENTRIES_DB es el número máximo de resultados guardados; al superarlo
+# se descartan los usados hace más tiempo.
+RESULT_CACHE_MAX_ENTRIES_DB = 256
+
+# RESULT_CACHE_TTL_DB es el tiempo (en segundos) que un resultado guardado se considera válido,
+# como límite adicional por si se perdiera alguna notificación.
+RESULT_CACHE_TTL_DB = 300.0
+
+# NOTIFY_CHANNEL_DB es el canal por el que los triggers de la migración '0003_notificaciones_cambios.sql'
+# avisan de los cambios en las tablas del informe. Debe coincidir con el usado en ese script.
+NOTIFY_CHANNEL_DB = "report_cambios"
+
+# NOTIFY_RETRY_INTERVAL_DB es el tiempo (en segundos) entre reintentos de conexión del escuchador
+# de notificaciones y el intervalo con el que comprueba si debe detenerse.
+NOTIFY_RETRY_INTERVAL_DB = 5.0
+
+# SLOW_QUERY_THRESHOLD_DB es el tiempo (en segundos) a partir del cual una consulta de ReportModel
+# se considera lenta y se registra como aviso en el log.
+SLOW_QUERY_THRESHOLD_DB = 0.5
+
+# QUERY_STATS_WINDOW_DB es el número de ejecuciones recientes de cada consulta con las que se
+# calculan sus percentiles de duración.
+QUERY_STATS_WINDOW_DB = 500
+
+# SLOW_QUERY_LOG_SIZE_DB es el número de consultas lentas recientes que se conservan en memoria.
+SLOW_QUERY_LOG_SIZE_DB = 50
+
+# EXPLAIN_SLOW_QUERIES_DB indica si se captura el plan de ejecución (EXPLAIN ANALYZE, BUFFERS) de las
+# consultas lentas. EXPLAIN ANALYZE vuelve a ejecutar la consulta, por lo que está desactivado por defecto.
+EXPLAIN_SLOW_QUERIES_DB = False
+
+# REPOSITORY_BATCH_SIZE_DB es el número de claves que los repositorios piden en cada consulta de
+# `get_many` y el número de filas de cada lote al recorrer una tabla completa con `iter_all`.
+REPOSITORY_BATCH_SIZE_DB = 1000
+
+# VENTAS_TABLE_DB y PRODUCTOS_TABLE_DB son las tablas de los repositorios de ventas y productos.
+# No forman parte de `EnumTablasDB` porque las migraciones actuales todavía no las crean.
+VENTAS_TABLE_DB = "ventas"
+PRODUCTOS_TABLE_DB = "productos"
+
+# SCHEMA_VERSION_TABLE_DB es la tabla donde el motor de migraciones registra las versiones aplicadas.
+SCHEMA_VERSION_TABLE_DB = "schema_version"
+
 # Definimos un enumerado para los nombres de las tablas de la base de datos.
 # Esto centraliza y organiza los nombres de las tablas, reduciendo la posibilidad de errores tipográficos.
 class EnumTablasDB(Enum):
@@ -52,6 +154,9 @@ class EnumTablasDB(Enum):
     CATEGORIAS = "categorias"
     TAREAS = "tareas"
 
+# Valor del selector de categorías que indica que no se filtra por categoría.
+CATEGORIA_TODAS = "Todas"
+
 class EnumDataMode(Enum):
     TABLA = "table"
     GRAFICA = "chart"
@@ -59,3 +164,25 @@ class EnumDataMode(Enum):
 class EnumEjes(Enum):
     EJE_X = "eje_x"
     EJE_Y = "barritas_datos"
+
+# Definimos un enumerado para las claves por las que se reparten los informes en varios documentos
+# (un informe por usuario o por categoría).
+class EnumParticion(Enum):
+    USUARIO = "usuario"
+    CATEGORIA = "categoria"
+
+# FANOUT_MAX_DB_CONNECTIONS_DB es el número máximo de conexiones a la base de datos que abre la generación
+# de informes por partición (un informe por usuario o categoría), sea cual sea el número de procesos.
+FANOUT_MAX_DB_CONNECTIONS_DB = 2
+
+# FANOUT_MAX_PENDING_DB es el número máximo de particiones leídas y pendientes de dibujar por cada proceso.
+# Limita la memoria del proceso principal: si los procesos van más lentos que la consulta, se deja de leer.
+FANOUT_MAX_PENDING_DB = 2
+
+# CHART_MAX_POINTS es el número máximo de categorías (barras por conjunto) que se dibujan en un gráfico.
+# Si los datos tienen más, `utils_chart.reduce_chart_data` los reduce (top-N, agrupación por fechas o LTTB),
+# de modo que el coste de dibujar el gráfico está acotado sea cual sea el tamaño de los datos.
+CHART_MAX_POINTS = 50
+
+# CHART_OTHER_LABEL es la categoría que agrupa las que quedan fuera del top-N.
+CHART_OTHER_LABEL = "Otros"
@@ -0,0 +1,158 @@
+"""
+* WEBGRAFÍA *
+
+- logging.handlers.QueueHandler / QueueListener. (s. f.). Python documentation. de https://docs.python.org/3/library/logging.handlers.html#queuehandler
+
+- Logging Cookbook: Dealing with handlers that block. (s. f.). Python documentation. de https://docs.python.org/3/howto/logging-cookbook.html#dealing-with-handlers-that-block
+
+- Optimization (isEnabledFor). (s. f.). Python documentation. de https://docs.python.org/3/howto/logging.html#optimization
+
+"""
+
+# Archivo: src/utils/utils_logging.py
+#
+# Registro de mensajes de la aplicación con niveles.
+#
+# Los módulos obtienen su logger con `get_logger(__name__)` y registran los mensajes con
+# formato diferido (`logger.debug("Filas: %s", filas)`), de modo que un mensaje de un nivel
+# desactivado no llega a construirse. Los loggers solo encolan los registros; la escritura
+# (consola o archivo) la hace un hilo propio (`QueueListener`), por lo que registrar un
+# mensaje nunca bloquea el hilo de la interfaz.
+#
+# Configuración mediante variables de entorno:
+# - T04_LOG_LEVEL: Nivel mínimo (DEBUG, INFO, WARNING, ERROR). Por defecto, INFO.
+# - T04_LOG_JSON: Si vale 1, cada registro se escribe como una línea JSON.
+# - T04_LOG_FILE: Archivo donde escribir los registros, además de la consola.
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+# Nombre del logger raíz de la aplicación (los de cada módulo cuelgan de él)
+LOGGER_NAME = "t04"
+
+# Variables de entorno de configuración
+LOG_LEVEL_ENV = "T04_LOG_LEVEL"
+LOG_JSON_ENV = "T04_LOG_JSON"
+LOG_FILE_ENV = "T04_LOG_FILE"
+
+# Nivel por defecto si no se indica otro
+DEFAULT_LOG_LEVEL = logging.INFO
+
+# Formato de texto de los registros
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formateador que convierte cada registro en una línea JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Devuelve el registro como un objeto JSON en una sola línea.
+        """
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+    # format (fin)
+# JsonFormatter (fin)
+
+
+def setup_logging(
+    level: Optional[Union[int, str]] = None,
+    json_output: Optional[bool] = None,
+    log_file: Optional[str] = None
+) -> None:
+    """
+    Configura el registro de la aplicación. Solo tiene efecto la primera vez que se llama.
+
+    Los parámetros que se dejan en None se leen de las variables de entorno.
+
+    Parámetros:
+    - level (int | str | None): Nivel mínimo de los mensajes (por ejemplo, logging.DEBUG o "DEBUG").
+    - json_output (bool | None): Si es True, los registros se escriben en formato JSON.
+    - log_file (str | None): Archivo donde escribir los registros, además de la consola.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        if level is None:
+            level = os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL)
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                level = DEFAULT_LOG_LEVEL
+        if json_output is None:
+            json_output = os.environ.get(LOG_JSON_ENV) == "1"
+        if log_file is None:
+            log_file = os.environ.get(LOG_FILE_ENV) or None
+
+        formatter = JsonFormatter() if json_output else logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler()]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        # La cola no tiene límite, así que encolar un registro nunca espera
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(level)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+# setup_logging (fin)
+
+
+def shutdown_logging() -> None:
+    """
+    Escribe los registros pendientes y detiene el hilo de escritura.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+        for handler in list(logging.getLogger(LOGGER_NAME).handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logging.getLogger(LOGGER_NAME).removeHandler(handler)
+# shutdown_logging (fin)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Devuelve el logger de un módulo de la aplicación.
+
+    Parámetros:
+    - name (str): Nombre del módulo (normalmente `__name__`).
+
+    Retorno:
+    - logging.Logger: Logger hijo del logger raíz de la aplicación.
+    """
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+# get_logger (fin)
@@ -19,9 +19,9 @@ SEARCH_ICON_PATH = os.path.join(ICON_DIR, "search_icon.png")
 TRASH_ICON_PATH = os.path.join(ICON_DIR, "trash_icon.png")
 PDF_ICON_PATH = os.path.join(ICON_DIR, "pdf.png")
 
-# Ruta absoluta del archivo SQL para inicializar la base de datos.
-# Usamos BASE_DIR como punto de partida para facilitar la gestión de rutas si es necesario hacer cambios.
-PATH_INICIALIZACION_DB = os.path.join(MODELS_DIR, "inicializacion_db.sql")
+# Carpeta con las migraciones del esquema de la base de datos ('NNNN_descripcion.sql').
+# El motor de migraciones aplica en orden las que aún no constan en la tabla 'schema_version'.
+MIGRATIONS_DIR = os.path.join(MODELS_DIR, "migrations")
 
 # Ruta absoluta del archivo SQL para eliminar o limpiar la base de datos.
 # Esta ruta nos permitirá acceder fácilmente al archivo desde cualquier parte del proyecto.
@@ -31,6 +31,6 @@ PATH_DELETE_DB = os.path.join(MODELS_DIR, "delete_db.sql")
 # Este bloque imprimirá las rutas generadas, lo cual es útil para verificar que los paths son correctos.
 if __name__ == '__main__':
     print(f"\nBASE_DIR: {BASE_DIR}\n")
-    print(f"\nPATH_INICIALIZACION_DB: {PATH_INICIALIZACION_DB}\n")
+    print(f"\nMIGRATIONS_DIR: {MIGRATIONS_DIR}\n")
     print(f"\nPATH_DELETE_DB: {PATH_DELETE_DB}\n")
     print(f"\SEARCH_ICON_PATH: {SEARCH_ICON_PATH}\n")
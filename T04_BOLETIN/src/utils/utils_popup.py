@@ -1,8 +1,12 @@
 # Archivo: src/utils/utils_popup.py
 
+import logging
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton
 from PySide6.QtCore import Qt, QPoint, QTimer, Slot
 import utils.utils_estilos as estilos
+from utils.utils_logging import get_logger
+
+_logger = get_logger(__name__)
 
 
 class PopupManager:
@@ -203,22 +207,24 @@ class Popup(QWidget):
 # Popup
 
 
-def _printv2(show_popup=False, parent=None, message="", duration=6000, style=estilos.ESTILO_01_POPUP):
+def _printv2(show_popup=False, parent=None, message="", duration=6000, style=estilos.ESTILO_01_POPUP, level=logging.INFO):
     """
     Centraliza el manejo de mensajes emergentes y depuración.
 
-    Este método imprime el mensaje en consola para depuración y muestra un popup
-    con el mensaje proporcionado si `show_popup` está habilitado.
+    Este método registra el mensaje con el nivel indicado (ver `utils.utils_logging`) y muestra
+    un popup con el mensaje proporcionado si `show_popup` está habilitado.
 
     Parámetros:
-    - show_popup (bool): Si es True, muestra un popup además de imprimir el mensaje.
+    - show_popup (bool): Si es True, muestra un popup además de registrar el mensaje.
     - parent (QWidget | None): Widget padre opcional para asociar el popup.
-    - message (str): Mensaje a mostrar en consola y popup. Puede estar vacío.
+    - message (str): Mensaje a mostrar en el registro y el popup. Puede estar vacío.
     - duration (int): Duración en milisegundos antes de que el popup se cierre automáticamente (por defecto: 6000).
     - style (str): Estilo CSS para aplicar al popup (por defecto: `estilos.ESTILO_01_POPUP`).
+    - level (int): Nivel del mensaje en el registro (por defecto: logging.INFO).
     """
-    # Imprimir el mensaje en consola
-    print(f"[DEBUG] {message}")
+    # Registrar el mensaje (se descarta sin coste si el nivel está desactivado)
+    if _logger.isEnabledFor(level):
+        _logger.log(level, "%s", message)
 
     # Mostrar el popup solo si show_popup está habilitado
     if show_popup:
@@ -229,6 +235,6 @@ def _printv2(show_popup=False, parent=None, message="", duration=6000, style=est
                 duration=duration,
                 style=style
             )
-        except Exception as e:
-            print(f"[ERROR] Error al mostrar el popup: {e}")
+        except Exception:
+            _logger.exception("Error al mostrar el popup")
 # _printv2 (fin)
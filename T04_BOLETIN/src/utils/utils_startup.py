@@ -0,0 +1,208 @@
+"""
+* WEBGRAFÍA *
+
+- -X importtime. (s. f.). Python documentation. de https://docs.python.org/3/using/cmdline.html#cmdoption-X
+
+- importlib.abc.MetaPathFinder. (s. f.). Python documentation. de https://docs.python.org/3/library/importlib.html#importlib.abc.MetaPathFinder
+
+- time.perf_counter. (s. f.). Python documentation. de https://docs.python.org/3/library/time.html#time.perf_counter
+
+"""
+
+# Archivo: src/utils/utils_startup.py
+#
+# Medición del tiempo de arranque de la aplicación.
+#
+# Este módulo no debe importar nada pesado (ni PySide6, ni psycopg, ni reportlab), ya que se
+# importa el primero para poder medir al resto.
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Variable de entorno que activa la medición de las importaciones (similar a `python -X importtime`)
+STARTUP_PROFILE_ENV = "T04_STARTUP_PROFILE"
+
+# Número de módulos más lentos que se muestran en el resumen de importaciones
+IMPORT_REPORT_TOP = 15
+
+
+class _TimedLoader:
+    """
+    Envoltorio de un cargador de módulos que mide cuánto tarda en ejecutarse el módulo.
+    """
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        """
+        Parámetros:
+        - loader: Cargador original del módulo.
+        - profiler (StartupProfiler): Medidor donde se registra el tiempo.
+        """
+        self._loader = loader
+        self._profiler = profiler
+    # __init__ (fin)
+
+    def __getattr__(self, name):
+        """
+        Delega el resto de atributos (recursos, código fuente, etc.) en el cargador original.
+        """
+        return getattr(self._loader, name)
+    # __getattr__ (fin)
+
+    def create_module(self, spec):
+        """
+        Crea el módulo con el cargador original.
+        """
+        return self._loader.create_module(spec)
+    # create_module (fin)
+
+    def exec_module(self, module):
+        """
+        Ejecuta el módulo con el cargador original y registra cuánto ha tardado.
+        """
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._record_import(module.__name__, time.perf_counter() - start)
+    # exec_module (fin)
+# _TimedLoader (fin)
+
+
+class _TimedFinder:
+    """
+    Buscador de módulos que delega en los demás y envuelve su cargador con `_TimedLoader`.
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        """
+        Parámetros:
+        - profiler (StartupProfiler): Medidor donde se registran los tiempos.
+        """
+        self._profiler = profiler
+        self._local = threading.local()
+    # __init__ (fin)
+
+    def find_spec(self, fullname, path=None, target=None):
+        """
+        Busca el módulo con el resto de buscadores y envuelve su cargador para medirlo.
+        """
+        # Evita la recursión: mientras se busca el módulo con los demás buscadores, este se ignora
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self._profiler)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+    # find_spec (fin)
+# _TimedFinder (fin)
+
+
+class StartupProfiler:
+    """
+    Registra la duración de las fases del arranque y, opcionalmente, de cada importación.
+
+    Las fases se miden con `phase()` (o `mark()` para un instante concreto) y el resumen se
+    imprime con `report()`. Si la variable de entorno `T04_STARTUP_PROFILE` vale 1, también se
+    mide el tiempo de ejecución de cada módulo importado (incluyendo sus propias importaciones,
+    como la columna "cumulative" de `python -X importtime`).
+    """
+
+    def __init__(self):
+        """
+        Inicializa el medidor, tomando como origen el instante en que se importa este módulo.
+        """
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: List[Tuple[str, float, float]] = []  # (fase, inicio, duración) en segundos
+        self._imports: Dict[str, float] = {}  # Módulo -> segundos
+        self._finder: Optional[_TimedFinder] = None
+    # __init__ (fin)
+
+    def enable_import_timing(self, enabled: Optional[bool] = None) -> None:
+        """
+        Activa la medición de importaciones.
+
+        Parámetros:
+        - enabled (bool | None): Si es None, se activa según la variable de entorno `T04_STARTUP_PROFILE`.
+        """
+        if enabled is None:
+            enabled = os.environ.get(STARTUP_PROFILE_ENV) == "1"
+        if enabled and self._finder is None:
+            self._finder = _TimedFinder(self)
+            sys.meta_path.insert(0, self._finder)
+    # enable_import_timing (fin)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Mide la duración del bloque como una fase del arranque.
+
+        Parámetros:
+        - name (str): Nombre de la fase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._phases.append((name, start - self._origin, end - start))
+    # phase (fin)
+
+    def mark(self, name: str) -> None:
+        """
+        Registra un instante del arranque (por ejemplo, "ventana visible") como una fase sin duración.
+
+        Parámetros:
+        - name (str): Nombre del instante.
+        """
+        with self._lock:
+            self._phases.append((name, time.perf_counter() - self._origin, 0.0))
+    # mark (fin)
+
+    def report(self) -> str:
+        """
+        Devuelve el resumen de las fases (y de las importaciones más lentas, si se han medido).
+
+        Retorno:
+        - str: Texto del resumen, una línea por fase.
+        """
+        with self._lock:
+            phases = sorted(self._phases, key=lambda phase: phase[1])
+            imports = sorted(self._imports.items(), key=lambda item: item[1], reverse=True)[:IMPORT_REPORT_TOP]
+
+        lines = ["Tiempos de arranque (desde el inicio | duración):"]
+        for name, start, duration in phases:
+            lines.append(f"  {start * 1000:9.1f} ms | {duration * 1000:9.1f} ms  {name}")
+        if imports:
+            lines.append(f"Importaciones más lentas (acumulado, top {IMPORT_REPORT_TOP}):")
+            for module, duration in imports:
+                lines.append(f"  {duration * 1000:9.1f} ms  {module}")
+        return "\n".join(lines)
+    # report (fin)
+
+    def _record_import(self, module: str, duration: float) -> None:
+        """
+        Registra el tiempo de ejecución de un módulo importado.
+        """
+        with self._lock:
+            self._imports[module] = duration
+    # _record_import (fin)
+# StartupProfiler (fin)
+
+
+# Medidor compartido por toda la aplicación
+startup_profiler = StartupProfiler()
@@ -1,14 +1,11 @@
 from PySide6.QtWidgets import (
     QGridLayout, QWidget, QTableView, QLineEdit, QComboBox,
-    QLabel, QSizePolicy, QPushButton
+    QLabel, QSizePolicy, QPushButton, QCompleter
 )
-from PySide6.QtCore import Qt, Signal, Slot
+from PySide6.QtCore import Qt, Signal, Slot, QStringListModel, QTimer
 from PySide6.QtGui import QIcon
 from widgets.custom_chart_widget import CustomChartWidget
-from utils import utils_sizes, utils_path
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import os
+from utils import utils_db, utils_sizes, utils_path
 from typing import List, Dict, Any
 from utils.utils_popup import _printv2
 
@@ -19,14 +16,18 @@ class ReportView(QWidget):
     """
     # Definición de señales
     apply_filters_signal = Signal(str, str)  # Señal para aplicar filtros: texto de búsqueda y categoría
-    generate_pdf_signal = Signal(list)  # Señal para generar el PDF con los datos filtrados
+    generate_pdf_signal = Signal()  # Señal para generar el PDF con los filtros aplicados
+    search_suggestions_signal = Signal(str, str)  # Señal para pedir sugerencias: texto escrito y categoría
+
+    # Milisegundos sin escribir tras los que se piden sugerencias al buscador
+    SEARCH_SUGGESTIONS_DELAY_MS = 250
 
     def __init__(self):
         """
         Inicializa la vista de informes, configurando filtros, tabla de datos y gráficos.
         """
         super().__init__()
-        self.filtered_data = []  # Almacena los datos filtrados
+        self.total_rows = 0  # Número de tareas que cumplen los filtros aplicados
         # Configuración de la ventana
         self.setMinimumSize(
             utils_sizes.SIZE_MINIMUM_WIDTH_WIDGET,
@@ -68,6 +69,29 @@ class ReportView(QWidget):
         category = self.category_select.currentText()
         self.apply_filters_signal.emit(search_text, category)
 
+    @Slot()
+    def _emit_search_suggestions_signal(self):
+        """
+        Emite la señal para pedir sugerencias con el texto escrito y la categoría seleccionada.
+        """
+        self.search_suggestions_signal.emit(self.search_input.text(), self.category_select.currentText())
+
+    @Slot(str)
+    def _on_search_suggestion_activated(self, suggestion: str):
+        """
+        Aplica los filtros al elegir una sugerencia del buscador.
+        """
+        self.search_input.setText(suggestion)
+        self._emit_apply_filters_signal()
+
+    def _set_search_suggestions(self, suggestions: List[str]):
+        """
+        Muestra las sugerencias del buscador bajo el cuadro de búsqueda.
+        """
+        self.search_suggestions.setStringList(suggestions)
+        if suggestions and self.search_input.hasFocus():
+            self.search_completer.complete()
+
     def _init_pdf_button(self):
         """
         Configura el botón para generar un PDF con los datos filtrados.
@@ -83,10 +107,27 @@ class ReportView(QWidget):
         """
         Emite la señal para generar un PDF si hay datos filtrados.
         """
-        if not self.filtered_data:
+        if not self.total_rows:
             _printv2(show_popup=True, parent=self, message="No hay datos para generar el PDF.")
             return
-        self.generate_pdf_signal.emit(self.filtered_data)
+        self.generate_pdf_signal.emit()
+
+    def _set_pdf_progress(self, done: int, total: int):
+        """
+        Muestra el progreso de la generación del PDF en el botón y lo deshabilita mientras tanto.
+        """
+        self.generate_pdf_button.setEnabled(False)
+        if total:
+            self.generate_pdf_button.setText(f"Generando PDF... {min(100, done * 100 // total)}%")
+        else:
+            self.generate_pdf_button.setText(f"Generando PDF... {done} tareas")
+
+    def _finish_pdf_progress(self):
+        """
+        Restaura el botón de generar PDF al terminar la exportación.
+        """
+        self.generate_pdf_button.setText("Generar PDF")
+        self.generate_pdf_button.setEnabled(True)
 
     def _init_filters(self):
         """
@@ -102,6 +143,20 @@ class ReportView(QWidget):
         self.search_input.setStyleSheet("border:1px solid #f2784b; border-radius:5px;")
         self.filters_layout.addWidget(self.search_input, 0, 1)
 
+        # Sugerencias del buscador, ya ordenadas por relevancia: el completador no las vuelve a filtrar
+        self.search_suggestions = QStringListModel(self)
+        self.search_completer = QCompleter(self.search_suggestions, self)
+        self.search_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.search_completer.activated.connect(self._on_search_suggestion_activated)
+        self.search_input.setCompleter(self.search_completer)
+
+        # Las sugerencias se piden cuando el usuario deja de escribir, no en cada tecla
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_SUGGESTIONS_DELAY_MS)
+        self.search_timer.timeout.connect(self._emit_search_suggestions_signal)
+        self.search_input.textEdited.connect(self.search_timer.start)
+
         # Selector de categoría
         self.category_select = QComboBox()
         self.category_select.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -153,7 +208,7 @@ class ReportView(QWidget):
         Llena el combo box de categorías con los valores recibidos.
         """
         self.category_select.clear()
-        self.category_select.addItem("Todas")
+        self.category_select.addItem(utils_db.CATEGORIA_TODAS)
         self.category_select.addItems(categories)
 
     def _set_chart(self, data):
@@ -162,14 +217,19 @@ class ReportView(QWidget):
         """
         self.chart_widget._set_data(data)
 
+    def _clear_chart(self):
+        """
+        Limpia el gráfico, mostrando un gráfico vacío.
+        """
+        self.chart_widget.clear_chart()
+
     def _set_number(self, total: int, suma_total: Dict[str, int]):
         """
         Configura el resumen de datos, incluyendo el total de elementos y la suma por categoría.
         """
-        resumen = (
-            f"Total de tareas: {total}, "
-            f"Ofimática: {suma_total.get('Ofimática', 0)}, "
-            f"Programación: {suma_total.get('Programación', 0)}, "
-            f"Ocio: {suma_total.get('Ocio', 0)}"
+        self.total_rows = total
+        resumen = ", ".join(
+            [f"Total de tareas: {total}"] +
+            [f"{categoria}: {cantidad}" for categoria, cantidad in suma_total.items()]
         )
         self.summary_label.setText(resumen)
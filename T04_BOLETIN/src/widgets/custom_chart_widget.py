@@ -34,6 +34,24 @@ class CustomChartWidget(QScrollArea):
         self._chart_view.setRenderHint(QPainter.Antialiasing)
         self._layout.addWidget(self._chart_view)
 
+        # La serie y los ejes se crean una sola vez y se reutilizan en cada actualización
+        self._bar_series = QBarSeries()
+        self._bar_sets: Dict[str, QBarSet] = {}  # Nombre del conjunto -> conjunto de barras
+        self._axis_x = QBarCategoryAxis()
+        self._axis_x.setLabelsAngle(-90)  # Rotar etiquetas para mejor visualización
+        self._axis_y = QValueAxis()
+        self._axis_y.setTitleText("Valores")
+        self._max_value: Optional[float] = None  # Valor máximo representado en el eje Y
+
+        self._chart.addSeries(self._bar_series)
+        self._chart.addAxis(self._axis_x, Qt.AlignBottom)
+        self._chart.addAxis(self._axis_y, Qt.AlignLeft)
+        self._bar_series.attachAxis(self._axis_x)
+        self._bar_series.attachAxis(self._axis_y)
+
+        # Un único tooltip para todas las barras: la serie indica qué conjunto se ha señalado
+        self._bar_series.hovered.connect(self._show_tooltip)
+
         # Configuración inicial
         self._set_empty_chart()
 
@@ -41,6 +59,12 @@ class CustomChartWidget(QScrollArea):
         """
         Configura los datos del gráfico de barras.
 
+        En lugar de reconstruir el gráfico, compara los datos nuevos con los actuales y solo
+        modifica lo que cambia: los valores de los conjuntos de barras existentes, los conjuntos
+        que aparecen o desaparecen, las categorías del eje X y el rango del eje Y. Los cambios
+        se aplican con el repintado desactivado, de modo que filtrar seguido no provoca una
+        recolocación del gráfico por cada barra.
+
         Parámetros:
         - data (Dict[str, Any]): Diccionario con los datos para el gráfico.
         """
@@ -51,71 +75,97 @@ class CustomChartWidget(QScrollArea):
             self._set_empty_chart()
             return
 
-        # Limpiar el gráfico existente
-        self._chart.removeAllSeries()
-        self._chart.setTitle("Gráfico de ventas por producto")
-
-        # Crear las series de barras
-        bar_series = QBarSeries()
-
-        # Agregar conjuntos de barras a la serie
-        for name, values in barritas_datos.items():
-            bar_set = QBarSet(name)
+        self._chart_view.setUpdatesEnabled(False)
+        try:
+            self._set_title("Gráfico de ventas por producto")
+            self._update_bar_sets(barritas_datos)
+            self._configure_axes(eje_x, barritas_datos)
+        finally:
+            self._chart_view.setUpdatesEnabled(True)
 
-            for value in values:
-                bar_set.append(value)
+    def _update_bar_sets(self, barritas_datos: Dict[str, List[int]]) -> None:
+        """
+        Actualiza los conjuntos de barras de la serie con los datos nuevos.
 
-            # Conectar el evento hovered para mostrar un tooltip dinámico
-            bar_set.hovered.connect(lambda status, index, bar_set=bar_set: self._show_tooltip(status, index, bar_set))
-            bar_series.append(bar_set)
+        Parámetros:
+        - barritas_datos (Dict[str, List[int]]): Valores de cada conjunto de barras, por nombre.
+        """
+        # Si cambia el orden de los conjuntos que se mantienen, se vuelven a crear todos
+        kept = [name for name in self._bar_sets if name in barritas_datos]
+        if kept != [name for name in barritas_datos if name in self._bar_sets]:
+            self._remove_bar_sets(list(self._bar_sets))
+        else:
+            self._remove_bar_sets([name for name in self._bar_sets if name not in barritas_datos])
 
-        # Añadir las series al gráfico
-        self._chart.addSeries(bar_series)
+        for name, values in barritas_datos.items():
+            bar_set = self._bar_sets.get(name)
+            if bar_set is None:
+                bar_set = QBarSet(name)
+                bar_set.append([float(value) for value in values])
+                self._bar_series.append(bar_set)
+                self._bar_sets[name] = bar_set
+            elif bar_set.count() == len(values):
+                # Mismo número de barras: solo se sustituyen los valores que cambian
+                for index, value in enumerate(values):
+                    if bar_set.at(index) != value:
+                        bar_set.replace(index, value)
+            else:
+                bar_set.remove(0, bar_set.count())
+                bar_set.append([float(value) for value in values])
+
+    def _remove_bar_sets(self, names: List[str]) -> None:
+        """
+        Quita de la serie (y destruye) los conjuntos de barras indicados.
 
-        # Configurar los ejes
-        self._configure_axes(eje_x, bar_series)
+        Parámetros:
+        - names (List[str]): Nombres de los conjuntos a quitar.
+        """
+        for name in names:
+            self._bar_series.remove(self._bar_sets.pop(name))
 
-    def _configure_axes(self, eje_x: List[str], bar_series: QBarSeries) -> None:
+    def _configure_axes(self, eje_x: List[str], barritas_datos: Dict[str, List[int]]) -> None:
         """
-        Configura los ejes del gráfico.
+        Actualiza los ejes del gráfico (sin volver a crearlos).
 
         Parámetros:
         - eje_x (List[str]): Categorías para el eje X.
-        - bar_series (QBarSeries): Series de barras del gráfico.
+        - barritas_datos (Dict[str, List[int]]): Valores de los conjuntos de barras, para el rango del eje Y.
         """
-        # Elimina los ejes existentes
-        for axis in self._chart.axes():
-            self._chart.removeAxis(axis)
+        # Eje X: solo se sustituyen las categorías si han cambiado
+        if self._axis_x.categories() != eje_x:
+            self._axis_x.setCategories(eje_x)
 
-        # Crear y configurar el eje X
-        axis_x = QBarCategoryAxis()
-        axis_x.append(eje_x)
-        axis_x.setLabelsAngle(-90)  # Rotar etiquetas para mejor visualización
-        self._chart.setAxisX(axis_x, bar_series)
+            # Ajustar el tamaño del gráfico para permitir scroll si es necesario
+            self._chart_view.setMinimumWidth(len(eje_x) * 100)
 
-        # Crear y configurar el eje Y
-        axis_y = QValueAxis()
-        axis_y.setTitleText("Valores")
-        axis_y.applyNiceNumbers()
-        self._chart.setAxisY(axis_y, bar_series)
+        # Eje Y: desde 0 hasta el valor máximo, redondeado a números "bonitos"
+        max_value = max((max(values) for values in barritas_datos.values() if values), default=0)
+        if max_value != self._max_value:
+            self._max_value = max_value
+            self._axis_y.setRange(0, max(max_value, 1))
+            self._axis_y.applyNiceNumbers()
 
-        # Ajustar el tamaño del gráfico para permitir scroll si es necesario
-        self._chart_view.setMinimumWidth(len(eje_x) * 100)
+    def _set_title(self, title: str) -> None:
+        """
+        Cambia el título del gráfico si es distinto del actual.
+        """
+        if self._chart.title() != title:
+            self._chart.setTitle(title)
 
     def _set_empty_chart(self) -> None:
         """
         Configura un gráfico vacío con ejes visibles.
         """
-        self._chart.removeAllSeries()
-        self._chart.setTitle("Sin datos disponibles")
-
-        axis_x = QBarCategoryAxis()
-        axis_y = QValueAxis()
-        axis_y.setRange(0, 10)
-        axis_y.setTitleText("Valores")
-
-        self._chart.setAxisX(axis_x)
-        self._chart.setAxisY(axis_y)
+        self._chart_view.setUpdatesEnabled(False)
+        try:
+            self._set_title("Sin datos disponibles")
+            self._remove_bar_sets(list(self._bar_sets))
+            if self._axis_x.count():
+                self._axis_x.clear()
+            self._max_value = None
+            self._axis_y.setRange(0, 10)
+        finally:
+            self._chart_view.setUpdatesEnabled(True)
 
     def clear_chart(self) -> None:
         """
@@ -126,6 +176,7 @@ class CustomChartWidget(QScrollArea):
     def _show_tooltip(self, status: bool, index: int, bar_set: QBarSet) -> None:
         """
         Muestra un tooltip con información sobre la barra cuando el usuario pasa el ratón por encima.
+        Está conectado a la señal `hovered` de la serie, que se emite para cualquiera de sus conjuntos.
 
         Parámetros:
         - status (bool): Indica si el ratón está sobre la barra.
@@ -134,7 +185,7 @@ class CustomChartWidget(QScrollArea):
         """
         if status:
             value = bar_set.at(index)
-            category = self._chart.axisX().categories()[index]
+            category = self._axis_x.categories()[index]
             QToolTip.showText(
                 self.mapToGlobal(self._chart_view.pos() + QPoint(10, 10)),
                 f"{category}: {value}"
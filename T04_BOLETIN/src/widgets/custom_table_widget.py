@@ -13,6 +13,9 @@
 
 from PySide6.QtWidgets import QTableView
 from PySide6.QtGui import QStandardItemModel, QStandardItem
+from utils.utils_logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class CustomTableWidget(QTableView):
@@ -54,13 +57,13 @@ class CustomTableWidget(QTableView):
         Si los datos no son válidos o no contienen las claves requeridas, el método no realiza cambios.
         """
         if not data or not isinstance(data, dict):
-            print("[ERROR] Los datos proporcionados no son válidos. Se esperaba un diccionario con 'columns' y 'data'.")
+            logger.error("Los datos proporcionados no son válidos. Se esperaba un diccionario con 'columns' y 'data'.")
             return
 
         # Configurar columnas
         columns = data.get("columns", [])
         if not columns:
-            print("[ERROR] No se encontraron columnas en los datos proporcionados.")
+            logger.error("No se encontraron columnas en los datos proporcionados.")
             return
         self._model.setHorizontalHeaderLabels(columns)
 
@@ -0,0 +1,84 @@
+"""
+* WEBGRAFÍA *
+
+- QAbstractTableModel Class. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QAbstractTableModel.html
+
+- QAbstractItemModel.sort. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QAbstractItemModel.html#PySide6.QtCore.QAbstractItemModel.sort
+
+"""
+
+# Archivo: src\widgets\dataset_table_model.py
+
+from typing import Any, List
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from models.report_dataset import ReportDataset
+
+
+class DatasetTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla de solo lectura sobre una vista de `ReportDataset`.
+
+    No copia los datos ni crea un elemento por celda: la vista pide el texto de cada celda
+    visible y el modelo lo lee directamente de las columnas del conjunto. Ordenar por una
+    columna sustituye la vista por otra ordenada (solo cambian las posiciones de las filas).
+    """
+
+    def __init__(self, columns: List[str], dataset: ReportDataset, parent=None):
+        """
+        Inicializa el modelo.
+
+        Parámetros:
+        - columns (list[str]): Nombres de las columnas a mostrar, en orden.
+        - dataset (ReportDataset): Vista con las filas a mostrar.
+        - parent (QObject | None): Objeto padre opcional.
+        """
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._dataset = dataset
+    # __init__ (fin)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Devuelve el número de filas de la vista.
+        """
+        return 0 if parent.isValid() else len(self._dataset)
+    # rowCount (fin)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Devuelve el número de columnas del modelo.
+        """
+        return 0 if parent.isValid() else len(self._columns)
+    # columnCount (fin)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """
+        Devuelve el texto de una celda.
+        """
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return str(self._dataset.value(index.row(), self._columns[index.column()]))
+    # data (fin)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        """
+        Devuelve los nombres de las columnas y los números de fila.
+        """
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section] if 0 <= section < len(self._columns) else None
+        return section + 1
+    # headerData (fin)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder) -> None:
+        """
+        Ordena las filas por una columna.
+        """
+        if not 0 <= column < len(self._columns):
+            return
+        self.beginResetModel()
+        self._dataset = self._dataset.sort_by(self._columns[column], descending=order == Qt.DescendingOrder)
+        self.endResetModel()
+    # sort (fin)
+# DatasetTableModel (fin)
@@ -0,0 +1,274 @@
+"""
+* WEBGRAFÍA *
+
+- QAbstractTableModel Class. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QAbstractTableModel.html
+
+- QAbstractItemModel.fetchMore / canFetchMore. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QAbstractItemModel.html#PySide6.QtCore.QAbstractItemModel.fetchMore
+
+- QAbstractItemModel.dataChanged. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QAbstractItemModel.html#PySide6.QtCore.QAbstractItemModel.dataChanged
+
+"""
+
+# Archivo: src\widgets\paginated_table_model.py
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from utils import utils_db
+from workers.db_worker import DbWorker
+
+# Firma de la función que obtiene una página: (clave de la última fila anterior, tamaño) -> filas
+FetchPageCallable = Callable[[Optional[Any], int], Optional[List[Dict[str, Any]]]]
+
+
+class PaginatedTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla de solo lectura que carga las filas bajo demanda, por páginas.
+
+    Las páginas se piden a la base de datos con paginación por clave (keyset) a medida que
+    el usuario se desplaza por la tabla (`canFetchMore`/`fetchMore`), y solo se mantienen en
+    memoria las `max_cached_pages` páginas usadas más recientemente. Si el usuario vuelve a
+    una página descartada, se pide de nuevo a partir de la clave en la que empezaba.
+
+    Las páginas se piden siempre en segundo plano a través de `DbWorker`, nunca desde el hilo
+    de la interfaz: mientras llega una página, sus filas se muestran vacías, y al recibirla se
+    avisa a la vista (`rowsInserted` o `dataChanged`). Si la consulta falla, la página queda
+    sin cargar y se vuelve a pedir la próxima vez que la vista la necesite.
+
+    De este modo, abrir una tabla con millones de filas cuesta lo mismo que abrir una con una
+    sola página, y la memoria utilizada no crece con el número de filas recorridas.
+    """
+
+    def __init__(
+        self,
+        columns: List[str],
+        fetch_page: FetchPageCallable,
+        key_column: str,
+        worker: DbWorker,
+        page_size: int = utils_db.PAGE_SIZE_DB,
+        max_cached_pages: int = utils_db.PAGE_CACHE_MAX_PAGES_DB,
+        initial_rows: Optional[List[Dict[str, Any]]] = None,
+        parent=None
+    ):
+        """
+        Inicializa el modelo con la primera página indicada en `initial_rows` (o la pide en segundo plano).
+
+        Parámetros:
+        - columns (list[str]): Nombres de las columnas a mostrar, en orden.
+        - fetch_page (callable): Función que recibe la clave de la última fila de la página anterior
+          (None para la primera) y el tamaño de página, y devuelve la lista de filas (o None si falla).
+        - key_column (str): Columna por la que están ordenadas las filas y que se usa como clave de paginación.
+        - worker (DbWorker): Trabajador con el que se piden las páginas fuera del hilo de la interfaz.
+        - page_size (int): Número de filas por página.
+        - max_cached_pages (int): Número máximo de páginas que se mantienen en memoria.
+        - initial_rows (list[dict] | None): Primera página ya obtenida (por ejemplo, en un hilo de trabajo).
+          Si es None, se pide en segundo plano al crear el modelo.
+        - parent (QObject | None): Objeto padre opcional.
+        """
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._fetch_page = fetch_page
+        self._key_column = key_column
+        self._worker = worker
+        self._page_size = max(1, page_size)
+        self._max_cached_pages = max(1, max_cached_pages)
+
+        self._pages: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()  # Caché LRU de páginas
+        self._page_start_keys: List[Optional[Any]] = []  # Clave previa al inicio de cada página
+        self._last_key: Optional[Any] = None  # Clave de la última fila cargada
+        self._row_count = 0  # Número de filas cargadas hasta ahora
+        self._has_more = True  # Indica si quedan filas por pedir
+
+        # Peticiones en curso. Cada modelo usa sus propios canales del trabajador: uno para la
+        # página siguiente y uno por cada página descartada que se vuelve a pedir.
+        self._channel = f"pagina-{id(self)}"
+        self._loading_next = False
+        self._loading_pages: Set[int] = set()
+
+        if initial_rows is None:
+            self.fetchMore()
+        else:
+            self._add_next_page(initial_rows)
+    # __init__ (fin)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Devuelve el número de filas cargadas hasta el momento.
+        """
+        return 0 if parent.isValid() else self._row_count
+    # rowCount (fin)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Devuelve el número de columnas del modelo.
+        """
+        return 0 if parent.isValid() else len(self._columns)
+    # columnCount (fin)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """
+        Devuelve el texto de una celda. Si su página no está en memoria, la pide en segundo
+        plano y, mientras tanto, la celda se muestra vacía.
+        """
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        row = self._get_row(index.row())
+        if row is None:
+            return None
+        return str(row.get(self._columns[index.column()], ""))
+    # data (fin)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        """
+        Devuelve los nombres de las columnas y los números de fila.
+        """
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section] if 0 <= section < len(self._columns) else None
+        return section + 1
+    # headerData (fin)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Indica a la vista si quedan filas por cargar (y no se están pidiendo ya).
+        """
+        return not parent.isValid() and self._has_more and not self._loading_next
+    # canFetchMore (fin)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """
+        Pide en segundo plano la siguiente página cuando la vista llega al final de las filas cargadas.
+        """
+        if not self.canFetchMore(parent):
+            return
+        self._loading_next = True
+        self._worker.submit(
+            f"{self._channel}-siguiente",
+            self._fetch_page,
+            self._last_key,
+            self._page_size,
+            on_result=self._on_next_page,
+            on_error=lambda message: self._on_next_page(None)
+        )
+    # fetchMore (fin)
+
+    def cancel_fetches(self) -> None:
+        """
+        Cancela las páginas que se están pidiendo (por ejemplo, al sustituir el modelo de la vista).
+        """
+        self._worker.cancel(f"{self._channel}-siguiente")
+        for page_index in self._loading_pages:
+            self._worker.cancel(f"{self._channel}-{page_index}")
+        self._loading_next = False
+        self._loading_pages.clear()
+    # cancel_fetches (fin)
+
+    def _on_next_page(self, rows: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        Recibe la página siguiente (en el hilo de la interfaz). Si la consulta falló (None),
+        no se marca el final de la tabla, de modo que la vista vuelve a pedirla.
+        """
+        self._loading_next = False
+        if rows is not None:
+            self._add_next_page(rows)
+    # _on_next_page (fin)
+
+    def _add_next_page(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Añade al final del modelo la página siguiente a la última fila cargada.
+
+        Parámetros:
+        - rows (list[dict]): Filas de la página (vacía si no quedan más).
+        """
+        if not rows:
+            self._has_more = False
+            return
+
+        page_index = len(self._page_start_keys)
+        self._page_start_keys.append(self._last_key)
+
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + len(rows) - 1)
+        self._store_page(page_index, rows)
+        self._row_count += len(rows)
+        self._last_key = rows[-1].get(self._key_column)
+        self.endInsertRows()
+
+        self._has_more = len(rows) == self._page_size
+    # _add_next_page (fin)
+
+    def _get_row(self, row_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve una fila a partir de su posición. Si su página fue descartada, la pide en
+        segundo plano y devuelve None hasta que llegue.
+
+        Parámetros:
+        - row_index (int): Posición de la fila en el modelo.
+
+        Retorno:
+        - dict | None: Fila solicitada o None si su página no está en memoria.
+        """
+        page_index, offset = divmod(row_index, self._page_size)
+        page = self._pages.get(page_index)
+
+        if page is None:
+            if page_index < len(self._page_start_keys):
+                self._request_page(page_index)
+            return None
+
+        self._pages.move_to_end(page_index)
+        return page[offset] if offset < len(page) else None
+    # _get_row (fin)
+
+    def _request_page(self, page_index: int) -> None:
+        """
+        Pide de nuevo en segundo plano una página descartada, si no se está pidiendo ya.
+
+        Parámetros:
+        - page_index (int): Número de la página.
+        """
+        if page_index in self._loading_pages:
+            return
+        self._loading_pages.add(page_index)
+        self._worker.submit(
+            f"{self._channel}-{page_index}",
+            self._fetch_page,
+            self._page_start_keys[page_index],
+            self._page_size,
+            on_result=lambda rows: self._on_page_reloaded(page_index, rows),
+            on_error=lambda message: self._on_page_reloaded(page_index, None)
+        )
+    # _request_page (fin)
+
+    def _on_page_reloaded(self, page_index: int, rows: Optional[List[Dict[str, Any]]]) -> None:
+        """
+        Recibe una página descartada que se volvió a pedir (en el hilo de la interfaz) y avisa a
+        la vista de que sus filas han cambiado. Si la consulta falló (None), la página queda sin
+        cargar, para volver a pedirla cuando la vista la necesite.
+        """
+        self._loading_pages.discard(page_index)
+        if rows is None:
+            return
+        self._store_page(page_index, rows)
+
+        first_row = page_index * self._page_size
+        last_row = min(first_row + self._page_size, self._row_count) - 1
+        if last_row >= first_row:
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self._columns) - 1))
+    # _on_page_reloaded (fin)
+
+    def _store_page(self, page_index: int, rows: List[Dict[str, Any]]) -> None:
+        """
+        Guarda una página en la caché, descartando las menos usadas si se supera el límite.
+
+        Parámetros:
+        - page_index (int): Número de la página.
+        - rows (list[dict]): Filas de la página.
+        """
+        self._pages[page_index] = rows
+        self._pages.move_to_end(page_index)
+        while len(self._pages) > self._max_cached_pages:
+            self._pages.popitem(last=False)
+    # _store_page (fin)
+# PaginatedTableModel (fin)
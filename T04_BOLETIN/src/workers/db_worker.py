@@ -0,0 +1,340 @@
+"""
+* WEBGRAFÍA *
+
+- QThreadPool Class. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QThreadPool.html
+
+- QRunnable Class. (s. f.). Doc.qt.io. de https://doc.qt.io/qtforpython-6.7/PySide6/QtCore/QRunnable.html
+
+- Threads and QObjects. (s. f.). Doc.qt.io. de https://doc.qt.io/qt-6/threads-qobject.html
+
+"""
+
+# Archivo: src/workers/db_worker.py
+
+import threading
+from typing import Any, Callable, Dict, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from utils import utils_db
+
+
+class CancellationToken:
+    """
+    Indicador compartido entre el hilo de la interfaz y una tarea en segundo plano
+    para solicitar su cancelación.
+
+    La tarea lo consulta antes de empezar y antes de entregar su resultado.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el token sin cancelar.
+        """
+        self._event = threading.Event()
+    # __init__ (fin)
+
+    def cancel(self) -> None:
+        """
+        Marca la tarea como cancelada.
+        """
+        self._event.set()
+    # cancel (fin)
+
+    def is_cancelled(self) -> bool:
+        """
+        Indica si se ha solicitado la cancelación.
+
+        Retorno:
+        - bool: True si la tarea debe detenerse.
+        """
+        return self._event.is_set()
+    # is_cancelled (fin)
+# CancellationToken (fin)
+
+
+class WorkerSignals(QObject):
+    """
+    Señales que emite una tarea en segundo plano.
+
+    Se emiten desde el hilo de trabajo y Qt las entrega en el hilo del objeto receptor
+    (el hilo de la interfaz), por lo que los receptores pueden actualizar widgets con seguridad.
+    """
+    finished = Signal(int, object)  # Identificador de la petición y resultado
+    error = Signal(int, str)  # Identificador de la petición y mensaje de error
+    progress = Signal(int, int, int)  # Identificador de la petición, elementos procesados y total
+# WorkerSignals (fin)
+
+
+class TaskContext:
+    """
+    Contexto que reciben las funciones de larga duración (por ejemplo, una exportación) para
+    consultar si se han cancelado y para informar de su progreso a la interfaz.
+    """
+
+    def __init__(self, request_id: int, signals: WorkerSignals, token: CancellationToken):
+        """
+        Inicializa el contexto de una petición.
+
+        Parámetros:
+        - request_id (int): Identificador de la petición.
+        - signals (WorkerSignals): Señales de la tarea.
+        - token (CancellationToken): Token de cancelación de la tarea.
+        """
+        self._request_id = request_id
+        self._signals = signals
+        self._token = token
+    # __init__ (fin)
+
+    def is_cancelled(self) -> bool:
+        """
+        Indica si se ha solicitado la cancelación de la tarea.
+
+        Retorno:
+        - bool: True si la tarea debe detenerse.
+        """
+        return self._token.is_cancelled()
+    # is_cancelled (fin)
+
+    def report_progress(self, done: int, total: int) -> None:
+        """
+        Informa del progreso de la tarea. Se entrega en el hilo de la interfaz.
+
+        Parámetros:
+        - done (int): Elementos procesados hasta el momento.
+        - total (int): Número total de elementos (0 si se desconoce).
+        """
+        if not self._token.is_cancelled():
+            self._signals.progress.emit(self._request_id, done, total)
+    # report_progress (fin)
+# TaskContext (fin)
+
+
+class DbTask(QRunnable):
+    """
+    Tarea que ejecuta una función (normalmente una llamada a ReportModel) en un hilo del pool.
+    """
+
+    def __init__(
+        self,
+        request_id: int,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        token: CancellationToken,
+        pass_context: bool = False
+    ):
+        """
+        Inicializa la tarea.
+
+        Parámetros:
+        - request_id (int): Identificador único de la petición.
+        - func (callable): Función a ejecutar en segundo plano.
+        - args (tuple): Argumentos posicionales de la función.
+        - kwargs (dict): Argumentos con nombre de la función.
+        - token (CancellationToken): Token para cancelar la tarea.
+        - pass_context (bool): Si es True, la función recibe un `TaskContext` en el argumento `context`.
+        """
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._request_id = request_id
+        self._func = func
+        self._args = args
+        self._kwargs = dict(kwargs)
+        self._token = token
+        if pass_context:
+            self._kwargs["context"] = TaskContext(request_id, self.signals, token)
+    # __init__ (fin)
+
+    def run(self) -> None:
+        """
+        Ejecuta la función y emite el resultado, salvo que la tarea se haya cancelado.
+        """
+        if self._token.is_cancelled():
+            return
+        try:
+            result = self._func(*self._args, **self._kwargs)
+        except Exception as e:
+            if not self._token.is_cancelled():
+                self.signals.error.emit(self._request_id, str(e))
+            return
+        if not self._token.is_cancelled():
+            self.signals.finished.emit(self._request_id, result)
+    # run (fin)
+# DbTask (fin)
+
+
+class DbWorker(QObject):
+    """
+    Ejecuta operaciones de base de datos fuera del hilo de la interfaz.
+
+    Cada petición se asocia a un canal (por ejemplo, "filtros"). Al enviar una nueva petición
+    a un canal, la anterior se cancela: si aún no había empezado se retira del pool y, si ya
+    estaba en marcha, su resultado se descarta. Así, solo se entrega a la interfaz la respuesta
+    al filtro más reciente.
+
+    Los resultados se entregan mediante los callbacks `on_result`/`on_error`, que se ejecutan
+    siempre en el hilo de la interfaz.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, max_threads: int = utils_db.POOL_MAX_SIZE_DB):
+        """
+        Inicializa el trabajador con su propio pool de hilos.
+
+        Parámetros:
+        - parent (QObject | None): Objeto padre opcional.
+        - max_threads (int): Número máximo de hilos simultáneos. Por defecto coincide con el
+          tamaño máximo del pool de conexiones, para no esperar conexiones libres.
+        """
+        super().__init__(parent)
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max(1, max_threads))
+
+        self._next_request_id = 0
+        self._latest_by_channel: Dict[str, int] = {}  # Última petición de cada canal
+        self._pending: Dict[int, Dict[str, Any]] = {}  # Peticiones en curso por identificador
+    # __init__ (fin)
+
+    def submit(
+        self,
+        channel: str,
+        func: Callable[..., Any],
+        *args,
+        on_result: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        pass_context: bool = False,
+        **kwargs
+    ) -> int:
+        """
+        Envía una función para ejecutarse en segundo plano, cancelando la petición previa del canal.
+
+        Parámetros:
+        - channel (str): Canal de la petición. Las peticiones de un mismo canal se sustituyen entre sí.
+        - func (callable): Función a ejecutar.
+        - *args / **kwargs: Argumentos de la función.
+        - on_result (callable | None): Callback con el resultado, ejecutado en el hilo de la interfaz.
+        - on_error (callable | None): Callback con el mensaje de error, ejecutado en el hilo de la interfaz.
+        - on_progress (callable | None): Callback con (procesados, total), ejecutado en el hilo de la interfaz.
+        - pass_context (bool): Si es True, la función recibe un `TaskContext` en el argumento `context`
+          para comprobar la cancelación e informar del progreso.
+
+        Retorno:
+        - int: Identificador de la petición.
+        """
+        self.cancel(channel)
+
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        token = CancellationToken()
+
+        task = DbTask(request_id, func, args, kwargs, token, pass_context)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.error.connect(self._on_error)
+        task.signals.progress.connect(self._on_progress)
+
+        self._latest_by_channel[channel] = request_id
+        self._pending[request_id] = {
+            "channel": channel,
+            "task": task,
+            "signals": task.signals,  # Mantiene vivas las señales hasta entregar el resultado
+            "token": token,
+            "on_result": on_result,
+            "on_error": on_error,
+            "on_progress": on_progress,
+        }
+        self._thread_pool.start(task)
+        return request_id
+    # submit (fin)
+
+    def cancel(self, channel: str) -> None:
+        """
+        Cancela la petición en curso de un canal, si existe.
+
+        Parámetros:
+        - channel (str): Canal cuya petición se cancela.
+        """
+        request_id = self._latest_by_channel.pop(channel, None)
+        if request_id is None:
+            return
+        pending = self._pending.pop(request_id, None)
+        if pending is None:
+            return
+        pending["token"].cancel()
+        # Si la tarea aún no ha empezado, se retira de la cola del pool
+        try:
+            self._thread_pool.tryTake(pending["task"])
+        except RuntimeError:
+            pass  # La tarea ya terminó y el pool la liberó
+    # cancel (fin)
+
+    def cancel_all(self) -> None:
+        """
+        Cancela todas las peticiones en curso.
+        """
+        for channel in list(self._latest_by_channel):
+            self.cancel(channel)
+    # cancel_all (fin)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """
+        Espera a que terminen las tareas en ejecución (útil al cerrar la aplicación).
+
+        Parámetros:
+        - msecs (int): Tiempo máximo de espera en milisegundos (-1 para esperar indefinidamente).
+
+        Retorno:
+        - bool: True si todas las tareas terminaron.
+        """
+        return self._thread_pool.waitForDone(msecs)
+    # wait_for_done (fin)
+
+    @Slot(int, object)
+    def _on_finished(self, request_id: int, result: Any) -> None:
+        """
+        Entrega el resultado de una petición vigente a su callback.
+        """
+        pending = self._take_current(request_id)
+        if pending and pending["on_result"]:
+            pending["on_result"](result)
+    # _on_finished (fin)
+
+    @Slot(int, str)
+    def _on_error(self, request_id: int, message: str) -> None:
+        """
+        Entrega el error de una petición vigente a su callback.
+        """
+        pending = self._take_current(request_id)
+        if pending and pending["on_error"]:
+            pending["on_error"](message)
+    # _on_error (fin)
+
+    @Slot(int, int, int)
+    def _on_progress(self, request_id: int, done: int, total: int) -> None:
+        """
+        Entrega el progreso de una petición vigente a su callback.
+        """
+        pending = self._pending.get(request_id)
+        if pending is None or self._latest_by_channel.get(pending["channel"]) != request_id:
+            return
+        if pending["on_progress"]:
+            pending["on_progress"](done, total)
+    # _on_progress (fin)
+
+    def _take_current(self, request_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retira una petición terminada, descartándola si ya no es la más reciente de su canal.
+
+        Parámetros:
+        - request_id (int): Identificador de la petición.
+
+        Retorno:
+        - dict | None: Datos de la petición o None si estaba cancelada o era obsoleta.
+        """
+        pending = self._pending.pop(request_id, None)
+        if pending is None:
+            return None
+        if self._latest_by_channel.get(pending["channel"]) != request_id:
+            return None
+        del self._latest_by_channel[pending["channel"]]
+        return pending
+    # _take_current (fin)
+# DbWorker (fin)
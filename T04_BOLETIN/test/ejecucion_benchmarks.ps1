@@ -0,0 +1,13 @@
+# Comandos para ejecutar el banco de pruebas de rendimiento del módulo de informes.
+# Deben ejecutarse desde la carpeta 'src' con la base de datos de docker-compose en marcha.
+# Los datos se generan en una base de datos aparte ('t04_db_benchmark'), nunca en la de la aplicación.
+
+# Ejecución completa con los volúmenes por defecto (1.000, 10.000 y 100.000 tareas).
+# Los resultados se guardan en JSON en 'benchmarks/results'.
+python -m benchmarks.report_benchmark
+
+# Ejecución rápida sin generar el PDF
+python -m benchmarks.report_benchmark --sizes 1000,10000 --skip-pdf
+
+# Comparación con una ejecución anterior: termina con código 1 si alguna operación es más de un 20 % más lenta
+python -m benchmarks.report_benchmark --compare benchmarks/results/report_benchmark_anterior.json --threshold 0.20